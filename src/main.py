@@ -2,23 +2,45 @@ import argparse
 import logging
 import sys
 import os # osモジュールをインポート
-from typing import Optional, List, Dict, Any # List, Dict, Any をインポート
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator, Callable # List, Dict, Any をインポート
 from dotenv import load_dotenv # dotenvをインポート
 import re # 正規表現モジュールをインポート
+import asyncio
+import copy
+import signal
+import contextlib
 from scraper.browser import LancersBrowser
 from scraper.parser import LancersParser
-from utils.csv_handler import CSVHandler
-from utils.gdrive_uploader import upload_to_gdrive # 追加
-
-def setup_logging():
-    """ロギングの設定"""
-    logging.basicConfig(
-        level=logging.DEBUG, # INFOからDEBUGに変更
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('scraping.log', encoding='utf-8')
-        ]
+from scraper.detail_pool import DetailWorkerPool
+from scraper.discovery_pipeline import SearchDetailPipeline
+from scraper.sharding import ShardedDetailPool
+from scraper.concurrency_controller import AimdConcurrencyController
+from scraper.http_fetcher import LancersHttpFetcher
+from scraper.session_store import SessionStore, DEFAULT_SESSION_PATH
+from scraper.replay import ResponseRecorder, ResponseReplayer
+from scraper.rate_limiter import TokenBucketRateLimiter, DEFAULT_RATE_LIMIT_STATE_PATH
+from scraper.page_archive import PageArchive, DEFAULT_ARCHIVE_DIR, reparse_details
+from scraper.batch_parser import normalize_csv
+from scraper.resource_blocker import ResourceBlocker, DEFAULT_BLOCKED_RESOURCE_TYPES, DEFAULT_BLOCKED_URL_PATTERNS
+from utils.csv_handler import CSVHandler, CsvStreamWriter
+from utils.detail_cache import DetailCache, DEFAULT_CACHE_PATH
+from utils.journal import ScrapeJournal
+from utils.crawl_state import CrawlState, DEFAULT_CRAWL_STATE_PATH
+from utils.log_config import setup_logging as configure_logging, parse_module_levels, DEFAULT_LOG_FILE, DEFAULT_LOG_BACKUP_COUNT
+
+# --scrape-urls のチャンクサイズ（1タブで取得する場合）
+DEFAULT_CHUNK_SIZE = 10
+# 並列取得時に、タブ1つあたりチャンクごとに取得させるURL数（チャンク末尾で他のタブが待つ時間を減らす）
+URLS_PER_SLOT_PER_CHUNK = 10
+
+def setup_logging(args) -> logging.Logger:
+    """ロギングの設定（main の開始時に1回だけ呼ぶ）"""
+    configure_logging(
+        level=args.log_level,
+        log_file=args.log_file,
+        max_bytes=int(args.log_max_mb * 1024 * 1024),
+        backup_count=args.log_backups,
+        module_levels=parse_module_levels(args.log_module_levels)
     )
     return logging.getLogger(__name__)
 
@@ -32,23 +54,102 @@ def parse_arguments():
     parser.add_argument('--no-headless', action='store_true', default=False,
                       help='ヘッドレスモードを無効にする（デフォルト：有効）')
     parser.add_argument('--with-details', action='store_true', default=False,
-                      help='（非推奨）案件詳細情報も取得する。--scrape-urlsを使用してください。')
+                      help='検索と同時に案件詳細も取得し、詳細を結合した1つのCSVを出力する（--concurrency で詳細取得のタブ数を指定）')
     parser.add_argument('--data-search', action='store_true', default=False,
                       help='データ検索URLを使用してタスク案件をスクレイピングを行う')
     parser.add_argument('--data-search-project', action='store_true', default=False,
                       help='データ検索URLを使用してプロジェクト案件をスクレイピングを行う')
+    parser.add_argument('--keywords-file', type=str, default=None,
+                      help='キーワードを1行に1つ記載したファイル。全キーワード（と指定されたデータ検索）を1つのブラウザセッションで実行する')
+    parser.add_argument('--keyword-concurrency', type=int, default=1,
+                      help='--keywords-file 時にキーワードごとのタブを同時に開く数 (デフォルト: 1)')
+    parser.add_argument('--merge-output', action='store_true', default=False,
+                      help='--keywords-file 時にキーワードの結果を重複排除して1つのCSVにまとめる')
     parser.add_argument('--extract-urls', type=str, default=None,
                        help='CSVファイルからURLを抽出する（CSVファイルのパスを指定）')
     parser.add_argument('--url-output', type=str, default=None,
                        help='抽出したURLの出力ファイル名（指定しない場合はコンソールに出力）')
     parser.add_argument('--scrape-urls', type=str, default=None,
                        help='CSVファイルからURLを読み込み、ログインして詳細情報を取得し、別ファイルに保存する')
-    parser.add_argument('--chunk-size', type=int, default=10,
-                       help='--scrape-urls 実行時のチャンクサイズ (デフォルト: 10)')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                       help=f'--scrape-urls 実行時のチャンクサイズ (デフォルト: {DEFAULT_CHUNK_SIZE}。並列取得時は同時取得数 × {URLS_PER_SLOT_PER_CHUNK})')
+    parser.add_argument('--concurrency', type=int, default=1,
+                       help='--scrape-urls 実行時に並列で詳細ページを取得するタブ数 (デフォルト: 1)')
+    parser.add_argument('--resume', action='store_true', default=False,
+                        help='--scrape-urls の中断後、ジャーナルに記録済みのURLを取得せずに続きから再開する')
+    parser.add_argument('--journal-file', type=str, default=None,
+                        help='--scrape-urls の取得結果を記録するジャーナル (デフォルト: data/journal/<入力CSV名>.jsonl)')
+    parser.add_argument('--detail-cache', type=str, default=DEFAULT_CACHE_PATH,
+                       help=f'--scrape-urls 実行時に取得済みの案件詳細を案件IDごとに保存するキャッシュ (デフォルト: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--cache-ttl', type=float, default=24.0,
+                       help='詳細キャッシュの有効期間（時間）。これより古いものは取得し直す (デフォルト: 24)')
+    parser.add_argument('--cache-max-entries', type=int, default=100_000,
+                       help='詳細キャッシュの最大件数。超えた分は古い順に削除する (デフォルト: 100000)')
+    parser.add_argument('--no-detail-cache', action='store_true', default=False,
+                       help='詳細キャッシュを使わずに全件取得する')
+    parser.add_argument('--adaptive-concurrency', action='store_true', default=False,
+                       help='--scrape-urls 実行時に --concurrency を上限として、応答時間・エラー・閲覧制限の割合から並列数を自動調整する（--workers 2以上とは併用不可）')
+    parser.add_argument('--latency-threshold', type=float, default=None,
+                       help='--adaptive-concurrency 時に並列数を減らす平均応答時間（秒）')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='--scrape-urls 実行時に起動するブラウザプロセス数。ログインセッションを共有し、各プロセスで --concurrency 個のタブを使う (デフォルト: 1)')
+    parser.add_argument('--incremental', action='store_true', default=False,
+                        help='前回までに取得した案件を記録し、新着の案件のみを出力する（取得済みの案件だけのページで検索を打ち切る）')
+    parser.add_argument('--crawl-state-file', type=str, default=DEFAULT_CRAWL_STATE_PATH,
+                        help=f'--incremental で使う取得済み案件の記録ファイル (デフォルト: {DEFAULT_CRAWL_STATE_PATH})')
     parser.add_argument('--max-items', type=int, default=None,
                        help='取得する最大案件数 (検索モード時)')
+    parser.add_argument('--parallel-pages', action='store_true', default=False,
+                       help='1ページ目から総ページ数を読み取り、2ページ目以降を別タブで並列に取得する (検索モード時)')
+    parser.add_argument('--page-concurrency', type=int, default=4,
+                       help='--parallel-pages 時に同時に開くタブ数 (デフォルト: 4)')
+    parser.add_argument('--http-fetch', action='store_true', default=False,
+                       help='一覧・詳細ページをブラウザのセッションを引き継いだHTTP通信で取得する (JS描画やログイン画面を検出した場合はブラウザで再取得)')
     parser.add_argument('--skip-confirm', action='store_true', default=False,
                        help='チャンクごとの確認をスキップする')
+    parser.add_argument('--block-resources', action='store_true', default=False,
+                       help='画像・フォント・CSS・広告/解析スクリプトなど不要なリソースの読み込みを遮断する')
+    parser.add_argument('--block-resource-types', type=str, default=','.join(DEFAULT_BLOCKED_RESOURCE_TYPES),
+                       help='--block-resources 時にブロックするリソース種別 (カンマ区切り)')
+    parser.add_argument('--block-url-patterns', type=str, default=None,
+                       help='--block-resources 時に追加でブロックするURLの正規表現 (カンマ区切り)')
+    parser.add_argument('--rate-limit', type=float, default=None, metavar='RPS',
+                       help='サイトへのリクエスト数の上限（1秒あたり）。全てのタブ・ワーカープロセス・実行の間で共有する')
+    parser.add_argument('--rate-burst', type=int, default=5,
+                       help='--rate-limit 時に連続して送れるリクエスト数 (デフォルト: 5)')
+    parser.add_argument('--rate-limit-file', type=str, default=DEFAULT_RATE_LIMIT_STATE_PATH,
+                       help=f'--rate-limit の状態を共有するファイル (デフォルト: {DEFAULT_RATE_LIMIT_STATE_PATH})')
+    parser.add_argument('--archive-pages', action='store_true', default=False,
+                       help='取得した検索・詳細ページのHTMLを圧縮してアーカイブに保存する（セレクタ修正後に再取得せずに解析し直すため）')
+    parser.add_argument('--archive-dir', type=str, default=DEFAULT_ARCHIVE_DIR,
+                       help=f'ページアーカイブの保存先 (デフォルト: {DEFAULT_ARCHIVE_DIR})')
+    parser.add_argument('--archive-max-mb', type=float, default=500,
+                       help='ページアーカイブの最大サイズ (MB)。超えた分は使われていない古いページから削除する (デフォルト: 500)')
+    parser.add_argument('--reparse-archive', type=str, default=None, metavar='OUTPUT',
+                       help='アーカイブの案件詳細ページを再取得せずに解析し直し、指定したCSVファイルに保存する')
+    parser.add_argument('--normalize-csv', type=str, nargs=2, default=None, metavar=('INPUT', 'OUTPUT'),
+                       help='保存済みのCSVの締切・納期・募集人数の列を現在のパース規則で列単位に正規化し、OUTPUTに保存する')
+    parser.add_argument('--record', type=str, default=None, metavar='DIR',
+                       help='取得した検索・詳細ページのレスポンスを指定ディレクトリに記録する')
+    parser.add_argument('--replay', type=str, default=None, metavar='DIR',
+                       help='--record で記録したレスポンスを使い、実サイトにアクセスせずに実行する')
+    parser.add_argument('--base-url', type=str, default=os.getenv('LANCERS_BASE_URL'),
+                       help='アクセス先サイトのURL (ローカルのモックサーバーで負荷試験する場合などに指定。環境変数 LANCERS_BASE_URL でも可)')
+    parser.add_argument('--session-file', type=str, default=DEFAULT_SESSION_PATH,
+                       help=f'ログイン済みセッションの保存先 (デフォルト: {DEFAULT_SESSION_PATH})')
+    parser.add_argument('--no-session-cache', action='store_true', default=False,
+                       help='ログイン済みセッションを保存・再利用せず、毎回ログインする')
+    parser.add_argument('--log-level', type=str.upper, default=os.getenv('LOG_LEVEL', 'INFO').upper(),
+                       choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+                       help='ログレベル (DEBUG / INFO / WARNING / ERROR、デフォルト: INFO または環境変数 LOG_LEVEL)')
+    parser.add_argument('--log-module-levels', type=str, default=os.getenv('LOG_MODULE_LEVELS'),
+                       help='モジュールごとのログレベル。「ロガー名=レベル」のカンマ区切り (例: scraper.browser=DEBUG,scraper.parser=WARNING)')
+    parser.add_argument('--log-file', type=str, default=DEFAULT_LOG_FILE,
+                       help=f'ログファイルのパス (デフォルト: {DEFAULT_LOG_FILE})')
+    parser.add_argument('--log-max-mb', type=float, default=10,
+                       help='ログファイルを切り替えるサイズ (MB)。古いファイルは gzip 圧縮して残す (デフォルト: 10)')
+    parser.add_argument('--log-backups', type=int, default=DEFAULT_LOG_BACKUP_COUNT,
+                       help=f'残す圧縮済みログファイルの数 (デフォルト: {DEFAULT_LOG_BACKUP_COUNT})')
     # Google Drive Upload Arguments
     parser.add_argument('--upload-gdrive', action='store_true', default=False,
                         help='生成されたCSVファイルをGoogle Driveにアップロードする')
@@ -56,7 +157,276 @@ def parse_arguments():
                         help='Google Driveのアップロード先フォルダID (環境変数 GDRIVE_FOLDER_ID でも設定可)')
     parser.add_argument('--gdrive-credentials', type=str, default=os.getenv('GDRIVE_CREDENTIALS_PATH', 'service_account.json'),
                         help='Google Drive APIの認証情報ファイル(JSON)へのパス (環境変数 GDRIVE_CREDENTIALS_PATH でも設定可)')
-    return parser.parse_args()
+    args = parser.parse_args()
+    try:
+        parse_module_levels(args.log_module_levels)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+def build_browser_options(args) -> Dict[str, Any]:
+    """コマンドライン引数から LancersBrowser に渡す追加オプションを組み立てる"""
+    options: Dict[str, Any] = {}
+    if args.block_resources:
+        resource_types = [t.strip() for t in args.block_resource_types.split(',') if t.strip()]
+        url_patterns = list(DEFAULT_BLOCKED_URL_PATTERNS)
+        if args.block_url_patterns:
+            url_patterns.extend(p.strip() for p in args.block_url_patterns.split(',') if p.strip())
+        options['resource_blocker'] = ResourceBlocker(resource_types=resource_types, url_patterns=url_patterns)
+    if not args.no_session_cache:
+        options['session_store'] = SessionStore(args.session_file)
+    if args.base_url:
+        options['base_url'] = args.base_url
+    if args.rate_limit:
+        options['rate_limiter'] = TokenBucketRateLimiter(args.rate_limit, burst=args.rate_burst,
+                                                         state_path=args.rate_limit_file)
+    if args.archive_pages:
+        options['page_archive'] = PageArchive(args.archive_dir, max_bytes=int(args.archive_max_mb * 1024 * 1024))
+    if args.record:
+        options['recorder'] = ResponseRecorder(args.record)
+    if args.replay:
+        options['replayer'] = ResponseReplayer(args.replay)
+    return options
+
+async def iter_search_pages(
+    browser: LancersBrowser,
+    search_query: Optional[str] = None,
+    data_search: bool = False,
+    data_search_project: bool = False,
+    parallel_pages: bool = False,
+    page_concurrency: int = 4,
+    max_items: Optional[int] = None,
+    http_fetcher: Optional[LancersHttpFetcher] = None
+):
+    """
+    検索結果を (ページ番号, 案件情報のリスト) としてページ順に返す
+    parallel_pages が有効な場合は 2 ページ目以降を別タブで並列に取得する
+    http_fetcher が指定された場合は各ページをHTTPで直接取得する
+    """
+    logger = logging.getLogger(__name__)
+
+    if http_fetcher:
+        url = browser.build_search_url(search_query, data_search, data_search_project)
+        for current_page in range(1, (browser.max_pages or 1) + 1):
+            raw_results_page = await http_fetcher.search_page(url, current_page)
+            if not raw_results_page:
+                logger.warning(f"ページ {current_page} で検索結果が見つかりませんでした。")
+                return
+            yield current_page, raw_results_page
+        logger.warning(f"最大ページ数 ({browser.max_pages}) に達しました。")
+        return
+
+    if parallel_pages:
+        url = browser.build_search_url(search_query, data_search, data_search_project)
+        pages = await browser.search_pages_concurrently(url, max_items=max_items, concurrency=page_concurrency)
+        for page_num, page_results in enumerate(pages, start=1):
+            yield page_num, page_results
+        return
+
+    current_page = 1
+    while True:
+        logger.info(f"ページ {current_page} を処理中...")
+        raw_results_page = []
+
+        if data_search:
+            raw_results_page = await browser.search_with_data_url(page_num=current_page)
+        elif data_search_project:
+            raw_results_page = await browser.search_with_data_project_url(page_num=current_page)
+        elif search_query:
+            raw_results_page = await browser.search_short_videos(search_query, page_num=current_page)
+
+        if not raw_results_page:
+            logger.warning(f"ページ {current_page} で検索結果が見つかりませんでした。")
+            return
+
+        yield current_page, raw_results_page
+
+        logger.info("次のページへの遷移を試みます...")
+        has_next = await browser.go_to_next_search_page()
+        if not has_next:
+            logger.info("次のページが見つかりませんでした。スクレイピングを終了します。")
+            return
+
+        current_page += 1
+        if browser.max_pages and current_page > browser.max_pages:
+            logger.warning(f"最大ページ数 ({browser.max_pages}) に達しました。")
+            return
+
+def search_label(search_query: Optional[str] = None, data_search: bool = False, data_search_project: bool = False) -> str:
+    """検索種別をログ表示用の文字列にする"""
+    if data_search:
+        return "タスク（データ検索）"
+    if data_search_project:
+        return "プロジェクト（データ検索）"
+    return f"キーワード検索: {search_query}"
+
+def upload_if_requested(output_path: str, upload_gdrive_flag: bool, gdrive_folder_id_val: Optional[str],
+                        gdrive_credentials_val: Optional[str]) -> None:
+    """指定されていれば出力ファイルをGoogle Driveにアップロードする"""
+    logger = logging.getLogger(__name__)
+    if not upload_gdrive_flag:
+        return
+    if gdrive_folder_id_val:
+        logger.info(f"Google Driveへのアップロードを開始します: {output_path}")
+        # Google API クライアントの読み込みは重いため、アップロードする時だけ読み込む
+        from utils.gdrive_uploader import upload_to_gdrive
+        upload_to_gdrive(output_path, gdrive_folder_id_val, gdrive_credentials_val)
+    else:
+        logger.warning("Google DriveフォルダIDが指定されていないため、アップロードをスキップします。")
+        logger.warning("--gdrive-folder-id 引数または GDRIVE_FOLDER_ID 環境変数を設定してください。")
+
+async def iter_search_results(
+    browser: LancersBrowser,
+    search_query: Optional[str] = None,
+    data_search: bool = False,
+    data_search_project: bool = False,
+    max_items: Optional[int] = None,
+    parallel_pages: bool = False,
+    page_concurrency: int = 4,
+    http_fetcher: Optional[LancersHttpFetcher] = None,
+    crawl_state: Optional[CrawlState] = None
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    起動済みのブラウザで1つの検索を実行し、最大取得件数までの案件情報をページごとに返す
+    crawl_state が指定された場合は取得済みの案件を除き、取得済みの案件だけのページに達したら打ち切る
+    （検索結果は新着順のため、それ以降のページも取得済みとみなす）
+    """
+    logger = logging.getLogger(__name__)
+    items_collected = 0
+    state_key = browser.build_search_url(search_query, data_search, data_search_project) if crawl_state else None
+    if crawl_state and parallel_pages:
+        logger.info("--parallel-pages 指定時は全ページを取得してから取得済みの案件を除きます。")
+    parser = LancersParser()
+
+    async for current_page, raw_results_page in iter_search_pages(
+        browser, search_query, data_search, data_search_project,
+        parallel_pages=parallel_pages, page_concurrency=page_concurrency, max_items=max_items,
+        http_fetcher=http_fetcher
+    ):
+        page_items_count = len(raw_results_page)
+        logger.info(f"ページ {current_page} から{page_items_count}件の案件情報を取得しました")
+
+        if crawl_state:
+            raw_results_page = crawl_state.filter_new(
+                state_key, raw_results_page, lambda result: parser.parse_work_id(result.get('url'))
+            )
+            logger.info(f"ページ {current_page} の新着: {len(raw_results_page)}件 / {page_items_count}件")
+            if not raw_results_page:
+                logger.info("取得済みの案件だけのページに達したため、検索を打ち切ります。")
+                break
+            page_items_count = len(raw_results_page)
+
+        items_needed = (max_items - items_collected) if max_items is not None else page_items_count
+        items_to_add = min(page_items_count, items_needed)
+
+        yield raw_results_page[:items_to_add]
+        items_collected += items_to_add
+
+        if max_items is not None and items_collected >= max_items:
+            logger.info(f"指定された最大取得件数 ({max_items}件) に達しました。")
+            break
+
+    if items_collected:
+        logger.info(f"合計 {items_collected} 件の案件情報を取得しました。")
+
+async def parse_search_pages(
+    pages: AsyncIterator[List[Dict[str, Any]]],
+    parser: LancersParser
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """ページごとの案件情報をパースして返す"""
+    async for raw_results_page in pages:
+        parsed_page = parser.parse_results(raw_results_page)
+        if parsed_page:
+            yield parsed_page
+
+async def stream_search_to_csv(
+    pages: AsyncIterator[List[Dict[str, Any]]],
+    csv_handler: CSVHandler,
+    output_file: Optional[str] = None,
+    prefix: Optional[str] = None,
+    fieldnames: Optional[List[str]] = None
+) -> Tuple[Optional[str], List[str]]:
+    """
+    パース済みの検索結果をページが届くたびにCSVへ書き込む
+    （最初の行を書く時にファイルを作成し、処理中も途中までの結果をファイルで確認できる）
+    Args:
+        pages (AsyncIterator[List[Dict[str, Any]]]): パース済みの案件情報をページごとに返す非同期イテレータ
+        output_file (Optional[str]): 出力ファイル名（省略時は prefix から自動生成）
+        prefix (Optional[str]): 自動生成するファイル名の接頭辞
+        fieldnames (Optional[List[str]]): 出力する列（省略時は基本列）
+    Returns:
+        Tuple[Optional[str], List[str]]: (保存したファイルのパス, 保存した案件IDのリスト)
+    """
+    logger = logging.getLogger(__name__)
+    writer: Optional[CsvStreamWriter] = None
+    work_ids: List[str] = []
+    try:
+        async for parsed_page in pages:
+            if writer is None:
+                filename = output_file or csv_handler.generate_filename(prefix=prefix or "lancers_jobs")
+                writer = csv_handler.open_stream(filename, fieldnames or ['scraped_at', 'title', 'url', 'work_id'])
+            writer.write_rows(parsed_page)
+            work_ids.extend(item.get('work_id', '') for item in parsed_page)
+    finally:
+        if writer:
+            writer.close()
+
+    if writer:
+        logger.info(f"スクレイピング結果を保存しました: {writer.filepath}")
+        logger.info(f"保存した案件数: {writer.rows_written}件")
+        return writer.filepath, work_ids
+    return None, work_ids
+
+def remember_crawled(
+    crawl_state: Optional[CrawlState],
+    browser: LancersBrowser,
+    work_ids: List[str],
+    search_query: Optional[str] = None,
+    data_search: bool = False,
+    data_search_project: bool = False
+) -> None:
+    """
+    保存した案件を取得済みとして記録する（出力の保存に成功した後に呼ぶ）
+    """
+    if not crawl_state:
+        return
+    state_key = browser.build_search_url(search_query, data_search, data_search_project)
+    crawl_state.mark_seen(state_key, work_ids)
+    crawl_state.save()
+
+def save_search_results(
+    csv_handler: CSVHandler,
+    parsed_results: List[Dict[str, Any]],
+    output_file: Optional[str] = None,
+    prefix: Optional[str] = None,
+    fieldnames: Optional[List[str]] = None
+) -> Optional[str]:
+    """
+    パース済みの検索結果をCSVに保存する
+    Args:
+        output_file (Optional[str]): 出力ファイル名（省略時は prefix から自動生成）
+        prefix (Optional[str]): 自動生成するファイル名の接頭辞
+        fieldnames (Optional[List[str]]): 出力する列（省略時は基本列）
+    Returns:
+        Optional[str]: 保存したファイルのパス
+    """
+    logger = logging.getLogger(__name__)
+    current_output_filename = output_file
+    if prefix and not current_output_filename:
+        current_output_filename = csv_handler.generate_filename(prefix=prefix)
+
+    output_path = csv_handler.save_to_csv(parsed_results, current_output_filename,
+                                          fieldnames=fieldnames or ['scraped_at', 'title', 'url', 'work_id'])
+    if output_path:
+        logger.info(f"スクレイピング結果を保存しました: {output_path}")
+        logger.info(f"保存した案件数: {len(parsed_results)}件")
+    else:
+        logger.warning("CSVファイルの保存に失敗したため、アップロードは行いません。")
+    return output_path
+
+def data_search_prefix(data_search_project: bool) -> str:
+    """データ検索の出力ファイル名の接頭辞"""
+    return "lancers_data_search_project" if data_search_project else "lancers_data_search_task"
 
 async def scrape_lancers(
     search_query: Optional[str] = None,
@@ -68,12 +438,17 @@ async def scrape_lancers(
     # args を個別パラメータに変更
     upload_gdrive_flag: bool = False,
     gdrive_folder_id_val: Optional[str] = None,
-    gdrive_credentials_val: Optional[str] = None
+    gdrive_credentials_val: Optional[str] = None,
+    browser_options: Optional[Dict[str, Any]] = None,
+    parallel_pages: bool = False,
+    page_concurrency: int = 4,
+    http_fetch: bool = False,
+    crawl_state: Optional[CrawlState] = None
 ):
     """
     Lancersの案件リストページをスクレイピングする
     """
-    logger = setup_logging()
+    logger = logging.getLogger(__name__)
     load_dotenv() # .envから環境変数を読み込む
 
     # --- DEBUG LOGGING ---
@@ -82,13 +457,13 @@ async def scrape_lancers(
 
     search_type = ""
     if data_search:
-        search_type = "タスク（データ検索）"
+        search_type = search_label(data_search=True)
         logger.info("データ検索URL（タスク）を使用してスクレイピングを開始します")
     elif data_search_project:
-        search_type = "プロジェクト（データ検索）"
+        search_type = search_label(data_search_project=True)
         logger.info("データ検索URL（プロジェクト）を使用してスクレイピングを開始します")
     elif search_query:
-        search_type = f"キーワード検索: {search_query}"
+        search_type = search_label(search_query)
         logger.info(f"スクレイピングを開始します。検索クエリ: {search_query}")
     else:
         logger.error("検索方法が指定されていません（--search-query, --data-search, --data-search-project のいずれか）。")
@@ -98,103 +473,425 @@ async def scrape_lancers(
         logger.info(f"最大取得件数: {max_items}件")
 
     try:
-        browser = LancersBrowser(headless=headless)
+        browser = LancersBrowser(headless=headless, **(browser_options or {}))
         parser = LancersParser()
         csv_handler = CSVHandler()
 
         async with browser:
-            all_results = []
-            current_page = 1
-            items_collected = 0
-
-            while True:
-                logger.info(f"ページ {current_page} を処理中...")
-                raw_results_page = []
-
-                if data_search:
-                    raw_results_page = await browser.search_with_data_url(page_num=current_page)
-                elif data_search_project:
-                    raw_results_page = await browser.search_with_data_project_url(page_num=current_page)
-                elif search_query:
-                    raw_results_page = await browser.search_short_videos(search_query, page_num=current_page)
-
-                if not raw_results_page:
-                    logger.warning(f"ページ {current_page} で検索結果が見つかりませんでした。")
-                    break
-
-                page_items_count = len(raw_results_page)
-                logger.info(f"ページ {current_page} から{page_items_count}件の案件情報を取得しました")
-
-                items_needed = (max_items - items_collected) if max_items is not None else page_items_count
-                items_to_add = min(page_items_count, items_needed)
-
-                all_results.extend(raw_results_page[:items_to_add])
-                items_collected += items_to_add
-
-                if max_items is not None and items_collected >= max_items:
-                    logger.info(f"指定された最大取得件数 ({max_items}件) に達しました。")
-                    break
-
-                logger.info("次のページへの遷移を試みます...")
-                has_next = await browser.go_to_next_search_page()
-                if not has_next:
-                    logger.info("次のページが見つかりませんでした。スクレイピングを終了します。")
-                    break
-
-                current_page += 1
-                if browser.max_pages and current_page > browser.max_pages:
-                    logger.warning(f"最大ページ数 ({browser.max_pages}) に達しました。")
-                    break
-
-            if all_results:
-                logger.info(f"合計 {items_collected} 件の案件情報を取得しました。")
-                parsed_results = parser.parse_results(all_results)
-                
-                if parsed_results:
-                    basic_fieldnames = ['scraped_at', 'title', 'url', 'work_id']
-                    
-                    current_output_filename = output_file
-                    # --data-search または --data-search-project で --output の指定がない場合、専用のファイル名を生成
-                    if (data_search_project or data_search) and not current_output_filename:
-                        prefix = "lancers_data_search_project" if data_search_project else "lancers_data_search_task"
-                        current_output_filename = csv_handler.generate_filename(prefix=prefix)
-                    
-                    output_path = csv_handler.save_to_csv(parsed_results, current_output_filename, fieldnames=basic_fieldnames)
-                    if output_path:
-                        logger.info(f"スクレイピング結果を保存しました: {output_path}")
-                        logger.info(f"保存した案件数: {len(parsed_results)}件")
-                        # Google Driveへのアップロード処理を追加
-                        # --- DEBUG LOGGING ---
-                        logger.debug(f"[scrape_lancers_upload_check] upload_gdrive_flag={upload_gdrive_flag}, gdrive_folder_id_val={gdrive_folder_id_val}")
-                        # --- END DEBUG LOGGING ---
-                        if upload_gdrive_flag:
-                            if gdrive_folder_id_val:
-                                logger.info(f"Google Driveへのアップロードを開始します: {output_path}")
-                                upload_to_gdrive(output_path, gdrive_folder_id_val, gdrive_credentials_val)
-                            else:
-                                logger.warning("Google DriveフォルダIDが指定されていないため、アップロードをスキップします。")
-                                logger.warning("--gdrive-folder-id 引数または GDRIVE_FOLDER_ID 環境変数を設定してください。")
-                    else:
-                        logger.warning("CSVファイルの保存に失敗したため、アップロードは行いません。")
-                else:
-                     logger.warning("パース結果が空でした。")
+            http_fetcher = await LancersHttpFetcher.from_browser(browser) if http_fetch else None
+            # --data-search または --data-search-project で --output の指定がない場合、専用のファイル名を生成
+            prefix = data_search_prefix(data_search_project) if (data_search or data_search_project) else None
+            # 取得 → パース → 書き込みをページ単位で流し、途中までの結果を随時ファイルに残す
+            pages = iter_search_results(
+                browser, search_query, data_search, data_search_project, max_items=max_items,
+                parallel_pages=parallel_pages, page_concurrency=page_concurrency, http_fetcher=http_fetcher,
+                crawl_state=crawl_state
+            )
+            output_path, work_ids = await stream_search_to_csv(
+                parse_search_pages(pages, parser), csv_handler, output_file, prefix=prefix
+            )
+            if http_fetcher:
+                http_fetcher.log_summary()
+                http_fetcher.close()
+
+            if output_path:
+                remember_crawled(crawl_state, browser, work_ids, search_query, data_search, data_search_project)
+                upload_if_requested(output_path, upload_gdrive_flag, gdrive_folder_id_val, gdrive_credentials_val)
+            elif crawl_state:
+                logger.info("新着の案件はありませんでした。")
+            else:
+                logger.warning("最終的な検索結果がありませんでした。")
+
+    except Exception as e:
+        logger.error(f"スクレイピング ({search_type}) 中にエラーが発生しました: {str(e)}", exc_info=True)
+
+async def scrape_with_details(
+    search_query: Optional[str] = None,
+    output_file: Optional[str] = None,
+    headless: bool = True,
+    data_search: bool = False,
+    data_search_project: bool = False,
+    max_items: Optional[int] = None,
+    upload_gdrive_flag: bool = False,
+    gdrive_folder_id_val: Optional[str] = None,
+    gdrive_credentials_val: Optional[str] = None,
+    browser_options: Optional[Dict[str, Any]] = None,
+    page_concurrency: int = 4,
+    parallel_pages: bool = False,
+    http_fetch: bool = False,
+    concurrency: int = 1,
+    controller: Optional[AimdConcurrencyController] = None,
+    detail_cache: Optional[DetailCache] = None,
+    crawl_state: Optional[CrawlState] = None
+):
+    """
+    検索と詳細取得を同時に実行し、詳細を結合した1つのCSVを出力する
+    検索タブで見つけた案件をキューに入れ、詳細取得ワーカー（concurrency 個のタブ）が同時に取り出して取得する
+    """
+    logger = logging.getLogger(__name__)
+    load_dotenv()
+    search_type = search_label(search_query, data_search, data_search_project)
+    if not (search_query or data_search or data_search_project):
+        logger.error("検索方法が指定されていません（--search-query, --data-search, --data-search-project のいずれか）。")
+        return
+    logger.info(f"検索と詳細取得を同時に実行します ({search_type}, 詳細取得の並列数: {concurrency})")
+
+    email = os.getenv("LANCERS_EMAIL")
+    password = os.getenv("LANCERS_PASSWORD")
+    parser = LancersParser()
+    csv_handler = CSVHandler()
+    writer: Optional[CsvStreamWriter] = None
+    work_ids: List[str] = []
+    try:
+        async with LancersBrowser(headless=headless, **(browser_options or {})) as browser:
+            if email and password:
+                if not await browser.ensure_logged_in(email, password):
+                    logger.error("ログインに失敗しました。ログインせずに続行します。")
+            else:
+                logger.warning("ログイン情報が環境変数に設定されていません。ログインせずに続行します。")
+
+            http_fetcher = await LancersHttpFetcher.from_browser(browser) if http_fetch else None
+            # 検索は専用のタブで行い、browser.page と追加のタブを詳細取得に使う
+            search_tab = await browser.open_tab()
+            search_fetcher = http_fetcher
+            if http_fetcher:
+                search_fetcher = copy.copy(http_fetcher)
+                search_fetcher.browser = search_tab
+            pool = DetailWorkerPool(browser, concurrency=concurrency, fetcher=http_fetcher, controller=controller)
+            pipeline = SearchDetailPipeline(pool, parser, detail_cache=detail_cache)
+
+            prefix = f"{data_search_prefix(data_search_project)}_details" if (data_search or data_search_project) else "lancers_jobs_details"
+            filename = output_file or csv_handler.generate_filename(prefix=prefix)
+            writer = csv_handler.open_stream(filename, ['scraped_at', 'title', 'url', 'work_id',
+                                                        'deadline_raw', 'delivery_date_raw', 'people'])
+
+            def write_row(row: Dict[str, Any]) -> None:
+                writer.write_rows([row])
+                work_ids.append(row.get('work_id', ''))
+
+            pages = iter_search_results(
+                search_tab, search_query, data_search, data_search_project, max_items=max_items,
+                parallel_pages=parallel_pages, page_concurrency=page_concurrency, http_fetcher=search_fetcher,
+                crawl_state=crawl_state
+            )
+            try:
+                await pipeline.run(parse_search_pages(pages, parser), write_row)
+            finally:
+                writer.close()
+                pipeline.log_summary()
+                await pool.close()
+                await search_tab.page.close()
+                if http_fetcher:
+                    http_fetcher.http_fetches += search_fetcher.http_fetches
+                    http_fetcher.browser_fallbacks += search_fetcher.browser_fallbacks
+                    http_fetcher.log_summary()
+                    http_fetcher.close()
+                if detail_cache:
+                    detail_cache.log_summary()
+
+            logger.info(f"詳細を結合した結果を保存しました: {writer.filepath} ({writer.rows_written}件)")
+            if work_ids:
+                remember_crawled(crawl_state, browser, work_ids, search_query, data_search, data_search_project)
+                upload_if_requested(writer.filepath, upload_gdrive_flag, gdrive_folder_id_val, gdrive_credentials_val)
+            elif crawl_state:
+                logger.info("新着の案件はありませんでした。")
             else:
                 logger.warning("最終的な検索結果がありませんでした。")
 
     except Exception as e:
         logger.error(f"スクレイピング ({search_type}) 中にエラーが発生しました: {str(e)}", exc_info=True)
+        if writer and writer.rows_written:
+            logger.warning(f"それまでに取得した {writer.rows_written} 件は保存済みです: {writer.filepath}")
+
+def read_keywords_file(filepath: str) -> List[str]:
+    """
+    キーワードファイルを読み込む（空行と # で始まる行は無視する）
+    UTF-8 で読めない場合は Shift_JIS (run_scraper.bat 用) として読み込む
+    """
+    for encoding in ('utf-8-sig', 'cp932'):
+        try:
+            with open(filepath, 'r', encoding=encoding) as f:
+                lines = [line.strip() for line in f]
+            return [line for line in lines if line and not line.startswith('#')]
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"キーワードファイルの文字コードを判別できませんでした: {filepath}")
+
+def keyword_filename_prefix(keyword: str) -> str:
+    """キーワードをファイル名に使える形にした接頭辞"""
+    safe = re.sub(r'[\\/:*?"<>|\s]+', '_', keyword).strip('_')
+    return f"lancers_jobs_{safe}" if safe else "lancers_jobs"
+
+async def scrape_keywords(
+    keywords: List[str],
+    headless: bool = True,
+    data_search: bool = False,
+    data_search_project: bool = False,
+    max_items: Optional[int] = None,
+    merge_output: bool = False,
+    output_file: Optional[str] = None,
+    keyword_concurrency: int = 1,
+    upload_gdrive_flag: bool = False,
+    gdrive_folder_id_val: Optional[str] = None,
+    gdrive_credentials_val: Optional[str] = None,
+    browser_options: Optional[Dict[str, Any]] = None,
+    parallel_pages: bool = False,
+    page_concurrency: int = 4,
+    http_fetch: bool = False,
+    crawl_state: Optional[CrawlState] = None
+):
+    """
+    複数のキーワード検索（と指定されたデータ検索）を1つのブラウザセッションでまとめて実行する
+    keyword_concurrency が2以上の場合はキーワードごとにタブを開いて並列に検索する
+    merge_output が有効な場合はキーワードの結果を重複排除して1つのファイルにまとめる
+    """
+    logger = logging.getLogger(__name__)
+    load_dotenv()
+    logger.info(f"{len(keywords)} 件のキーワードを1つのブラウザセッションで処理します (並列タブ数: {keyword_concurrency})")
+
+    parser = LancersParser()
+    csv_handler = CSVHandler()
+    output_paths: List[str] = []
+    try:
+        async with LancersBrowser(headless=headless, **(browser_options or {})) as browser:
+            http_fetcher = await LancersHttpFetcher.from_browser(browser) if http_fetch else None
+            keyword_results: Dict[str, List[Dict[str, Any]]] = {}
+            keyword_paths: Dict[str, str] = {}
+            semaphore = asyncio.Semaphore(max(1, keyword_concurrency))
+
+            async def crawl_keyword(keyword: str) -> None:
+                async with semaphore:
+                    tab = await browser.open_tab() if keyword_concurrency > 1 else browser
+                    tab_fetcher = http_fetcher
+                    if http_fetcher and tab is not browser:
+                        # フォールバック時に他のキーワードのタブを操作しないよう、接続プールを共有したままタブに紐付ける
+                        tab_fetcher = copy.copy(http_fetcher)
+                        tab_fetcher.browser = tab
+                    try:
+                        logger.info(f"スクレイピングを開始します。検索クエリ: {keyword}")
+                        pages = iter_search_results(
+                            tab, keyword, max_items=max_items, parallel_pages=parallel_pages,
+                            page_concurrency=page_concurrency, http_fetcher=tab_fetcher, crawl_state=crawl_state
+                        )
+                        if merge_output:
+                            keyword_results[keyword] = [item async for page in parse_search_pages(pages, parser) for item in page]
+                        else:
+                            # キーワードごとのファイルにはページが届くたびに書き込む
+                            output_path, work_ids = await stream_search_to_csv(
+                                parse_search_pages(pages, parser), csv_handler, prefix=keyword_filename_prefix(keyword)
+                            )
+                            if output_path:
+                                keyword_paths[keyword] = output_path
+                                remember_crawled(crawl_state, tab, work_ids, keyword)
+                            else:
+                                logger.warning(f"キーワード '{keyword}' の検索結果がありませんでした。")
+                    except Exception as e:
+                        logger.error(f"スクレイピング ({search_label(keyword)}) 中にエラーが発生しました: {str(e)}", exc_info=True)
+                        keyword_results[keyword] = []
+                    finally:
+                        if tab is not browser:
+                            await tab.page.close()
+                        if tab_fetcher is not http_fetcher:
+                            http_fetcher.http_fetches += tab_fetcher.http_fetches
+                            http_fetcher.browser_fallbacks += tab_fetcher.browser_fallbacks
+
+            await asyncio.gather(*(crawl_keyword(keyword) for keyword in keywords))
+
+            if merge_output:
+                merged: Dict[str, Dict[str, Any]] = {}
+                for keyword in keywords:
+                    for item in keyword_results.get(keyword, []):
+                        key = item.get('work_id') or item.get('url')
+                        if key in merged:
+                            merged[key]['keywords'] += f",{keyword}"
+                        else:
+                            merged[key] = {**item, 'keywords': keyword}
+                if merged:
+                    logger.info(f"重複を除いた案件数: {len(merged)}件")
+                    output_path = save_search_results(
+                        csv_handler, list(merged.values()), output_file, prefix="lancers_jobs_merged",
+                        fieldnames=['scraped_at', 'title', 'url', 'work_id', 'keywords']
+                    )
+                    if output_path:
+                        output_paths.append(output_path)
+                        for keyword in keywords:
+                            remember_crawled(crawl_state, browser,
+                                             [item.get('work_id', '') for item in keyword_results.get(keyword, [])], keyword)
+                else:
+                    logger.warning("最終的な検索結果がありませんでした。")
+            else:
+                output_paths.extend(keyword_paths[keyword] for keyword in keywords if keyword in keyword_paths)
+
+            for enabled, is_project in ((data_search, False), (data_search_project, True)):
+                if not enabled:
+                    continue
+                label = search_label(data_search=not is_project, data_search_project=is_project)
+                try:
+                    logger.info(f"{label} を同じセッションで実行します")
+                    pages = iter_search_results(
+                        browser, data_search=not is_project, data_search_project=is_project, max_items=max_items,
+                        parallel_pages=parallel_pages, page_concurrency=page_concurrency, http_fetcher=http_fetcher,
+                        crawl_state=crawl_state
+                    )
+                    output_path, work_ids = await stream_search_to_csv(
+                        parse_search_pages(pages, parser), csv_handler, prefix=data_search_prefix(is_project)
+                    )
+                    if output_path:
+                        output_paths.append(output_path)
+                        remember_crawled(crawl_state, browser, work_ids,
+                                         data_search=not is_project, data_search_project=is_project)
+                    else:
+                        logger.warning(f"{label} の検索結果がありませんでした。")
+                except Exception as e:
+                    logger.error(f"スクレイピング ({label}) 中にエラーが発生しました: {str(e)}", exc_info=True)
+
+            if http_fetcher:
+                http_fetcher.log_summary()
+                http_fetcher.close()
+    except Exception as e:
+        logger.error(f"キーワード一括スクレイピング中にエラーが発生しました: {str(e)}", exc_info=True)
+
+    for output_path in output_paths:
+        upload_if_requested(output_path, upload_gdrive_flag, gdrive_folder_id_val, gdrive_credentials_val)
+    return output_paths
+
+def effective_chunk_size(chunk_size: Optional[int], concurrency: int, workers: int) -> int:
+    """
+    --scrape-urls で1回に読み込んで保存する行数を決める
+    チャンク内の最も遅いURLが終わるまで次のチャンクを始めないため、並列取得時は同時取得数に比例して大きくする
+    Args:
+        chunk_size (Optional[int]): --chunk-size の指定（指定時はそのまま使う）
+        concurrency (int): プロセスあたりのタブ数
+        workers (int): ワーカープロセス数
+    Returns:
+        int: チャンクサイズ
+    """
+    if chunk_size:
+        return max(1, chunk_size)
+    slots = max(1, concurrency) * max(1, workers)
+    return DEFAULT_CHUNK_SIZE if slots == 1 else max(DEFAULT_CHUNK_SIZE, slots * URLS_PER_SLOT_PER_CHUNK)
+
+async def prepare_worker_session(browser: LancersBrowser, email: str, password: str) -> bool:
+    """
+    --workers 2以上の場合に、各ワーカープロセスが読み込むログイン済みセッションを用意する
+    保存済みのセッションが有効ならブラウザを起動せず、ログインが必要な場合だけ起動してログインする
+    Args:
+        browser (LancersBrowser): 未起動のブラウザ
+        email (str): ログイン用メールアドレス
+        password (str): ログイン用パスワード
+    Returns:
+        bool: ログイン済みのセッションを用意できた（またはログインが不要な）場合はTrue
+    """
+    logger = logging.getLogger(__name__)
+    if browser.replayer:
+        logger.info("リプレイモードのため、ログインを省略します")
+        return True
+    if not browser.session_store:
+        # セッションを共有できないため、各プロセスがそれぞれログインする
+        logger.info("セッションを保存しないため、各ワーカープロセスでログインします")
+        return True
+    fetcher = LancersHttpFetcher.from_session_store(browser)
+    if fetcher:
+        try:
+            logged_in = await fetcher.is_logged_in()
+        finally:
+            fetcher.close()
+        if logged_in:
+            logger.info("保存済みのセッションが有効なため、ブラウザを起動せずに各ワーカープロセスで使います")
+            return True
+        logger.info("保存済みのセッションが期限切れのため、ログインし直します")
+    async with browser:
+        return await browser.ensure_logged_in(email, password)
+
+def details_fieldnames(original_fieldnames: List[str]) -> List[str]:
+    """
+    --scrape-urls の出力列（詳細の列の後に、除外対象以外の入力CSVの列を続ける）
+    全チャンクで同じヘッダーを使うため、取得前に入力CSVのヘッダーだけから決める
+    """
+    desired_columns_ordered = ['scraped_at', 'title', 'url', 'deadline_raw', 'delivery_date_raw', 'people']
+    columns_to_remove = {'deadline', 'delivery_date', 'price', 'type', 'status', 'work_id', 'period'}
+    return desired_columns_ordered + [
+        key for key in original_fieldnames if key not in desired_columns_ordered and key not in columns_to_remove
+    ]
+
+def make_chunk_pause_hook(skip_confirm: bool) -> Optional[Callable[[int, int], bool]]:
+    """
+    チャンクの合間に続行を確認する関数を返す
+    --skip-confirm 指定時や、標準入力が端末でない場合（スケジューラ・パイプ経由の実行）は None を返し、確認せずに続行する
+    """
+    if skip_confirm or not sys.stdin or not sys.stdin.isatty():
+        return None
+
+    def confirm(chunk_start: int, chunk_end: int) -> bool:
+        try:
+            response = input(f"--- チャンク {chunk_start + 1}-{chunk_end} 完了。次のチャンクに進みますか？ (y/n): ")
+        except EOFError:
+            return False
+        return response.lower() == 'y'
+
+    return confirm
+
+def install_sigterm_handler() -> None:
+    """
+    SIGTERM（スケジューラからの停止要求など）を受け取ったら実行中の処理をキャンセルし、
+    Ctrl+C と同じ中断時の保存処理を通るようにする（Windows では何もしない）
+    """
+    task = asyncio.current_task()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+    except (NotImplementedError, AttributeError):
+        pass
 
 async def main():
     """メイン関数"""
-    logger = setup_logging()
     load_dotenv() # main関数直下でも念のため呼び出し (parse_argumentsでos.getenvを使うため)
+    args = parse_arguments()
+    logger = setup_logging(args)
+    install_sigterm_handler()
     try:
-        args = parse_arguments()
         # --- DEBUG LOGGING ---
         logger.debug(f"[main] Parsed args: upload_gdrive={args.upload_gdrive}, folder_id={args.gdrive_folder_id}, creds_path={args.gdrive_credentials}, search_query='{args.search_query}', output='{args.output}'")
         # --- END DEBUG LOGGING ---
 
-        if args.extract_urls:
+        if args.record and args.replay:
+            logger.error("--record と --replay は同時に指定できません。")
+            return
+        if args.scrape_urls and args.adaptive_concurrency and args.workers > 1:
+            # 並列数の制御がプロセスごとに独立してしまい、サイト全体への負荷を調整できない
+            logger.error("--adaptive-concurrency と --workers (2以上) は同時に指定できません。")
+            return
+        if args.record and args.workers > 1:
+            # 複数のプロセスが同じ記録ファイルに書き込まないようにする
+            logger.warning("--record 指定時は --workers を 1 にします。")
+            args.workers = 1
+        if (args.record or args.replay) and args.http_fetch:
+            # HTTP取得はブラウザのルーティングを通らないため、記録・再生の対象にならない
+            logger.warning("--record / --replay 指定時は --http-fetch を無効にします。")
+            args.http_fetch = False
+
+        if args.reparse_archive:
+            logger.info(f"ページアーカイブの案件詳細を解析し直します: {args.archive_dir}")
+            archive = PageArchive(args.archive_dir, max_bytes=int(args.archive_max_mb * 1024 * 1024))
+            details = reparse_details(archive, LancersParser())
+            # 読み込んだページの最終使用日時を索引に書き出し、削除の順番に反映する
+            await archive.flush()
+            if details:
+                csv_handler = CSVHandler()
+                fieldnames = ['scraped_at', 'title', 'url', 'deadline_raw', 'delivery_date_raw', 'people']
+                output_path = csv_handler.save_to_csv(details, args.reparse_archive, fieldnames=fieldnames)
+                logger.info(f"{len(details)} 件の案件詳細を保存しました: {output_path}")
+            else:
+                logger.warning("アーカイブに案件詳細ページがありませんでした。")
+
+        elif args.normalize_csv:
+            input_path, output_path = args.normalize_csv
+            if not os.path.exists(input_path):
+                logger.error(f"入力CSVファイルが存在しません: {input_path}")
+                return
+            logger.info(f"CSVファイルの列を正規化します: {input_path}")
+            normalize_csv(CSVHandler(), input_path, output_path)
+
+        elif args.extract_urls:
             logger.info(f"CSVファイルからURLを抽出します: {args.extract_urls}")
             csv_handler = CSVHandler()
             urls = csv_handler.extract_urls(args.extract_urls)
@@ -209,8 +906,9 @@ async def main():
                         logger.error(f"URLファイルの書き込み中にエラー: {write_error}")
                 else:
                     logger.info("抽出したURL:")
-                    for url in urls:
-                        print(url)
+                    # ログは別スレッドから標準出力に書き込まれるため、行の途中に混ざらないよう1回で書き込む
+                    sys.stdout.write(''.join(url + '\n' for url in urls))
+                    sys.stdout.flush()
                 logger.info(f"抽出されたURLの数: {len(urls)}")
             else:
                 logger.warning("URLが見つかりませんでした")
@@ -218,12 +916,18 @@ async def main():
         elif args.scrape_urls:
             csv_filepath = args.scrape_urls
             logger.info(f"CSVファイルからURLを読み込み、詳細情報を取得して新しいファイルに保存します: {csv_filepath}")
-            logger.info(f"チャンクサイズ: {args.chunk_size}")
+            chunk_size = effective_chunk_size(args.chunk_size, args.concurrency, args.workers)
+            logger.info(f"チャンクサイズ: {chunk_size}")
+            logger.info(f"並列数: {args.concurrency}")
+            if args.workers > 1:
+                logger.info(f"ワーカープロセス数: {args.workers}")
 
             csv_handler = CSVHandler()
-            original_data: List[Dict[str, Any]] = csv_handler.read_csv(csv_filepath)
+            # 入力はチャンクごとに読み込み、ファイル全体をメモリに載せない
+            original_fieldnames = csv_handler.read_header(csv_filepath)
+            total_count = csv_handler.count_rows(csv_filepath) if original_fieldnames else 0
 
-            if not original_data:
+            if not total_count:
                 logger.warning(f"CSVファイルが空か、読み込みに失敗しました: {csv_filepath}")
                 return
 
@@ -231,18 +935,40 @@ async def main():
             email = os.getenv("LANCERS_EMAIL")
             password = os.getenv("LANCERS_PASSWORD")
 
-            processed_data = []
             processed_count = 0
-            total_count = len(original_data)
+            detail_cache = None
+            if not args.no_detail_cache:
+                detail_cache = DetailCache(args.detail_cache, ttl=args.cache_ttl * 3600, max_entries=args.cache_max_entries)
+            # 取得が終わったURLを1件ずつ記録し、中断後は --resume で続きから再開する
+            journal = ScrapeJournal(args.journal_file or ScrapeJournal.path_for(csv_filepath))
+            resumed_records = journal.load() if args.resume else {}
+            if args.resume:
+                logger.info(f"ジャーナルから {len(resumed_records)} 件の取得済み結果を読み込みました: {journal.path}")
+            elif os.path.exists(journal.path):
+                logger.info(f"前回のジャーナルを破棄して最初から取得します（続きから再開する場合は --resume）: {journal.path}")
+            journal.open(resume=args.resume)
+            all_chunks_done = False
+            # 完了したチャンクを出力ファイルに追記して同期する（--resume 時はジャーナルの行から作り直す）
+            base, ext = os.path.splitext(os.path.basename(csv_filepath))
+            new_filename = f"{base}_details{ext}"
+            details_writer = csv_handler.open_stream(new_filename, details_fieldnames(original_fieldnames))
+            logger.info(f"最終的なCSVヘッダー: {details_writer.fieldnames}")
+            pause_hook = make_chunk_pause_hook(args.skip_confirm)
 
             try:
-                browser = LancersBrowser(headless=not args.no_headless)
+                browser = LancersBrowser(headless=not args.no_headless, **build_browser_options(args))
                 parser = LancersParser()
 
-                async with browser:
+                async with contextlib.AsyncExitStack() as browser_stack:
+                    if args.workers == 1:
+                        await browser_stack.enter_async_context(browser)
                     if email and password:
                         logger.info("ログインを試行します...")
-                        login_successful = await browser.login(email, password)
+                        if args.workers > 1:
+                            # 各プロセスがセッションファイルを読み込むため、このプロセスではログインが必要な時だけブラウザを起動する
+                            login_successful = await prepare_worker_session(browser, email, password)
+                        else:
+                            login_successful = await browser.ensure_logged_in(email, password)
                         if not login_successful:
                             logger.error("ログインに失敗しました。ファイル保存を試みます。")
                         else:
@@ -250,132 +976,189 @@ async def main():
                     else:
                         logger.warning("ログイン情報が環境変数に設定されていません。ログインせずに続行します。")
 
-                    chunk_size = args.chunk_size
                     should_continue = True
-                    for i in range(0, total_count, chunk_size):
+                    controller = None
+                    if args.adaptive_concurrency:
+                        controller = AimdConcurrencyController(initial=min(2, args.concurrency), max_limit=args.concurrency,
+                                                               latency_threshold=args.latency_threshold)
+                    if args.workers > 1:
+                        # ログイン済みのセッションファイルを各プロセスが読み込む（無効な場合は各プロセスでログインする）
+                        http_fetcher = None
+                        pool = ShardedDetailPool(args.workers, concurrency=args.concurrency,
+                                                 browser_options=build_browser_options(args),
+                                                 headless=not args.no_headless, http_fetch=args.http_fetch,
+                                                 email=email, password=password)
+                    else:
+                        http_fetcher = await LancersHttpFetcher.from_browser(browser) if args.http_fetch else None
+                        pool = DetailWorkerPool(browser, concurrency=args.concurrency, fetcher=http_fetcher, controller=controller)
+                    if chunk_size < args.workers * args.concurrency:
+                        logger.warning(f"チャンクサイズ ({chunk_size}) が同時取得数 ({args.workers * args.concurrency}) より小さいため、"
+                                       f"一部のタブが待機します。--chunk-size を大きくするか、省略してください。")
+                    await pool.open()
+                    for chunk_index, current_chunk_data in enumerate(csv_handler.iter_csv_chunks(csv_filepath, chunk_size)):
                         if not should_continue:
                             break
 
-                        chunk_start = i
-                        chunk_end = min(i + chunk_size, total_count)
-                        current_chunk_data = original_data[chunk_start:chunk_end]
+                        chunk_start = chunk_index * chunk_size
+                        chunk_end = chunk_start + len(current_chunk_data)
                         logger.info(f"--- チャンク {chunk_start + 1}-{chunk_end}/{total_count} を処理開始 ---")
 
-                        chunk_results = []
-                        for j, row in enumerate(current_chunk_data, start=chunk_start):
+                        chunk_results: List[Optional[Dict[str, Any]]] = [None] * len(current_chunk_data)
+                        chunk_ok = [False] * len(current_chunk_data)
+                        urls_to_fetch: List[Optional[str]] = [None] * len(current_chunk_data)
+                        new_cache_items = []
+                        for offset, row in enumerate(current_chunk_data):
+                            j = chunk_start + offset
                             url = row.get('url')
-                            current_row_data = row.copy()
-
                             if not url:
                                 logger.warning(f"行 {j+1}: URLが見つかりません。スキップします。")
+                                chunk_results[offset] = row.copy()
+                                continue
+                            # 前回の実行でジャーナルに記録済みの案件は取得し直さない
+                            journaled = resumed_records.get((j, url))
+                            if journaled:
+                                chunk_results[offset] = journaled['row']
+                                chunk_ok[offset] = journaled['ok']
+                                continue
+                            # 有効期間内にキャッシュされている案件はページを開かない
+                            cached = detail_cache.get(parser.parse_work_id(url)) if detail_cache else None
+                            if cached:
+                                current_row_data = row.copy()
+                                current_row_data.update(cached)
+                                chunk_results[offset] = current_row_data
+                                chunk_ok[offset] = True
+                                journal.append(j, url, current_row_data, True)
+                                logger.debug("  キャッシュからマージ (行 %d): %s", j + 1, url)
+                                continue
+                            urls_to_fetch[offset] = url
+
+                        def record_detail(offset: int, detail: Optional[Dict[str, Any]]) -> None:
+                            # 1件取得するごとにジャーナルへ記録する
+                            j = chunk_start + offset
+                            url = current_chunk_data[offset]['url']
+                            current_row_data = current_chunk_data[offset].copy()
+                            if detail:
+                                parsed_detail = parser.parse_work_detail(detail)
+                                current_row_data.update(parsed_detail)
+                                chunk_ok[offset] = True
+                                new_cache_items.append((parser.parse_work_id(url), parsed_detail))
+                                logger.debug("  詳細取得・マージ後データ (行 %d): %s", j + 1, current_row_data)
                             else:
-                                logger.info(f"処理中 ({j+1}/{total_count}): {url}")
-                                try:
-                                    detail = await browser.get_work_detail_by_url(url)
-                                    if detail:
-                                        parsed_detail = parser.parse_work_detail(detail)
-                                        current_row_data.update(parsed_detail)
-                                        processed_count += 1
-                                        logger.debug(f"  詳細取得・マージ後データ (行 {j+1}): {current_row_data}")
-                                    else:
-                                        logger.warning(f"URL {url} の詳細情報を取得できませんでした。")
-                                except Exception as detail_error:
-                                    logger.error(f"URL {url} の処理中にエラーが発生しました: {detail_error}")
-
-                            chunk_results.append(current_row_data)
-                            processed_in_chunk = j + 1 - chunk_start
-                            if processed_in_chunk % 5 == 0 or (j + 1) == chunk_end:
-                                logger.info(f"チャンク内 {processed_in_chunk}/{len(current_chunk_data)} 件処理完了 (全体 {j+1}/{total_count})")
-
-                        processed_data.extend(chunk_results)
+                                logger.warning(f"URL {url} の詳細情報を取得できませんでした。")
+                            chunk_results[offset] = current_row_data
+                            journal.append(j, url, current_row_data, chunk_ok[offset])
+
+                        if any(urls_to_fetch):
+                            await pool.fetch_all(urls_to_fetch, on_result=record_detail)
+                        else:
+                            logger.info("チャンク内の全件がジャーナルまたはキャッシュにあるため、取得を省略します。")
+                        for offset, result in enumerate(chunk_results):
+                            if result is None:
+                                # ワーカープロセスの失敗などで結果が返らなかった行（ジャーナルに無いため --resume で再取得する）
+                                logger.warning(f"URL {current_chunk_data[offset].get('url')} の詳細情報を取得できませんでした。")
+                                chunk_results[offset] = current_chunk_data[offset].copy()
+                        processed_count += sum(chunk_ok)
+                        if detail_cache:
+                            detail_cache.put_many(new_cache_items)
+                        logger.info(f"チャンク内 {len(current_chunk_data)}/{len(current_chunk_data)} 件処理完了 (全体 {chunk_end}/{total_count})")
+                        details_writer.write_rows(chunk_results)
+                        details_writer.sync()
 
                         if chunk_end < total_count:
-                            if args.skip_confirm:
-                                logger.info("--skip-confirm オプションにより確認なしで次のチャンクに進みます。")
-                                continue
-                            try:
-                                response = input(f"--- チャンク {chunk_start + 1}-{chunk_end} 完了。次のチャンクに進みますか？ (y/n): ")
-                                if response.lower() != 'y':
-                                    logger.info("ユーザーの選択により処理を中断しました。")
-                                    should_continue = False
-                            except EOFError:
-                                logger.warning("入力が取得できなかったため、処理を中断します。")
+                            if pause_hook and any(urls_to_fetch) and not pause_hook(chunk_start, chunk_end):
+                                logger.info("ユーザーの選択により処理を中断しました。")
                                 should_continue = False
                         else:
                             logger.info("--- 全てのチャンク処理が完了しました ---")
+                            all_chunks_done = True
+                    await pool.close()
+                    if http_fetcher:
+                        http_fetcher.log_summary()
+                        http_fetcher.close()
+                    if detail_cache:
+                        detail_cache.log_summary()
+                        detail_cache.close()
 
             except Exception as browser_error:
                  logger.error(f"ブラウザ処理中にエラーが発生しました: {browser_error}")
-                 logger.warning("エラーが発生しましたが、それまでに処理した結果で新しいCSVファイルを作成します。")
-
-            # --- Corrected saving logic (Simplified & Final V6) ---
-            if processed_data:
-                 final_data_to_save = processed_data
-                 logger.info(f"CSVファイルへの保存を試みます。対象行数: {len(final_data_to_save)}")
-                 if len(final_data_to_save) > 0:
-                     logger.debug(f"保存直前のデータサンプル (先頭1件): {final_data_to_save[0]}")
-
-                 if final_data_to_save:
-                    # 1. Define the essential columns and their desired order
-                    desired_columns_ordered = [
-                        'scraped_at', 'title', 'url', 'deadline_raw',
-                        'delivery_date_raw', 'people'
-                    ]
-                    # 2. Define columns to absolutely remove
-                    columns_to_remove = {'deadline', 'delivery_date', 'price', 'type', 'status', 'work_id', 'period'}
-
-                    # 3. Construct the final fieldnames list more robustly
-                    final_fieldnames = list(desired_columns_ordered) # Start with desired order
-
-                    # 4. Get original keys (if original data exists)
-                    original_keys = []
-                    if original_data:
-                         original_keys = list(original_data[0].keys())
-
-                    # 5. Add original keys that are not desired and not removed
-                    for key in original_keys:
-                        if key not in final_fieldnames and key not in columns_to_remove:
-                            final_fieldnames.append(key)
-                            
-                    # 6. Add any other keys from processed data if missed (e.g., new keys from scraping)
-                    all_processed_keys = set()
-                    for item in final_data_to_save:
-                        if isinstance(item, dict):
-                           all_processed_keys.update(item.keys())
-                    for key in sorted(list(all_processed_keys)):
-                        if key not in final_fieldnames and key not in columns_to_remove:
-                             final_fieldnames.append(key)
-
-                    logger.info(f"最終的なCSVヘッダー (保存直前、V8): {final_fieldnames}")
+                 logger.warning("エラーが発生しましたが、それまでに完了したチャンクは保存済みです。")
+                 logger.warning(f"--resume を付けて再実行すると、取得済みのURLを飛ばして続きから再開できます: {journal.path}")
+            finally:
+                 journal.close()
+                 details_writer.close()
 
-                    try:
-                        base, ext = os.path.splitext(os.path.basename(csv_filepath))
-                        new_filename = f"{base}_details{ext}"
-                        output_path = csv_handler.save_to_csv(final_data_to_save, new_filename, fieldnames=final_fieldnames)
-                        if output_path:
-                            logger.info(f"結果を新しいCSVファイル ({new_filename}) に保存しました: {output_path}")
-                            logger.info(f"CSVに保存した総行数: {len(final_data_to_save)}")
-                            logger.info(f"うち、詳細情報を取得・マージできた件数: {processed_count}")
-                            # Google Driveへのアップロード処理を追加
-                            if args.upload_gdrive:
-                                if args.gdrive_folder_id:
-                                    logger.info(f"Google Driveへのアップロードを開始します: {output_path}")
-                                    upload_to_gdrive(output_path, args.gdrive_folder_id, args.gdrive_credentials)
-                                else:
-                                    logger.warning("Google DriveフォルダIDが指定されていないため、アップロードをスキップします。")
-                                    logger.warning("--gdrive-folder-id 引数または GDRIVE_FOLDER_ID 環境変数を設定してください。")
-                        else:
-                            logger.warning(f"新しいCSVファイル ({new_filename}) の保存に失敗したため、アップロードは行いません。")
-                    except Exception as save_error:
-                         logger.error(f"新しいCSVファイルの保存中にエラーが発生しました: {save_error}")
-                 else:
-                      logger.warning("最終的な保存対象データが空です。")
-            else:
-                 logger.warning("処理されたデータがありませんでした。CSVファイルは作成されません。")
-            # --- End of corrected saving logic ---
+            output_path = details_writer.filepath
+            if not details_writer.rows_written:
+                logger.warning("処理されたデータがありませんでした。CSVファイルは作成されません。")
+                os.remove(output_path)
+                return
+            logger.info(f"結果を新しいCSVファイル ({new_filename}) に保存しました: {output_path}")
+            logger.info(f"CSVに保存した総行数: {details_writer.rows_written}")
+            logger.info(f"うち、詳細情報を取得・マージできた件数: {processed_count}")
+            if all_chunks_done:
+                # 全件を保存できたため、再開用の記録は不要
+                journal.remove()
+            upload_if_requested(output_path, args.upload_gdrive, args.gdrive_folder_id, args.gdrive_credentials)
+
+        elif args.keywords_file:
+            keywords = read_keywords_file(args.keywords_file)
+            if not keywords and not (args.data_search or args.data_search_project):
+                logger.warning(f"キーワードファイルに有効なキーワードがありません: {args.keywords_file}")
+                return
+            await scrape_keywords(
+                keywords,
+                headless=not args.no_headless,
+                data_search=args.data_search,
+                data_search_project=args.data_search_project,
+                max_items=args.max_items,
+                merge_output=args.merge_output,
+                output_file=args.output,
+                keyword_concurrency=args.keyword_concurrency,
+                upload_gdrive_flag=args.upload_gdrive,
+                gdrive_folder_id_val=args.gdrive_folder_id,
+                gdrive_credentials_val=args.gdrive_credentials,
+                browser_options=build_browser_options(args),
+                parallel_pages=args.parallel_pages,
+                page_concurrency=args.page_concurrency,
+                http_fetch=args.http_fetch,
+                crawl_state=CrawlState(args.crawl_state_file) if args.incremental else None
+            )
 
         else:
-            if args.search_query or args.data_search or args.data_search_project:
+            if args.with_details and (args.search_query or args.data_search or args.data_search_project):
+                if args.workers > 1:
+                    logger.warning("--with-details では --workers を使用できないため、1プロセスで詳細を取得します。")
+                controller = None
+                if args.adaptive_concurrency:
+                    controller = AimdConcurrencyController(initial=min(2, args.concurrency), max_limit=args.concurrency,
+                                                           latency_threshold=args.latency_threshold)
+                detail_cache = None
+                if not args.no_detail_cache:
+                    detail_cache = DetailCache(args.detail_cache, ttl=args.cache_ttl * 3600, max_entries=args.cache_max_entries)
+                try:
+                    await scrape_with_details(
+                        search_query=args.search_query,
+                        output_file=args.output,
+                        headless=not args.no_headless,
+                        data_search=args.data_search,
+                        data_search_project=args.data_search_project,
+                        max_items=args.max_items,
+                        upload_gdrive_flag=args.upload_gdrive,
+                        gdrive_folder_id_val=args.gdrive_folder_id,
+                        gdrive_credentials_val=args.gdrive_credentials,
+                        browser_options=build_browser_options(args),
+                        parallel_pages=args.parallel_pages,
+                        page_concurrency=args.page_concurrency,
+                        http_fetch=args.http_fetch,
+                        concurrency=args.concurrency,
+                        controller=controller,
+                        detail_cache=detail_cache,
+                        crawl_state=CrawlState(args.crawl_state_file) if args.incremental else None
+                    )
+                finally:
+                    if detail_cache:
+                        detail_cache.close()
+            elif args.search_query or args.data_search or args.data_search_project:
                  # --- DEBUG LOGGING for scrape_lancers call ---
                  logger.debug(f"[main_pre_call_scrape_lancers] Passing to scrape_lancers: "
                               f"upload_gdrive_flag={args.upload_gdrive}, "
@@ -392,80 +1175,31 @@ async def main():
                      # 個別パラメータとして渡す
                      upload_gdrive_flag=args.upload_gdrive,
                      gdrive_folder_id_val=args.gdrive_folder_id,
-                     gdrive_credentials_val=args.gdrive_credentials
+                     gdrive_credentials_val=args.gdrive_credentials,
+                     browser_options=build_browser_options(args),
+                     parallel_pages=args.parallel_pages,
+                     page_concurrency=args.page_concurrency,
+                     http_fetch=args.http_fetch,
+                     crawl_state=CrawlState(args.crawl_state_file) if args.incremental else None
                      # apply_filter_flag は削除されたので渡さない
                  )
             else:
-                 logger.warning("実行するタスクが指定されていません (--search-query, --data-search, --data-search-project, --extract-urls, --scrape-urls のいずれかが必要です)。")
-
-    except KeyboardInterrupt:
-        logger.info("\n処理を中断しました (KeyboardInterrupt)。途中までのデータを保存します...")
-        # --- 中断時のCSV保存処理 ---
-        # processed_dataが定義されており、かつ空でない場合に保存を試みる
-        if 'processed_data' in locals() and processed_data:
-            try:
-                final_data_to_save = processed_data
-                logger.info(f"CSVファイルへの保存を試みます (中断時)。対象行数: {len(final_data_to_save)}")
-
-                if final_data_to_save:
-                    # ヘッダー決定ロジック (通常保存時と同様)
-                    desired_columns_ordered = [
-                        'scraped_at', 'title', 'url', 'deadline_raw',
-                        'delivery_date_raw', 'people'
-                    ]
-                    columns_to_remove = {'deadline', 'delivery_date', 'price', 'type', 'status', 'work_id', 'period'}
-                    final_fieldnames = list(desired_columns_ordered)
-                    original_keys = []
-                    # original_data がスコープ内に存在するか確認
-                    if 'original_data' in locals() and original_data:
-                         original_keys = list(original_data[0].keys())
-                    for key in original_keys:
-                        if key not in final_fieldnames and key not in columns_to_remove:
-                            final_fieldnames.append(key)
-                    all_processed_keys = set()
-                    for item in final_data_to_save:
-                        if isinstance(item, dict):
-                           all_processed_keys.update(item.keys())
-                    for key in sorted(list(all_processed_keys)):
-                        if key not in final_fieldnames and key not in columns_to_remove:
-                             final_fieldnames.append(key)
-
-                    logger.info(f"最終的なCSVヘッダー (中断時): {final_fieldnames}")
+                 logger.warning("実行するタスクが指定されていません (--search-query, --data-search, --data-search-project, --keywords-file, --extract-urls, --scrape-urls のいずれかが必要です)。")
 
-                    try:
-                        # csv_filepath と csv_handler がスコープ内に存在するか確認
-                        if 'csv_filepath' in locals() and 'csv_handler' in locals():
-                            base, ext = os.path.splitext(os.path.basename(csv_filepath))
-                            # 中断したことがわかるファイル名に変更
-                            new_filename = f"{base}_details_interrupted{ext}"
-                            output_path = csv_handler.save_to_csv(final_data_to_save, new_filename, fieldnames=final_fieldnames)
-                            if output_path:
-                                logger.info(f"中断時の結果を新しいCSVファイル ({new_filename}) に保存しました: {output_path}")
-                                logger.info(f"CSVに保存した総行数: {len(final_data_to_save)}")
-                                # processed_count がスコープ内に存在するか確認
-                                if 'processed_count' in locals():
-                                    logger.info(f"うち、詳細情報を取得・マージできた件数: {processed_count}")
-                            else:
-                                logger.warning(f"中断時のCSVファイルの保存に失敗しました (パス未取得)。")
-                        else:
-                             logger.warning("中断時のCSV保存に必要な情報 (ファイルパス/ハンドラ) が不足しています。")
-
-                    except Exception as save_error:
-                         logger.error(f"中断時のCSVファイル保存中にエラーが発生しました: {save_error}")
-                else:
-                      logger.warning("中断時の保存対象データが空です。")
-            except Exception as general_save_error:
-                 logger.error(f"中断時のデータ保存処理全体でエラーが発生しました: {general_save_error}")
-        else:
-            logger.info("中断時に保存するデータがありませんでした。")
-        # --- 中断時のCSV保存処理ここまで ---
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        # Python 3.11 以降の Ctrl+C と SIGTERM は実行中のタスクのキャンセルとして届く
+        logger.info("\n処理を中断しました (KeyboardInterrupt / SIGTERM)。")
+        # 完了したチャンクは出力ファイルに同期済みで、処理中のチャンクで取得済みのURLはジャーナルに記録済み
+        if 'details_writer' in locals():
+            details_writer.close()
+            logger.info(f"完了したチャンクの {details_writer.rows_written} 行は保存済みです: {details_writer.filepath}")
+            logger.info(f"--resume を付けて再実行すると続きから再開できます: {journal.path}")
         sys.exit(1) # 保存試行後にプログラムを終了
     except Exception as e:
         logger.error(f"予期せぬエラーが発生しました: {str(e)}", exc_info=True)
         sys.exit(1)
 
 if __name__ == "__main__":
-    import asyncio
     try:
         asyncio.run(main())
     except Exception as e:
@@ -0,0 +1,103 @@
+import logging
+from typing import List, Dict, Any, Optional, Callable, Iterable, Tuple
+from .parser import LancersParser
+
+# 大量の過去CSVを処理する場合の1チャンクの行数
+DEFAULT_BATCH_ROWS = 50_000
+
+class ColumnarParser:
+    def __init__(self, parser: Optional[LancersParser] = None):
+        """
+        過去のCSVを列単位でまとめて正規化するパーサーのコンストラクタ
+        締切・納期・募集人数の値は行数に比べて種類が少ないため、列ごとに異なる値だけを1回ずつ
+        LancersParser の規則で正規化し、その結果を全行に割り当てる（1行ずつパースした場合と同じ結果になる）
+        Args:
+            parser (Optional[LancersParser]): 正規化の規則として使うパーサー（省略時は新しく作成）
+        """
+        self.parser = parser or LancersParser()
+        # 入力列 -> (出力列, 1件分の正規化関数)
+        self.rules: Dict[str, Tuple[str, Callable[[str], str]]] = {
+            'deadline_raw': ('deadline_raw', self.parser.normalize_deadline_raw),
+            'delivery_date_raw': ('delivery_date', self._normalize_delivery_date),
+            'people': ('people', self.parser.parse_people),
+        }
+        self.rows = 0
+        self.distinct = 0
+        self.logger = logging.getLogger(__name__)
+
+    def _normalize_delivery_date(self, delivery_date_raw: str) -> str:
+        """希望納期の生の文字列を YYYY-MM-DD 形式に変換する（parse_work_detail の delivery_date と同じ値）"""
+        return self.parser.format_date(self.parser.parse_delivery_date(delivery_date_raw))
+
+    def normalize_column(self, values: Iterable[Optional[str]], func: Callable[[str], str]) -> List[str]:
+        """
+        1列分の値をまとめて正規化する
+        Args:
+            values (Iterable[Optional[str]]): 列の値（欠損値は空文字として扱う）
+            func (Callable[[str], str]): 1件分の正規化関数
+        Returns:
+            List[str]: 正規化後の値（入力と同じ順序）
+        """
+        column = [value or '' for value in values]
+        normalized = {value: func(value) for value in set(column)}
+        self.distinct += len(normalized)
+        return [normalized[value] for value in column]
+
+    def output_fieldnames(self, fieldnames: List[str]) -> List[str]:
+        """
+        入力CSVの列に、正規化で追加される列（元の列の直後）を加えた出力列
+        Args:
+            fieldnames (List[str]): 入力CSVの列
+        Returns:
+            List[str]: 出力CSVの列
+        """
+        output = list(fieldnames)
+        for source, (target, _) in self.rules.items():
+            if source in output and target not in output:
+                output.insert(output.index(source) + 1, target)
+        return output
+
+    def normalize_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        行のリストを列ごとに正規化し、正規化した列を書き戻した新しい行のリストを返す
+        Args:
+            rows (List[Dict[str, Any]]): CSVから読み込んだ行
+        Returns:
+            List[Dict[str, Any]]: 正規化後の行（対象外の列はそのまま）
+        """
+        if not rows:
+            return []
+        columns = {}
+        for source, (target, func) in self.rules.items():
+            if source in rows[0]:
+                columns[target] = self.normalize_column((row.get(source) for row in rows), func)
+        normalized_rows = [dict(row) for row in rows]
+        for target, values in columns.items():
+            for row, value in zip(normalized_rows, values):
+                row[target] = value
+        self.rows += len(rows)
+        return normalized_rows
+
+def normalize_csv(csv_handler, input_path: str, output_path: str,
+                  columnar_parser: Optional[ColumnarParser] = None,
+                  chunk_rows: int = DEFAULT_BATCH_ROWS) -> int:
+    """
+    過去のCSVを chunk_rows 行ずつ読み込み、現在のパース規則で正規化した列を書き戻したCSVを出力する
+    Args:
+        csv_handler (CSVHandler): 読み書きに使うCSVハンドラ
+        input_path (str): 入力CSVのパス
+        output_path (str): 出力CSVのパス
+        columnar_parser (Optional[ColumnarParser]): 正規化に使うパーサー（省略時は新しく作成）
+        chunk_rows (int): 1回に処理する行数
+    Returns:
+        int: 出力した行数
+    """
+    columnar_parser = columnar_parser or ColumnarParser()
+    fieldnames = columnar_parser.output_fieldnames(csv_handler.read_header(input_path))
+    with csv_handler.open_stream(output_path, fieldnames) as writer:
+        for chunk in csv_handler.iter_csv_chunks(input_path, chunk_rows):
+            writer.write_rows(columnar_parser.normalize_rows(chunk))
+    columnar_parser.logger.info(
+        f"列単位の正規化: {columnar_parser.rows}行 (正規化した値の種類 {columnar_parser.distinct}件) -> {writer.filepath}"
+    )
+    return writer.rows_written
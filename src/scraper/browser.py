@@ -1,38 +1,192 @@
-from playwright.async_api import async_playwright, Browser, Page
-from typing import Optional, List, Dict, Any
+from __future__ import annotations
+from typing import Optional, List, Dict, Any, Set, TYPE_CHECKING
 import logging
 import time
 import asyncio
 import re
+import math
+import copy
 import urllib.parse
+from .resource_blocker import ResourceBlocker
+from .readiness import ReadinessWaiter, ReadinessPolicy
+from .session_store import SessionStore
+from .replay import ResponseRecorder, ResponseReplayer
+from .rate_limiter import TokenBucketRateLimiter
+from .page_archive import PageArchive
+from .html_extractor import is_login_wall
+
+if TYPE_CHECKING:
+    # Playwright の読み込みは重いため、ブラウザを起動する時 (start) まで遅らせる
+    from playwright.async_api import Browser, Page
+
+# 検索結果ページの案件カードセレクタ（この順に取得して連結する）
+WORK_CARD_SELECTORS = ['div.p-search-job-media', 'div[data-external-modal]']
+
+# 本番サイトのURL（以下のURLは LancersBrowser の base_url で置き換えられる）
+DEFAULT_BASE_URL = "https://www.lancers.jp"
+
+# 検索種別ごとの一覧URL
+KEYWORD_SEARCH_URL = ("https://www.lancers.jp/work/search?"
+                      "sort=started&open=1&show_description=1&"
+                      "work_rank%5B%5D=3&work_rank%5B%5D=2&work_rank%5B%5D=0&"
+                      "budget_from=&budget_to=&"
+                      "keyword={keyword}&not=")
+LOGIN_URL = "https://www.lancers.jp/user/login"
+MYPAGE_URL = "https://www.lancers.jp/mypage"
+DATA_SEARCH_URL = "https://www.lancers.jp/work/search/task/data?open=1&work_rank%5B%5D=3&work_rank%5B%5D=2&work_rank%5B%5D=1&work_rank%5B%5D=0&budget_from=&budget_to=&keyword=&not="
+DATA_SEARCH_PROJECT_URL = "https://www.lancers.jp/work/search/task/data?type%5B%5D=project&open=1&work_rank%5B%5D=3&work_rank%5B%5D=2&work_rank%5B%5D=1&work_rank%5B%5D=0&budget_from=&budget_to=&keyword=&not="
+
+# ページャーのリンクから最終ページ番号を読み取るスクリプト
+_TOTAL_PAGES_JS = """
+() => {
+    let maxPage = 0;
+    for (const el of document.querySelectorAll('.c-pager a, .c-pager__item')) {
+        const match = (el.getAttribute('href') || '').match(/[?&]page=(\\d+)/);
+        if (match) maxPage = Math.max(maxPage, parseInt(match[1], 10));
+        const text = (el.textContent || '').trim();
+        if (/^\\d+$/.test(text)) maxPage = Math.max(maxPage, parseInt(text, 10));
+    }
+    return maxPage || null;
+}
+"""
+
+# 全案件カードの情報を1回の evaluate でまとめて抽出するスクリプト
+# （要素ごとの query_selector / text_content による往復をなくすため）
+_EXTRACT_WORK_CARDS_JS = """
+(selectors) => {
+    const text = (card, selector, fallback) => {
+        const el = card.querySelector(selector);
+        return el ? (el.textContent || '').trim() : fallback;
+    };
+    const cards = [];
+    for (const selector of selectors) {
+        cards.push(...document.querySelectorAll(selector));
+    }
+    return cards.map((card) => {
+        const link = card.querySelector('a.p-search-job-media__title');
+        return {
+            title: text(card, '.p-search-job-media__title', 'タイトルなし'),
+            url: link ? (link.getAttribute('href') || '') : '',
+            price: text(card, '.p-search-job-media__price', '報酬未設定'),
+            type: text(card, '.c-badge__text', '種別不明'),
+            deadline: text(card, '.p-search-job-media__time-remaining', '期限なし'),
+            status: text(card, '.p-search-job-media__time-text', '状態不明'),
+        };
+    });
+}
+"""
+
+# 案件詳細ページの項目を1回の evaluate でまとめて抽出するスクリプト
+# 見つからない項目は null を返し、欠けている欄の出現を待たない
+_EXTRACT_WORK_DETAIL_JS = """
+() => {
+    const text = (selector) => {
+        const el = document.querySelector(selector);
+        const value = el ? (el.textContent || '').trim() : '';
+        return value || null;
+    };
+    let deadline = null, delivery = null;
+    for (const item of document.querySelectorAll('p.p-work-detail-schedule span.p-work-detail-schedule__item')) {
+        const titleEl = item.querySelector('span.p-work-detail-schedule__item__title');
+        const textEl = item.querySelector('span.p-work-detail-schedule__text');
+        if (!titleEl || !textEl) continue;
+        const itemTitle = (titleEl.textContent || '').trim();
+        const itemText = (textEl.textContent || '').trim();
+        if (itemTitle.includes('締切')) deadline = itemText;
+        else if (itemTitle.includes('希望納期')) delivery = itemText;
+    }
+    // 要素ごとの :has-text セレクタと同様に、各セレクタで最初に一致した要素を順に試す
+    let people = null;
+    const candidates = [['p', '(募集人数'], ['.c-definitionList__description', '募集人数']];
+    for (const [selector, keyword] of candidates) {
+        const el = [...document.querySelectorAll(selector)].find((e) => (e.textContent || '').includes(keyword));
+        if (!el) continue;
+        const peopleText = el.textContent || '';
+        const match = peopleText.match(/(\\d+)\\s*人/);
+        if (match) { people = match[1]; break; }
+        people = peopleText.trim();
+    }
+    return {
+        restricted: document.title.includes('閲覧制限'),
+        title: text('h1') || text('.p-work-detail-header__title'),
+        deadline_raw: deadline,
+        delivery_date_raw: delivery,
+        people: people,
+    };
+}
+"""
+
+def build_page_url(url: str, page_num: int) -> str:
+    """一覧ページのURLにページ番号を付ける（1ページ目はそのまま）"""
+    if page_num <= 1:
+        return url
+    separator = '&' if '?' in url else '?'
+    return f"{url}{separator}page={page_num}"
 
 class LancersBrowser:
-    def __init__(self, headless: bool = True, max_pages: int = 5):
+    def __init__(self, headless: bool = True, max_pages: int = 5,
+                 resource_blocker: Optional[ResourceBlocker] = None,
+                 readiness_policies: Optional[Dict[str, ReadinessPolicy]] = None,
+                 session_store: Optional[SessionStore] = None,
+                 recorder: Optional[ResponseRecorder] = None,
+                 replayer: Optional[ResponseReplayer] = None,
+                 base_url: str = DEFAULT_BASE_URL,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None,
+                 page_archive: Optional[PageArchive] = None):
         """
         LancersBrowserクラスのコンストラクタ
         Args:
             headless (bool): ヘッドレスモードで実行するかどうか
             max_pages (int): 取得する最大ページ数 (検索モード用)
+            resource_blocker (Optional[ResourceBlocker]): 不要なリソースを遮断するルーティング層（省略時は無効）
+            readiness_policies (Optional[Dict[str, ReadinessPolicy]]): ページ種別ごとの準備完了条件（デフォルトを上書き）
+            session_store (Optional[SessionStore]): ログイン済みセッションの保存先（省略時は毎回ログイン）
+            recorder (Optional[ResponseRecorder]): 指定時は取得したページのレスポンスを保存する
+            replayer (Optional[ResponseReplayer]): 指定時は実サイトの代わりに保存済みのレスポンスを返す
+            base_url (str): アクセス先サイトのURL（ローカルのモックサーバー等に向ける場合に指定）
+            rate_limiter (Optional[TokenBucketRateLimiter]): 指定時は全てのページ遷移の前にトークンを取得する
+            page_archive (Optional[PageArchive]): 指定時は取得したページのHTMLを圧縮して保存する
         """
         self.headless = headless
         self.max_pages = max_pages
+        self.resource_blocker = resource_blocker
+        self.readiness = ReadinessWaiter(readiness_policies)
+        self.session_store = session_store
+        self.recorder = recorder
+        self.replayer = replayer
+        self.session_loaded = False
+        # 閲覧制限で取得できなかった案件のURL（並列数の制御でエラーと区別するため）
+        self.restricted_urls: Set[str] = set()
         self.browser: Optional[Browser] = None
         self.page: Optional[Page] = None
         self.context = None # コンテキストを保持する変数を追加
         self.playwright = None
-        self.base_url = "https://www.lancers.jp/work/search"
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip('/')
+        self.rate_limiter = rate_limiter
+        self.page_archive = page_archive
 
-        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger(__name__)
 
     async def start(self) -> None:
         """ブラウザを起動し、新しいコンテキストとページを開く"""
         try:
+            from playwright.async_api import async_playwright
             self.playwright = await async_playwright().start()
             self.browser = await self.playwright.chromium.launch(headless=self.headless)
-            # 新しいブラウザコンテキストを作成
-            self.context = await self.browser.new_context()
+            # 新しいブラウザコンテキストを作成（保存済みのセッションがあれば引き継ぐ）
+            storage_state = self.session_store.load() if self.session_store else None
+            self.context = await self.browser.new_context(storage_state=storage_state)
+            self.session_loaded = storage_state is not None
             self.logger.info("ブラウザコンテキストを作成しました")
+            if self.resource_blocker:
+                await self.resource_blocker.attach(self.context)
+            # 後から登録したハンドラが先に呼ばれるため、リプレイはリソースブロックの後に登録する
+            if self.replayer:
+                await self.replayer.attach(self.context)
+            if self.recorder:
+                await self.recorder.attach(self.context)
+            if self.page_archive:
+                await self.page_archive.attach(self.context)
             # コンテキストから新しいページを作成
             self.page = await self.context.new_page()
             self.logger.info("ブラウザを起動し、新しいページを開きました")
@@ -40,10 +194,33 @@ class LancersBrowser:
             self.logger.error(f"ブラウザの起動に失敗しました: {str(e)}")
             raise
 
+    async def open_tab(self) -> 'LancersBrowser':
+        """
+        同じコンテキストに新しいタブを開き、そのタブを操作する LancersBrowser を返す
+        ブラウザ・コンテキスト・待機統計は共有する（終了時は close ではなく tab.page.close() を呼ぶこと）
+        Returns:
+            LancersBrowser: 新しいタブを self.page に持つブラウザ
+        """
+        tab = copy.copy(self)
+        tab.page = await self.context.new_page()
+        return tab
+
     async def close(self) -> None:
         """ブラウザとコンテキストを終了する"""
         self.logger.info("ブラウザ終了処理を開始します...")
+        if self.resource_blocker:
+            self.resource_blocker.log_summary()
+        self.readiness.log_summary()
+        if self.replayer:
+            self.replayer.log_summary()
+        if self.rate_limiter:
+            self.rate_limiter.log_summary()
         try:
+            if self.recorder:
+                await self.recorder.flush()
+            if self.page_archive:
+                await self.page_archive.flush()
+                self.page_archive.log_summary()
             if self.page:
                 self.logger.info("ページを閉じます...")
                 await self.page.close()
@@ -95,23 +272,51 @@ class LancersBrowser:
             deadline = (await deadline_elem.text_content() if deadline_elem else "期限なし").strip()
             status = (await status_elem.text_content() if status_elem else "状態不明").strip()
 
-            full_url = url if url.startswith("http") else f"https://www.lancers.jp{url}"
-
-            return {'title': title, 'url': full_url, 'price': price,
+            return {'title': title, 'url': self.to_full_url(url), 'price': price,
                     'type': work_type, 'deadline': deadline, 'status': status}
         except Exception as e:
             self.logger.error(f"案件情報の抽出中にエラーが発生しました: {str(e)}")
             return None
 
-    async def _get_work_cards(self) -> List:
+    def to_full_url(self, url: str) -> str:
+        """相対URLを絶対URLに変換する"""
+        return url if url.startswith("http") else f"{self.base_url}{url}"
+
+    def site_url(self, url: str) -> str:
+        """本番サイトのURLを base_url のサイトのURLに置き換える"""
+        if self.base_url != DEFAULT_BASE_URL and url.startswith(DEFAULT_BASE_URL):
+            return self.base_url + url[len(DEFAULT_BASE_URL):]
+        return url
+
+    async def _extract_work_infos(self, page: Optional[Page] = None) -> List[Dict[str, Any]]:
+        """
+        現在のページの全案件カードから情報を抽出する
+        1回の evaluate で全カードを取得し、失敗した場合は要素ごとの抽出にフォールバックする
+        Args:
+            page (Optional[Page]): 対象のページ（省略時は self.page）
+        Returns:
+            List[Dict[str, Any]]: 案件情報のリスト
+        """
+        page = page or self.page
+        started = time.perf_counter()
+        try:
+            raw_infos = await page.evaluate(_EXTRACT_WORK_CARDS_JS, WORK_CARD_SELECTORS)
+            results = [{**info, 'url': self.to_full_url(info.get('url') or "")} for info in raw_infos]
+            if not results: self.logger.warning("案件カードが見つかりませんでした")
+            self.logger.debug("案件カード %d 件を一括抽出しました (%.1fms)", len(results), (time.perf_counter() - started) * 1000)
+            return results
+        except Exception as e:
+            self.logger.warning(f"案件カードの一括抽出に失敗したため、要素ごとの抽出に切り替えます: {str(e)}")
+        work_cards = await self._get_work_cards(page)
+        results = [await self._extract_work_info(card) for card in work_cards]
+        return [res for res in results if res]
+
+    async def _get_work_cards(self, page: Optional[Page] = None) -> List:
         """現在のページから案件カード要素のリストを取得する"""
         try:
-            await self.page.wait_for_load_state('networkidle')
-            await asyncio.sleep(1)
-            selectors = ['div.p-search-job-media', 'div[data-external-modal]']
             work_cards = []
-            for selector in selectors:
-                cards = await self.page.query_selector_all(selector)
+            for selector in WORK_CARD_SELECTORS:
+                cards = await (page or self.page).query_selector_all(selector)
                 work_cards.extend(cards)
             if not work_cards: self.logger.warning("案件カードが見つかりませんでした")
             return work_cards
@@ -119,30 +324,42 @@ class LancersBrowser:
             self.logger.error(f"案件カードの取得中にエラーが発生しました: {str(e)}")
             return []
 
-    async def _go_to_page(self, url: str, page_num: int):
+    async def _navigate(self, page: Page, url: str) -> None:
+        """レート制限のトークンを取得してからURLに遷移する（全てのページ遷移はここを通す）"""
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(url)
+        await page.goto(url, wait_until='domcontentloaded')
+
+    async def _go_to_page(self, url: str, page_num: int, page: Optional[Page] = None):
         """指定されたURL（必要ならページ番号付き）に遷移する"""
-        target_url = url
-        if page_num > 1:
-            separator = '&' if '?' in url else '?'
-            target_url += f"{separator}page={page_num}"
+        page = page or self.page
+        target_url = build_page_url(url, page_num)
         self.logger.info(f"ページ {page_num} にアクセス: {target_url}")
-        await self.page.goto(target_url)
-        await self.page.wait_for_load_state('networkidle')
-        await asyncio.sleep(2)
+        await self._navigate(page, target_url)
+        await self.readiness.wait(page, 'search')
+
+    def build_search_url(self, search_query: Optional[str] = None, data_search: bool = False,
+                         data_search_project: bool = False) -> str:
+        """
+        検索種別に応じた一覧ページのURLを組み立てる
+        Args:
+            search_query (Optional[str]): キーワード検索のクエリ
+            data_search (bool): データ検索（タスク）を使うかどうか
+            data_search_project (bool): データ検索（プロジェクト）を使うかどうか
+        Returns:
+            str: 一覧ページ（1ページ目）のURL
+        """
+        if data_search:
+            return self.site_url(DATA_SEARCH_URL)
+        if data_search_project:
+            return self.site_url(DATA_SEARCH_PROJECT_URL)
+        return self.site_url(KEYWORD_SEARCH_URL.format(keyword=urllib.parse.quote(search_query or "")))
 
     async def search_short_videos(self, search_query: str, page_num: int = 1) -> List[Dict[str, Any]]:
         """キーワード検索結果の指定されたページを取得"""
         try:
-            base_url = "https://www.lancers.jp/work/search"
-            url = (f"{base_url}?"
-                  f"sort=started&open=1&show_description=1&"
-                  f"work_rank%5B%5D=3&work_rank%5B%5D=2&work_rank%5B%5D=0&"
-                  f"budget_from=&budget_to=&"
-                  f"keyword={urllib.parse.quote(search_query)}&not=")
-            await self._go_to_page(url, page_num)
-            work_cards = await self._get_work_cards()
-            results = [await self._extract_work_info(card) for card in work_cards]
-            return [res for res in results if res]
+            await self._go_to_page(self.build_search_url(search_query), page_num)
+            return await self._extract_work_infos()
         except Exception as e:
             self.logger.error(f"キーワード検索 (ページ{page_num}) 処理中にエラー: {str(e)}")
             raise
@@ -150,11 +367,8 @@ class LancersBrowser:
     async def search_with_data_url(self, page_num: int = 1) -> List[Dict[str, Any]]:
         """データ検索（タスク）結果の指定されたページを取得"""
         try:
-            url = "https://www.lancers.jp/work/search/task/data?open=1&work_rank%5B%5D=3&work_rank%5B%5D=2&work_rank%5B%5D=1&work_rank%5B%5D=0&budget_from=&budget_to=&keyword=&not="
-            await self._go_to_page(url, page_num)
-            work_cards = await self._get_work_cards()
-            results = [await self._extract_work_info(card) for card in work_cards]
-            return [res for res in results if res]
+            await self._go_to_page(self.build_search_url(data_search=True), page_num)
+            return await self._extract_work_infos()
         except Exception as e:
             self.logger.error(f"データ検索(タスク, ページ{page_num}) 処理中にエラー: {str(e)}")
             raise
@@ -162,15 +376,81 @@ class LancersBrowser:
     async def search_with_data_project_url(self, page_num: int = 1) -> List[Dict[str, Any]]:
         """データ検索（プロジェクト）結果の指定されたページを取得"""
         try:
-            url = "https://www.lancers.jp/work/search/task/data?type%5B%5D=project&open=1&work_rank%5B%5D=3&work_rank%5B%5D=2&work_rank%5B%5D=1&work_rank%5B%5D=0&budget_from=&budget_to=&keyword=&not="
-            await self._go_to_page(url, page_num)
-            work_cards = await self._get_work_cards()
-            results = [await self._extract_work_info(card) for card in work_cards]
-            return [res for res in results if res]
+            await self._go_to_page(self.build_search_url(data_search_project=True), page_num)
+            return await self._extract_work_infos()
         except Exception as e:
             self.logger.error(f"データ検索(プロジェクト, ページ{page_num}) 処理中にエラー: {str(e)}")
             raise
 
+    async def get_total_pages(self, page: Optional[Page] = None) -> Optional[int]:
+        """
+        現在の検索結果ページのページャーから総ページ数を取得する
+        Args:
+            page (Optional[Page]): 対象のページ（省略時は self.page）
+        Returns:
+            Optional[int]: 総ページ数（ページャーが無い場合はNone）
+        """
+        try:
+            return await (page or self.page).evaluate(_TOTAL_PAGES_JS)
+        except Exception as e:
+            self.logger.warning(f"総ページ数の取得に失敗しました: {str(e)}")
+            return None
+
+    async def search_pages_concurrently(self, url: str, max_items: Optional[int] = None,
+                                        concurrency: int = 4) -> List[List[Dict[str, Any]]]:
+        """
+        1ページ目から総ページ数を読み取り、2ページ目以降を別タブで並列に取得する
+        Args:
+            url (str): 一覧ページ（1ページ目）のURL
+            max_items (Optional[int]): 取得する最大案件数（必要なページ数の見積もりに使用）
+            concurrency (int): 同時に開くタブ数
+        Returns:
+            List[List[Dict[str, Any]]]: ページ順に並んだ各ページの案件情報（空のページ以降は含まない）
+        """
+        await self._go_to_page(url, 1)
+        first_page = await self._extract_work_infos()
+        if not first_page:
+            return []
+
+        last_page = await self.get_total_pages() or 1
+        if self.max_pages:
+            last_page = min(last_page, self.max_pages)
+        if max_items is not None:
+            last_page = min(last_page, max(1, math.ceil(max_items / len(first_page))))
+        self.logger.info(f"総ページ数 {last_page} のうち 2 ページ目以降を並列で取得します (タブ数: {concurrency})")
+
+        pages: Dict[int, List[Dict[str, Any]]] = {1: first_page}
+        queue: asyncio.Queue = asyncio.Queue()
+        for page_num in range(2, last_page + 1):
+            queue.put_nowait(page_num)
+
+        async def worker() -> None:
+            tab = await self.context.new_page()
+            try:
+                while True:
+                    try:
+                        page_num = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    try:
+                        await self._go_to_page(url, page_num, page=tab)
+                        pages[page_num] = await self._extract_work_infos(tab)
+                    except Exception as e:
+                        self.logger.error(f"ページ {page_num} の並列取得中にエラー: {str(e)}")
+                        pages[page_num] = []
+            finally:
+                await tab.close()
+
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, last_page - 1))))
+
+        results = []
+        for page_num in range(1, last_page + 1):
+            if not pages.get(page_num):
+                self.logger.warning(f"ページ {page_num} で検索結果が見つかりませんでした。以降のページは使用しません。")
+                break
+            results.append(pages[page_num])
+        return results
+
     async def go_to_next_search_page(self) -> bool:
         """検索結果ページの「次へ」ボタンをクリックして次のページに移動する"""
         next_button_selector = 'span.c-pager__item--next > a'
@@ -181,9 +461,11 @@ class LancersBrowser:
                 if not is_disabled:
                     next_page_url = await next_button.get_attribute('href')
                     self.logger.info(f"「次へ」ボタンをクリックしてページ遷移: {next_page_url}")
-                    await next_button.click()
-                    await self.page.wait_for_load_state('networkidle')
-                    await asyncio.sleep(2)
+                    if self.rate_limiter:
+                        await self.rate_limiter.acquire(self.page.url)
+                    async with self.page.expect_navigation(wait_until='domcontentloaded'):
+                        await next_button.click()
+                    await self.readiness.wait(self.page, 'search')
                     self.logger.info(f"ページ遷移完了。現在のURL: {self.page.url}")
                     return True
                 else:
@@ -198,48 +480,90 @@ class LancersBrowser:
 
     async def get_work_detail(self, work_id: str) -> Optional[Dict[str, Any]]:
         """案件IDから詳細情報を取得（現在は未使用の可能性）"""
-        url = f"https://www.lancers.jp/work/detail/{work_id}"
+        url = f"{self.base_url}/work/detail/{work_id}"
         return await self.get_work_detail_by_url(url)
 
-    async def get_work_detail_by_url(self, url: str) -> Optional[Dict[str, Any]]:
-        """URLから案件の詳細情報を取得する"""
+    async def get_work_detail_by_url(self, url: str, page: Optional[Page] = None) -> Optional[Dict[str, Any]]:
+        """
+        URLから案件の詳細情報を取得する
+        Args:
+            url (str): 案件詳細ページのURL
+            page (Optional[Page]): 使用するページ（省略時は self.page）
+        Returns:
+            Optional[Dict[str, Any]]: 案件詳細情報（取得できない場合はNone）
+        """
+        page = page or self.page
+        try:
+            self.logger.debug("案件詳細ページにアクセス: %s", url)
+            await self._navigate(page, self.site_url(url))
+            # 見出しとスケジュール欄（無いページでは読み込み完了）が揃うまで待機
+            await self.readiness.wait(page, 'detail')
+
+            try:
+                raw = await page.evaluate(_EXTRACT_WORK_DETAIL_JS)
+            except Exception as e:
+                self.logger.warning(f"詳細情報の一括抽出に失敗したため、要素ごとに取得します ({url}): {str(e)}")
+                return await self._extract_work_detail(url, page)
+
+            if raw.get('restricted'):
+                self.logger.warning(f"案件 {url} は閲覧制限があります")
+                self.restricted_urls.add(url)
+                return None
+            missing = [key for key in ('deadline_raw', 'delivery_date_raw', 'people') if raw.get(key) is None]
+            if missing:
+                self.logger.debug("案件 %s に見つからない項目があります: %s", url, missing)
+            return self._build_work_detail(url, raw.get('title'), raw.get('deadline_raw'),
+                                           raw.get('people'), raw.get('delivery_date_raw'))
+        except Exception as e:
+            self.logger.error(f"案件詳細の取得処理全体でエラーが発生しました ({url}): {str(e)}")
+            return None
+
+    def _build_work_detail(self, url: str, title: Optional[str], deadline_raw: Optional[str],
+                           people: Optional[str], delivery_date_raw: Optional[str]) -> Dict[str, Any]:
+        """抽出した項目から案件詳細情報を組み立てる（見つからない項目は空文字）"""
+        work_id_match = re.search(r'/work/detail/(\d+)', url)
+        work_id = work_id_match.group(1) if work_id_match else "不明"
+
+        # parser.py が raw データを受け取るように変更
+        return {
+            'title': title.strip() if title else "",
+            'url': url, 'work_id': work_id,
+            'deadline_raw': deadline_raw or "", # 生データを渡す
+            'people': people or "", # parser.pyで整形されることを期待 (数字or元のテキスト)
+            'delivery_date_raw': delivery_date_raw or "" # 生データを渡す
+        }
+
+    async def _extract_work_detail(self, url: str, page: Page) -> Optional[Dict[str, Any]]:
+        """要素ごとに詳細情報を取得する（一括抽出に失敗した場合のフォールバック）"""
         try:
-            self.logger.info(f"案件詳細ページにアクセス: {url}")
-            await self.page.goto(url)
-            # 詳細ページの主要コンテンツが表示されるまで待機（セレクタは実際のページに合わせて調整）
-            await self.page.wait_for_selector('h1.c-heading--lv1', timeout=10000)
-            await self.page.wait_for_load_state('networkidle', timeout=10000)
-            await asyncio.sleep(1) # 念のため追加待機
-
-            if "閲覧制限" in await self.page.title():
+            if "閲覧制限" in await page.title():
                 self.logger.warning(f"案件 {url} は閲覧制限があります")
+                self.restricted_urls.add(url)
                 return None
 
-            title = await self._get_text('h1') or await self._get_text('.p-work-detail-header__title')
+            title = await self._get_text('h1', page) or await self._get_text('.p-work-detail-header__title', page)
 
             # スケジュール情報の取得
             deadline_raw, delivery_date_raw = "", ""
             schedule_section_selector = 'p.p-work-detail-schedule'
             try:
-                # スケジュールセクションが表示されるまで待つ
-                await self.page.wait_for_selector(schedule_section_selector, state='visible', timeout=5000)
-                schedule_items = await self.page.query_selector_all(f'{schedule_section_selector} span.p-work-detail-schedule__item')
-                self.logger.info(f"Found {len(schedule_items)} schedule items for {url}") # デバッグログ
+                schedule_items = await page.query_selector_all(f'{schedule_section_selector} span.p-work-detail-schedule__item')
+                self.logger.debug("Found %d schedule items for %s", len(schedule_items), url)
                 for item in schedule_items:
                     title_elem = await item.query_selector('span.p-work-detail-schedule__item__title')
                     text_elem = await item.query_selector('span.p-work-detail-schedule__text')
                     if title_elem and text_elem:
                         item_title = (await title_elem.text_content() or "").strip()
                         item_text = (await text_elem.text_content() or "").strip()
-                        self.logger.info(f"  - Schedule item found: '{item_title}' '{item_text}'") # デバッグログ
+                        self.logger.debug("  - Schedule item found: '%s' '%s'", item_title, item_text)
                         if '締切' in item_title:
                             deadline_raw = item_text
-                            self.logger.info(f"    -> Deadline found: {deadline_raw}") # デバッグログ
+                            self.logger.debug("    -> Deadline found: %s", deadline_raw)
                         elif '希望納期' in item_title:
                             delivery_date_raw = item_text
-                            self.logger.info(f"    -> Delivery date found: {delivery_date_raw}") # デバッグログ
+                            self.logger.debug("    -> Delivery date found: %s", delivery_date_raw)
                     else:
-                         self.logger.warning(f"  - Schedule item title or text element not found within item.") # デバッグログ
+                         self.logger.debug("  - Schedule item title or text element not found within item.")
             except Exception as e:
                 self.logger.warning(f"スケジュール情報の取得中にエラーまたはタイムアウト ({url}): {e}")
 
@@ -251,14 +575,14 @@ class LancersBrowser:
             ]
             for selector in people_selectors:
                 try:
-                    people_elem = await self.page.query_selector(selector)
+                    people_elem = await page.query_selector(selector)
                     if people_elem:
                         people_text = await people_elem.text_content()
-                        self.logger.info(f"People text found with selector '{selector}': '{people_text}'") # デバッグログ
+                        self.logger.debug("People text found with selector '%s': '%s'", selector, people_text)
                         match = re.search(r'(\d+)\s*人', people_text or "")
                         if match:
                             people = match.group(1) # 数字のみ取得に変更 (parserで'人'をつける)
-                            self.logger.info(f"  -> Parsed people count: {people}") # デバッグログ
+                            self.logger.debug("  -> Parsed people count: %s", people)
                             break # 見つかったらループを抜ける
                         else:
                             # セレクタは見つかったが正規表現がマッチしない場合
@@ -266,49 +590,79 @@ class LancersBrowser:
                             self.logger.warning(f"  -> Could not parse number from people text: '{people_text}'")
                             # break するかは状況によるが、ここでは他のセレクタも試すため break しない
                     # else:
-                    #     self.logger.info(f"People selector '{selector}' not found.") # デバッグログ（多すぎる可能性）
+                    #     self.logger.debug("People selector '%s' not found.", selector)
                 except Exception as e_sel:
                      self.logger.warning(f"募集人数セレクタ '{selector}' の処理中にエラー: {e_sel}")
             if not people:
                  self.logger.warning(f"募集人数が見つかりませんでした ({url})")
 
 
-            work_id_match = re.search(r'/work/detail/(\d+)', url)
-            work_id = work_id_match.group(1) if work_id_match else "不明"
-
-            # parser.py が raw データを受け取るように変更
-            return {
-                'title': title.strip() if title else "",
-                'url': url, 'work_id': work_id,
-                'deadline_raw': deadline_raw, # 生データを渡す
-                'people': people, # parser.pyで整形されることを期待 (数字or元のテキスト)
-                'delivery_date_raw': delivery_date_raw # 生データを渡す
-            }
+            return self._build_work_detail(url, title, deadline_raw, people, delivery_date_raw)
         except Exception as e:
             self.logger.error(f"案件詳細の取得処理全体でエラーが発生しました ({url}): {str(e)}")
             return None
 
-    async def _get_text(self, selector: str) -> str:
+    async def _get_text(self, selector: str, page: Optional[Page] = None) -> str:
         """指定されたセレクタの要素からテキストを取得する"""
         try:
-            element = await self.page.query_selector(selector)
+            element = await (page or self.page).query_selector(selector)
             if element:
                 text = await element.text_content()
                 return text.strip() if text else ""
             return ""
         except Exception: return ""
 
+    async def is_logged_in(self) -> bool:
+        """
+        現在のコンテキストのセッションでログイン済みかを、ページを描画せずに確認する
+        Returns:
+            bool: ログイン済みの場合はTrue
+        """
+        try:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire(self.base_url)
+            response = await self.context.request.get(self.site_url(MYPAGE_URL), max_redirects=0)
+            if 300 <= response.status < 400:
+                return '/user/login' not in response.headers.get('location', '')
+            if response.status == 200:
+                return not is_login_wall(await response.text())
+            return False
+        except Exception as e:
+            self.logger.warning(f"ログイン状態の確認に失敗しました: {str(e)}")
+            return False
+
+    async def ensure_logged_in(self, email: str, password: str) -> bool:
+        """
+        保存済みセッションが有効ならそれを使い、無効な場合のみログインしてセッションを保存する
+        Args:
+            email (str): ログイン用メールアドレス
+            password (str): ログイン用パスワード
+        Returns:
+            bool: ログイン済みの状態になった場合はTrue
+        """
+        if self.replayer:
+            # 記録済みのページはログイン後の状態なので、実サイトへのログインは行わない
+            self.logger.info("リプレイモードのため、ログインを省略します")
+            return True
+        if self.session_loaded:
+            if await self.is_logged_in():
+                self.logger.info("保存済みのセッションが有効なため、ログインを省略します")
+                return True
+            self.logger.info("保存済みのセッションが期限切れのため、ログインし直します")
+        logged_in = await self.login(email, password)
+        if logged_in and self.session_store:
+            self.session_store.save(await self.context.storage_state())
+        return logged_in
+
     async def login(self, email: str, password: str) -> bool:
         """Lancersにログインする"""
         try:
             if not self.page: self.logger.error("ページ未初期化"); return False
 
-            login_url = "https://www.lancers.jp/user/login"
+            login_url = self.site_url(LOGIN_URL)
             self.logger.info(f"ログインページにアクセス: {login_url}")
-            await self.page.goto(login_url)
-            await self.page.wait_for_selector('input#UserEmail', state='visible')
-            await self.page.wait_for_function("document.readyState === 'complete'")
-            await asyncio.sleep(1)
+            await self._navigate(self.page, login_url)
+            await self.readiness.wait(self.page, 'login_form')
 
             try:
                 await self.page.wait_for_selector('input#UserEmail:not([disabled])')
@@ -335,14 +689,8 @@ class LancersBrowser:
                  return False
 
             self.logger.info("ログインボタンクリック後、状態変化待機中...")
-            # try:
-            #      # Playwright のバージョンによっては wait_for_navigation が存在しないためコメントアウト
-            #      # await self.page.wait_for_navigation(timeout=15000, wait_until='networkidle')
-            #      pass # 代わりに下の sleep と要素確認で待機
-            # except Exception as nav_error:
-            #      self.logger.warning(f"ナビゲーション待機処理中にエラー ({nav_error})。要素での確認を試みます。")
-            #      pass
-            await asyncio.sleep(5)
+            # ログインページから遷移し、ログイン済みの要素が表示されるまで待機
+            await self.readiness.wait(self.page, 'login')
 
             current_url = self.page.url
             self.logger.info(f"ログイン試行後のURL: {current_url}")
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import math
+from typing import List, Dict, Any, Optional, Tuple
+
+# 取得結果の分類
+OUTCOME_OK = 'ok'
+OUTCOME_ERROR = 'error'
+OUTCOME_RESTRICTED = 'restricted'
+
+class AimdConcurrencyController:
+    def __init__(self, initial: int = 2, min_limit: int = 1, max_limit: int = 8,
+                 increase_step: int = 1, decrease_factor: float = 0.5,
+                 latency_threshold: Optional[float] = None, restricted_threshold: float = 0.5):
+        """
+        取得結果に応じて同時取得数を増減させる（AIMD: 加算的に増やし、乗算的に減らす）コントローラのコンストラクタ
+        現在の並列数と同じ件数の取得が問題なく終わるごとに並列数を増やし、
+        エラー・遅延・閲覧制限の急増を検出した時点で減らす
+        Args:
+            initial (int): 開始時の並列数
+            min_limit (int): 並列数の下限
+            max_limit (int): 並列数の上限
+            increase_step (int): 正常時に増やす数
+            decrease_factor (float): 異常時に並列数に掛ける係数
+            latency_threshold (Optional[float]): 平均応答時間（秒）がこれを超えたら減らす（省略時は判定しない）
+            restricted_threshold (float): 閲覧制限ページの割合がこれを超えたら減らす
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold
+        self.restricted_threshold = restricted_threshold
+        self.in_flight = 0
+        self.decisions: List[Dict[str, Any]] = []
+        self.outcome_counts: Dict[str, int] = {}
+        self._window: List[Tuple[float, str]] = []
+        # 並列数を減らした後、それ以前に開始した取得の失敗で重ねて減らさないための世代番号
+        self._epoch = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self.logger = logging.getLogger(__name__)
+
+    def _get_condition(self) -> asyncio.Condition:
+        # イベントループ上で初めて使う時に作成する（別プロセスへ渡せるようにするため）
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self) -> int:
+        """
+        現在の並列数に空きができるまで待って取得枠を確保する
+        Returns:
+            int: 確保した時点の世代番号（release に渡す）
+        """
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            return self._epoch
+
+    async def release(self, epoch: int, latency: float, outcome: str) -> None:
+        """
+        取得枠を返却し、結果を並列数の判断に反映する
+        Args:
+            epoch (int): acquire が返した世代番号
+            latency (float): 取得にかかった時間（秒）
+            outcome (str): OUTCOME_OK / OUTCOME_ERROR / OUTCOME_RESTRICTED
+        """
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            self.record(epoch, latency, outcome)
+            condition.notify_all()
+
+    def record(self, epoch: int, latency: float, outcome: str) -> None:
+        """
+        1件の取得結果から並列数を調整する
+        Args:
+            epoch (int): 取得開始時の世代番号
+            latency (float): 取得にかかった時間（秒）
+            outcome (str): 取得結果の分類
+        """
+        self.outcome_counts[outcome] = self.outcome_counts.get(outcome, 0) + 1
+        if epoch != self._epoch:
+            # 前回減らす前に開始した取得の結果は判断に使わない
+            return
+        if outcome == OUTCOME_ERROR:
+            self._decrease(f"取得エラー ({latency:.1f}秒)")
+            return
+
+        self._window.append((latency, outcome))
+        if len(self._window) < self.limit:
+            return
+        average_latency = sum(l for l, _ in self._window) / len(self._window)
+        restricted_rate = sum(1 for _, o in self._window if o == OUTCOME_RESTRICTED) / len(self._window)
+        if restricted_rate > self.restricted_threshold:
+            self._decrease(f"閲覧制限の割合が {restricted_rate:.0%}")
+        elif self.latency_threshold is not None and average_latency > self.latency_threshold:
+            self._decrease(f"平均応答時間 {average_latency:.1f}秒 > {self.latency_threshold:.1f}秒")
+        else:
+            self._increase(f"{len(self._window)}件正常 (平均 {average_latency:.1f}秒)")
+
+    def _increase(self, reason: str) -> None:
+        self._window = []
+        new_limit = min(self.limit + self.increase_step, self.max_limit)
+        if new_limit != self.limit:
+            self._decide(new_limit, reason)
+
+    def _decrease(self, reason: str) -> None:
+        self._window = []
+        self._epoch += 1
+        new_limit = max(self.min_limit, math.floor(self.limit * self.decrease_factor))
+        if new_limit != self.limit:
+            self._decide(new_limit, reason)
+        else:
+            self.logger.info(f"並列数は下限の {self.limit} のままです ({reason})")
+
+    def _decide(self, new_limit: int, reason: str) -> None:
+        self.decisions.append({'from': self.limit, 'to': new_limit, 'reason': reason})
+        self.logger.info(f"並列数を {self.limit} → {new_limit} に変更しました ({reason})")
+        self.limit = new_limit
+
+    def log_summary(self) -> None:
+        """最終的な並列数と判断の回数をログに出力する"""
+        increases = sum(1 for d in self.decisions if d['to'] > d['from'])
+        self.logger.info(
+            f"並列数制御: 最終 {self.limit} (範囲 {self.min_limit}〜{self.max_limit}), "
+            f"増加 {increases}回 / 減少 {len(self.decisions) - increases}回, 結果内訳 {self.outcome_counts}"
+        )
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+from .concurrency_controller import AimdConcurrencyController, OUTCOME_OK, OUTCOME_ERROR, OUTCOME_RESTRICTED
+
+class DetailWorkerPool:
+    def __init__(self, browser, concurrency: int = 1, fetcher=None,
+                 controller: Optional[AimdConcurrencyController] = None):
+        """
+        案件詳細ページを並列に取得するワーカープールのコンストラクタ
+        Args:
+            browser (LancersBrowser): 起動済み（必要ならログイン済み）のブラウザ
+            concurrency (int): 同時に使用するページ（タブ）数
+            fetcher (Optional[LancersHttpFetcher]): 指定時はHTTPで取得し、必要な場合のみタブを使う
+            controller (Optional[AimdConcurrencyController]): 指定時は取得結果に応じて同時取得数を増減する
+                （タブは controller.max_limit 個用意し、そのうち controller.limit 個だけを同時に使う）
+        """
+        self.browser = browser
+        self.fetcher = fetcher
+        self.controller = controller
+        self.concurrency = controller.max_limit if controller else max(1, concurrency)
+        self.pages: List[Any] = []
+        self._owned_pages: List[Any] = []
+        self.logger = logging.getLogger(__name__)
+
+    async def open(self) -> None:
+        """ワーカー用のページを用意する（1つ目は既存の browser.page を使う）"""
+        self.pages = [self.browser.page]
+        for _ in range(self.concurrency - 1):
+            page = await self.browser.context.new_page()
+            self._owned_pages.append(page)
+            self.pages.append(page)
+        self.logger.info(f"詳細取得ワーカーを {len(self.pages)} 個用意しました")
+
+    async def close(self) -> None:
+        """ワーカー用に追加で開いたページを閉じる"""
+        for page in self._owned_pages:
+            try:
+                await page.close()
+            except Exception as e:
+                self.logger.warning(f"ワーカーページのクローズに失敗しました: {str(e)}")
+        self._owned_pages = []
+        self.pages = []
+        if self.controller:
+            self.controller.log_summary()
+
+    async def fetch_all(self, urls: List[Optional[str]],
+                        on_result: Optional[Callable[[int, Optional[Dict[str, Any]]], None]] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        URLのリストを共有キューから並列に取得する
+        Args:
+            urls (List[Optional[str]]): 取得するURLのリスト（空の要素は取得しない）
+            on_result (Optional[Callable[[int, Optional[Dict[str, Any]]], None]]): 1件取得するごとに位置と詳細情報で呼ぶ関数
+        Returns:
+            List[Optional[Dict[str, Any]]]: 入力と同じ順序の詳細情報（取得失敗時はNone）
+        """
+        if not self.pages:
+            await self.open()
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, url in enumerate(urls):
+            if url:
+                queue.put_nowait((index, url))
+
+        async def worker(page) -> None:
+            while True:
+                try:
+                    index, url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    results[index] = await self._fetch_one(page, url)
+                finally:
+                    queue.task_done()
+                if on_result:
+                    on_result(index, results[index])
+
+        await asyncio.gather(*(worker(page) for page in self.pages))
+        return results
+
+    async def consume(self, queue: asyncio.Queue,
+                      on_detail: Callable[[Any, Optional[Dict[str, Any]]], Awaitable[None]]) -> None:
+        """
+        キューに届いたURLを取得し続ける（検索と詳細取得を同時に進める場合に使う）
+        ワーカーは None を受け取ると終了するため、投入側は最後にワーカー数（len(self.pages)）分の None を入れる
+        Args:
+            queue (asyncio.Queue): (任意のキー, URL) または None を入れるキュー
+            on_detail (Callable[[Any, Optional[Dict[str, Any]]], Awaitable[None]]): 取得ごとにキーと詳細情報（失敗時はNone）で呼ぶ関数
+        """
+        if not self.pages:
+            await self.open()
+
+        async def worker(page) -> None:
+            while True:
+                item = await queue.get()
+                try:
+                    if item is None:
+                        return
+                    key, url = item
+                    await on_detail(key, await self._fetch_one(page, url))
+                finally:
+                    queue.task_done()
+
+        await asyncio.gather(*(worker(page) for page in self.pages))
+
+    async def _fetch_one(self, page, url: str) -> Optional[Dict[str, Any]]:
+        """1件の詳細ページを取得し、結果を並列数の制御に反映する"""
+        epoch = await self.controller.acquire() if self.controller else 0
+        started = time.perf_counter()
+        outcome = OUTCOME_ERROR
+        detail = None
+        try:
+            source = self.fetcher or self.browser
+            detail = await source.get_work_detail_by_url(url, page=page)
+            if detail is not None:
+                outcome = OUTCOME_OK
+            elif url in getattr(self.browser, 'restricted_urls', ()):
+                outcome = OUTCOME_RESTRICTED
+        except Exception as e:
+            self.logger.error(f"URL {url} の処理中にエラーが発生しました: {str(e)}")
+        finally:
+            if self.controller:
+                await self.controller.release(epoch, time.perf_counter() - started, outcome)
+        return detail
+
+    async def __aenter__(self): await self.open(); return self
+    async def __aexit__(self, exc_type, exc_val, exc_tb): await self.close()
@@ -0,0 +1,112 @@
+import asyncio
+import contextlib
+import logging
+from typing import List, Dict, Any, Optional, Callable, AsyncIterator, Set
+from .detail_pool import DetailWorkerPool
+
+class SearchDetailPipeline:
+    def __init__(self, pool: DetailWorkerPool, parser, detail_cache=None, queue_size: Optional[int] = None):
+        """
+        検索で見つけた案件をキューに入れ、詳細取得ワーカーが同時に取り出して取得するパイプラインのコンストラクタ
+        キューが一杯の間は検索を待たせる（詳細取得が追いつくまで次のページに進まない）
+        Args:
+            pool (DetailWorkerPool): 詳細取得に使うワーカープール（検索中のタブとは別のページを使うこと）
+            parser (LancersParser): 詳細情報のパーサー
+            detail_cache (Optional[DetailCache]): 指定時は有効期間内の詳細をキャッシュから使い、取得結果を保存する
+            queue_size (Optional[int]): キューの上限（省略時はワーカー数の2倍）
+        """
+        self.pool = pool
+        self.parser = parser
+        self.detail_cache = detail_cache
+        self.queue_size = queue_size
+        self.discovered = 0
+        self.duplicates = 0
+        self.skipped = 0
+        self.cache_hits = 0
+        self.fetched = 0
+        self.failed = 0
+        self.logger = logging.getLogger(__name__)
+
+    async def run(self, pages: AsyncIterator[List[Dict[str, Any]]],
+                  on_row: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        検索結果のページを読みながら詳細を取得し、詳細を結合した行を取得が終わった順に渡す
+        Args:
+            pages (AsyncIterator[List[Dict[str, Any]]]): パース済みの検索結果をページごとに返す非同期イテレータ
+            on_row (Callable[[Dict[str, Any]], None]): 詳細を結合した行ごとに呼ぶ関数（取得失敗時は検索結果の行のまま）
+        """
+        if not self.pool.pages:
+            await self.pool.open()
+        workers = len(self.pool.pages)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size or workers * 2)
+        seen: Set[str] = set()
+        consumer_failed = False
+
+        async def on_detail(row: Dict[str, Any], detail: Optional[Dict[str, Any]]) -> None:
+            if detail is None:
+                self.failed += 1
+                self.logger.warning(f"URL {row.get('url')} の詳細情報を取得できませんでした。")
+                on_row(row)
+                return
+            parsed_detail = self.parser.parse_work_detail(detail)
+            self.fetched += 1
+            if self.detail_cache:
+                self.detail_cache.put(row.get('work_id'), parsed_detail)
+            on_row(self._merge(row, parsed_detail))
+
+        async def produce() -> None:
+            try:
+                async for parsed_page in pages:
+                    for row in parsed_page:
+                        key = row.get('work_id') or row.get('url')
+                        if not key or not row.get('url'):
+                            # URLの無い行は詳細を取得できないため除外する（重複とは別に数える）
+                            self.skipped += 1
+                            continue
+                        if key in seen:
+                            self.duplicates += 1
+                            continue
+                        seen.add(key)
+                        self.discovered += 1
+                        cached = self.detail_cache.get(row.get('work_id')) if self.detail_cache else None
+                        if cached:
+                            self.cache_hits += 1
+                            on_row(self._merge(row, cached))
+                        else:
+                            await queue.put((row, row['url']))
+            finally:
+                # 検索が途中で失敗しても、取り出し済みの案件は取得してからワーカーを終了させる
+                for _ in range(workers):
+                    if consumer_failed:
+                        # 取り出すワーカーがもう居ないため、キューが一杯なら待たずに諦める
+                        with contextlib.suppress(asyncio.QueueFull):
+                            queue.put_nowait(None)
+                    else:
+                        await queue.put(None)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            await self.pool.consume(queue, on_detail)
+        except BaseException:
+            consumer_failed = True
+            producer.cancel()
+            # 検索側のエラーより詳細取得側のエラーを優先して伝える
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await producer
+            raise
+        # 検索中のエラーは、ワーカーが取得を終えてから呼び出し元に伝える
+        await producer
+
+    @staticmethod
+    def _merge(row: Dict[str, Any], parsed_detail: Dict[str, Any]) -> Dict[str, Any]:
+        """検索結果の行に詳細を結合する（詳細側が空の項目は検索結果の値を残す）"""
+        merged = dict(row)
+        merged.update((key, value) for key, value in parsed_detail.items() if value or key not in row)
+        return merged
+
+    def log_summary(self) -> None:
+        """検出件数と取得件数をログに出力する"""
+        self.logger.info(
+            f"検索・詳細パイプライン: 検出 {self.discovered}件 (重複 {self.duplicates}件, 除外 {self.skipped}件), "
+            f"詳細取得 {self.fetched}件 / キャッシュ {self.cache_hits}件 / 失敗 {self.failed}件"
+        )
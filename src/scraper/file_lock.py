@@ -0,0 +1,40 @@
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Windows でロックの解除を待つ間隔（秒）
+_RETRY_INTERVAL = 0.05
+
+def lock_file(f) -> None:
+    """
+    ファイルを排他ロックする（他のプロセスがロックを解除するまで待つ）
+    Args:
+        f (IO): ロックするファイル（open 済みのファイルオブジェクト）
+    """
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        # LK_LOCK は約10秒で諦めて OSError になるため、ロックできるまで自分で再試行する
+        while True:
+            f.seek(0)
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(_RETRY_INTERVAL)
+
+def unlock_file(f) -> None:
+    """
+    lock_file でかけたロックを解除する
+    Args:
+        f (IO): ロックを解除するファイル
+    """
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
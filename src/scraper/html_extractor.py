@@ -0,0 +1,227 @@
+import re
+from html.parser import HTMLParser
+from typing import List, Dict, Any, Optional, Tuple
+
+# 閉じタグを持たない要素
+_VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+])
+_PEOPLE_PATTERN = re.compile(r'(\d+)\s*人')
+_WORK_ID_PATTERN = re.compile(r'/work/detail/(\d+)')
+
+# 案件カードの項目: (項目名, 要素のクラス, 見つからない場合の値)（browser._EXTRACT_WORK_CARDS_JS と同じ）
+_CARD_FIELDS = (
+    ('title', 'p-search-job-media__title', 'タイトルなし'),
+    ('price', 'p-search-job-media__price', '報酬未設定'),
+    ('type', 'c-badge__text', '種別不明'),
+    ('deadline', 'p-search-job-media__time-remaining', '期限なし'),
+    ('status', 'p-search-job-media__time-text', '状態不明'),
+)
+
+class _TextCollector(HTMLParser):
+    """
+    HTMLを先頭から1回だけ読み、open_field が項目名を返した要素のテキストを閉じた時に close_field に渡す
+    DOMの木やCSSセレクタは作らず、どの要素を抽出するかはサブクラスがタグ名・クラス・属性で判定する
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._texts: List[str] = []
+        # 開いている要素: (タグ, 項目名, テキストの開始位置, 属性)
+        self._stack: List[Tuple[str, List[str], int, Dict[str, str]]] = []
+
+    def open_field(self, tag: str, attrs: Dict[str, str], classes: List[str]) -> List[str]:
+        """要素が開いた時に呼ばれ、テキストを集める項目名を返す"""
+        return []
+
+    def close_field(self, key: str, text: str, attrs: Dict[str, str]) -> None:
+        """項目の要素が閉じた時に、子孫のテキスト（DOM の textContent 相当）と共に呼ばれる"""
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: (v or '') for k, v in attrs}
+        keys = self.open_field(tag, attrs, attrs.get('class', '').split())
+        entry = (tag, keys, len(self._texts), attrs)
+        if tag in _VOID_ELEMENTS:
+            self._close(entry)
+        else:
+            self._stack.append(entry)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_ELEMENTS:
+            self._close(self._stack.pop())
+
+    def handle_endtag(self, tag):
+        # 閉じ忘れの要素があっても、対応する開始タグまで遡って閉じる
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                while len(self._stack) > i:
+                    self._close(self._stack.pop())
+                return
+
+    def handle_data(self, data):
+        if not self._stack or self._stack[-1][0] not in ('script', 'style'):
+            self._texts.append(data)
+
+    def close(self):
+        super().close()
+        while self._stack:
+            self._close(self._stack.pop())
+
+    def _close(self, entry) -> None:
+        _, keys, start, attrs = entry
+        if keys:
+            text = ''.join(self._texts[start:])
+            for key in keys:
+                self.close_field(key, text, attrs)
+
+class _WorkCardCollector(_TextCollector):
+    """検索結果ページから案件カード（div.p-search-job-media / div[data-external-modal]）の項目を集める"""
+    def __init__(self):
+        super().__init__()
+        # (セレクタの順位, カード): ブラウザ側と同様に div.p-search-job-media のカードを先に並べる
+        self.cards: List[Tuple[int, Dict[str, Any]]] = []
+        self._card: Optional[Dict[str, Any]] = None
+
+    def open_field(self, tag, attrs, classes):
+        if self._card is None:
+            if tag == 'div' and ('p-search-job-media' in classes or 'data-external-modal' in attrs):
+                self._card = {}
+                return ['card']
+            return []
+        # カード内では各項目に最初に一致した要素を使う（querySelector と同じ）
+        keys = [key for key, class_name, _ in _CARD_FIELDS if class_name in classes and key not in self._card]
+        for key in keys:
+            self._card[key] = ''
+        if tag == 'a' and 'p-search-job-media__title' in classes and 'url' not in self._card:
+            self._card['url'] = attrs.get('href', '')
+        return keys
+
+    def close_field(self, key, text, attrs):
+        if key == 'card':
+            rank = 0 if 'p-search-job-media' in attrs.get('class', '').split() else 1
+            self.cards.append((rank, self._card))
+            self._card = None
+        else:
+            self._card[key] = text.strip()
+
+class _WorkDetailCollector(_TextCollector):
+    """案件詳細ページからタイトル・スケジュール欄・募集人数の候補を集める"""
+    def __init__(self):
+        super().__init__()
+        self.fields: Dict[str, str] = {}
+        self.schedule: List[Tuple[str, str]] = []
+        # 募集人数の候補: 項目名 -> テキスト
+        self.people_candidates: Dict[str, str] = {}
+        self._schedule_depth = 0
+        self._item: Optional[Dict[str, str]] = None
+
+    def open_field(self, tag, attrs, classes):
+        keys = []
+        for key, matched in (('page_title', tag == 'title'), ('heading', tag == 'h1'),
+                             ('header_title', 'p-work-detail-header__title' in classes)):
+            if matched and key not in self.fields:
+                self.fields[key] = ''
+                keys.append(key)
+        if tag == 'p':
+            keys.append('people_p')
+        if 'c-definitionList__description' in classes:
+            keys.append('people_description')
+        if tag == 'p' and 'p-work-detail-schedule' in classes:
+            self._schedule_depth += 1
+            keys.append('schedule')
+        elif tag == 'span' and self._schedule_depth:
+            if 'p-work-detail-schedule__item' in classes and self._item is None:
+                self._item = {}
+                keys.append('item')
+            elif self._item is not None:
+                for key, class_name in (('item_title', 'p-work-detail-schedule__item__title'),
+                                        ('item_text', 'p-work-detail-schedule__text')):
+                    if class_name in classes and key not in self._item:
+                        self._item[key] = ''
+                        keys.append(key)
+        return keys
+
+    def close_field(self, key, text, attrs):
+        if key in ('page_title', 'heading', 'header_title'):
+            self.fields[key] = text.strip()
+        elif key == 'schedule':
+            self._schedule_depth -= 1
+        elif key == 'item':
+            item, self._item = self._item, None
+            if 'item_title' in item and 'item_text' in item:
+                self.schedule.append((item['item_title'], item['item_text']))
+        elif key in ('item_title', 'item_text'):
+            self._item[key] = text.strip()
+        else:
+            # ブラウザ側の :has-text セレクタと同様に、キーワードを含む最初の要素を候補にする
+            keyword = "(募集人数" if key == 'people_p' else "募集人数"
+            if keyword in text and key not in self.people_candidates:
+                self.people_candidates[key] = text
+
+def _collect(collector: _TextCollector, html: str) -> _TextCollector:
+    collector.feed(html or '')
+    collector.close()
+    return collector
+
+def extract_work_cards(html: str) -> List[Dict[str, Any]]:
+    """
+    検索結果ページのHTMLから案件カードの情報を抽出する（ブラウザでの一括抽出と同じ項目・既定値）
+    Args:
+        html (str): 検索結果ページのHTML
+    Returns:
+        List[Dict[str, Any]]: 案件情報のリスト（URLは相対のまま）
+    """
+    collector = _collect(_WorkCardCollector(), html)
+    results = []
+    for _, card in sorted(collector.cards, key=lambda item: item[0]):
+        result = {'title': card.get('title', 'タイトルなし'), 'url': card.get('url', '')}
+        result.update((key, card.get(key, fallback)) for key, _, fallback in _CARD_FIELDS[1:])
+        results.append(result)
+    return results
+
+def extract_work_detail(html: str, url: str) -> Optional[Dict[str, Any]]:
+    """
+    案件詳細ページのHTMLから詳細情報を抽出する（ブラウザでの取得と同じ項目）
+    Args:
+        html (str): 案件詳細ページのHTML
+        url (str): 案件詳細ページのURL
+    Returns:
+        Optional[Dict[str, Any]]: 案件詳細情報（閲覧制限ページの場合はNone）
+    """
+    collector = _collect(_WorkDetailCollector(), html)
+    if "閲覧制限" in collector.fields.get('page_title', ''):
+        return None
+
+    title = collector.fields.get('heading') or collector.fields.get('header_title', '')
+
+    deadline_raw, delivery_date_raw = "", ""
+    for item_title, item_text in collector.schedule:
+        if '締切' in item_title:
+            deadline_raw = item_text
+        elif '希望納期' in item_title:
+            delivery_date_raw = item_text
+
+    people = ""
+    for key in ('people_p', 'people_description'):
+        if key not in collector.people_candidates:
+            continue
+        people_text = collector.people_candidates[key]
+        match = _PEOPLE_PATTERN.search(people_text)
+        if match:
+            people = match.group(1)
+            break
+        people = people_text.strip()
+
+    work_id_match = _WORK_ID_PATTERN.search(url)
+    return {
+        'title': title,
+        'url': url, 'work_id': work_id_match.group(1) if work_id_match else "不明",
+        'deadline_raw': deadline_raw,
+        'people': people,
+        'delivery_date_raw': delivery_date_raw,
+    }
+
+def is_login_wall(html: str) -> bool:
+    """ログインフォームが表示されているページかどうかを判定する"""
+    return 'id="UserEmail"' in html and 'id="UserPassword"' in html
@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import time
+import http.cookiejar
+import urllib.parse
+import urllib.request
+from typing import List, Dict, Any, Optional, Tuple
+from .browser import build_page_url, MYPAGE_URL
+from .html_extractor import extract_work_cards, extract_work_detail, is_login_wall
+
+# たどるリダイレクトの最大回数
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+def to_cookiejar_cookie(cookie: Dict[str, Any]) -> http.cookiejar.Cookie:
+    """
+    Playwright の context.cookies() 形式のクッキーを http.cookiejar のクッキーに変換する
+    Args:
+        cookie (Dict[str, Any]): name, value, domain, path, expires（セッションクッキーは -1）, secure を持つ辞書
+    Returns:
+        http.cookiejar.Cookie: 変換したクッキー
+    """
+    domain = cookie.get('domain') or ""
+    expires = cookie.get('expires')
+    session = expires is None or expires < 0
+    return http.cookiejar.Cookie(
+        version=0, name=cookie['name'], value=cookie['value'], port=None, port_specified=False,
+        domain=domain, domain_specified=domain.startswith('.'), domain_initial_dot=domain.startswith('.'),
+        path=cookie.get('path') or '/', path_specified=True, secure=bool(cookie.get('secure')),
+        expires=None if session else int(expires), discard=session, comment=None, comment_url=None,
+        rest={'HttpOnly': None} if cookie.get('httpOnly') else {},
+    )
+
+class _ResponseInfo:
+    """http.cookiejar が Set-Cookie を読むためのレスポンスの形に urllib3 のヘッダーを合わせる"""
+    def __init__(self, headers):
+        self.headers = headers
+
+    def info(self):
+        return self
+
+    def get_all(self, name: str, default=None):
+        return self.headers.getlist(name) or default
+
+class LancersHttpFetcher:
+    def __init__(self, browser, cookies: Optional[List[Dict[str, Any]]] = None,
+                 user_agent: Optional[str] = None, pool_size: int = 10, timeout: float = 20.0):
+        """
+        サーバー側で描画されるページをHTTPで直接取得するクラスのコンストラクタ
+        JSでしか描画されない内容やログイン画面を検出した場合はブラウザでの取得に切り替える
+        Args:
+            browser (LancersBrowser): フォールバック先のブラウザ（ログイン済みであればそのセッションを共有する）
+            cookies (Optional[List[Dict[str, Any]]]): 送信するクッキー（Playwright の context.cookies() 形式）
+                ドメイン・パス・secure・有効期限を確認して送信し、レスポンスの Set-Cookie で更新する
+            user_agent (Optional[str]): User-Agent ヘッダー
+            pool_size (int): ホストごとに保持するキープアライブ接続数
+            timeout (float): リクエストのタイムアウト（秒）
+        """
+        self.browser = browser
+        self.cookie_jar = http.cookiejar.CookieJar()
+        for cookie in cookies or []:
+            self.cookie_jar.set_cookie(to_cookiejar_cookie(cookie))
+        self.timeout = timeout
+        headers = {'Accept-Language': 'ja,en;q=0.8'}
+        if user_agent:
+            headers['User-Agent'] = user_agent
+        # urllib3 の読み込みは --http-fetch を使う時だけでよいため、作成時まで遅らせる
+        import urllib3
+        self.http = urllib3.PoolManager(num_pools=4, maxsize=pool_size, block=False, headers=headers)
+        self.http_fetches = 0
+        self.browser_fallbacks = 0
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    async def from_browser(cls, browser, **kwargs) -> 'LancersHttpFetcher':
+        """
+        起動済み（ログイン済み）の LancersBrowser のクッキーと User-Agent を引き継いで作成する
+        Args:
+            browser (LancersBrowser): 起動済みのブラウザ
+        Returns:
+            LancersHttpFetcher: 作成したフェッチャー
+        """
+        cookies = await browser.context.cookies()
+        user_agent = await browser.page.evaluate("navigator.userAgent")
+        return cls(browser, cookies=cookies, user_agent=user_agent, **kwargs)
+
+    @classmethod
+    def from_session_store(cls, browser, **kwargs) -> Optional['LancersHttpFetcher']:
+        """
+        起動前の LancersBrowser の session_store に保存されたセッションのクッキーで作成する
+        Args:
+            browser (LancersBrowser): 未起動のブラウザ（session_store・base_url・rate_limiter を使う）
+        Returns:
+            Optional[LancersHttpFetcher]: 作成したフェッチャー（保存済みのセッションが無い場合はNone）
+        """
+        state = browser.session_store.load() if browser.session_store else None
+        if not state:
+            return None
+        return cls(browser, cookies=state.get('cookies'), **kwargs)
+
+    async def is_logged_in(self) -> bool:
+        """
+        ブラウザを起動せずに、クッキーのセッションでログイン済みかをマイページのHTTP取得で確認する
+        Returns:
+            bool: ログイン済みの場合はTrue
+        """
+        url = self.browser.site_url(MYPAGE_URL)
+        rate_limiter = getattr(self.browser, 'rate_limiter', None)
+        if rate_limiter:
+            await rate_limiter.acquire(url)
+        try:
+            loop = asyncio.get_running_loop()
+            response, final_url = await loop.run_in_executor(None, self._get, url)
+        except Exception as e:
+            self.logger.warning(f"ログイン状態の確認に失敗しました: {str(e)}")
+            return False
+        if response.status != 200 or '/user/login' in final_url:
+            return False
+        return not is_login_wall(response.data.decode('utf-8', errors='replace'))
+
+    def _get(self, url: str) -> Tuple[Any, str]:
+        """
+        クッキーを付けてGETする。リダイレクトは1回ずつたどり、途中のレスポンスの Set-Cookie も反映する
+        Args:
+            url (str): 取得するURL
+        Returns:
+            Tuple[HTTPResponse, str]: 最後のレスポンスとそのURL
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            request = urllib.request.Request(url)
+            self.cookie_jar.add_cookie_header(request)
+            headers = {'Cookie': request.get_header('Cookie')} if request.has_header('Cookie') else {}
+            response = self.http.request('GET', url, headers=headers, timeout=self.timeout, redirect=False)
+            self.cookie_jar.extract_cookies(_ResponseInfo(response.headers), request)
+            location = response.headers.get('Location')
+            if response.status not in REDIRECT_STATUSES or not location:
+                break
+            url = urllib.parse.urljoin(url, location)
+        return response, url
+
+    async def fetch_html(self, url: str) -> Optional[str]:
+        """
+        URLのHTMLを取得する（取得できない場合はNone）
+        Args:
+            url (str): 取得するURL（本番サイトのURLはブラウザの base_url のサイトに置き換えて取得する）
+        Returns:
+            Optional[str]: HTML文字列
+        """
+        url = self.browser.site_url(url)
+        rate_limiter = getattr(self.browser, 'rate_limiter', None)
+        if rate_limiter:
+            await rate_limiter.acquire(url)
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            response, final_url = await loop.run_in_executor(None, self._get, url)
+        except Exception as e:
+            self.logger.warning(f"HTTP取得に失敗しました ({url}): {str(e)}")
+            return None
+        self.http_fetches += 1
+        self.logger.debug("HTTP取得 %s (%.0fms): %s", response.status, (time.perf_counter() - started) * 1000, url)
+        if response.status != 200 or '/user/login' in final_url:
+            self.logger.info(f"HTTP取得の結果が利用できません (status={response.status}, url={final_url})")
+            return None
+        html = response.data.decode('utf-8', errors='replace')
+        if is_login_wall(html):
+            self.logger.info(f"ログイン画面が返されました: {url}")
+            return None
+        page_archive = getattr(self.browser, 'page_archive', None)
+        if page_archive:
+            page_archive.save(final_url, html)
+        return html
+
+    async def search_page(self, url: str, page_num: int = 1) -> List[Dict[str, Any]]:
+        """
+        検索結果の指定ページをHTTPで取得し、案件情報を抽出する
+        案件カードが見つからない場合はブラウザで取得し直す
+        Args:
+            url (str): 一覧ページ（1ページ目）のURL
+            page_num (int): ページ番号
+        Returns:
+            List[Dict[str, Any]]: 案件情報のリスト
+        """
+        target_url = build_page_url(url, page_num)
+        self.logger.info(f"ページ {page_num} をHTTPで取得: {target_url}")
+        html = await self.fetch_html(target_url)
+        if html:
+            cards = extract_work_cards(html)
+            if cards:
+                return [{**card, 'url': self.browser.to_full_url(card['url'])} for card in cards]
+        self.browser_fallbacks += 1
+        self.logger.info(f"HTTPで案件カードを取得できなかったため、ブラウザで取得します (ページ {page_num})")
+        await self.browser._go_to_page(url, page_num)
+        return await self.browser._extract_work_infos()
+
+    async def get_work_detail_by_url(self, url: str, page=None) -> Optional[Dict[str, Any]]:
+        """
+        案件詳細ページをHTTPで取得し、詳細情報を抽出する
+        見出しが描画されていない・ログイン画面が返された場合はブラウザで取得し直す
+        Args:
+            url (str): 案件詳細ページのURL
+            page (Optional[Page]): フォールバック時に使用するページ
+        Returns:
+            Optional[Dict[str, Any]]: 案件詳細情報（取得できない場合はNone）
+        """
+        html = await self.fetch_html(url)
+        if html:
+            try:
+                detail = extract_work_detail(html, url)
+                if detail is None:
+                    self.logger.warning(f"案件 {url} は閲覧制限があります")
+                    self.browser.restricted_urls.add(url)
+                    return None
+                if detail['title']:
+                    return detail
+            except Exception as e:
+                self.logger.warning(f"HTMLからの詳細抽出に失敗しました ({url}): {str(e)}")
+        self.browser_fallbacks += 1
+        self.logger.info(f"HTTPで詳細を取得できなかったため、ブラウザで取得します: {url}")
+        return await self.browser.get_work_detail_by_url(url, page=page)
+
+    def log_summary(self) -> None:
+        """HTTP取得とブラウザへのフォールバックの件数をログに出力する"""
+        self.logger.info(f"HTTP取得 {self.http_fetches}件, ブラウザへのフォールバック {self.browser_fallbacks}件")
+
+    def close(self) -> None:
+        """接続プールを閉じる"""
+        self.http.clear()
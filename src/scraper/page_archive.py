@@ -0,0 +1,256 @@
+import os
+import gzip
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Set
+from .replay import normalize_url
+from .html_extractor import extract_work_detail
+from .file_lock import lock_file, unlock_file
+
+DEFAULT_ARCHIVE_DIR = os.path.join('data', 'archive')
+INDEX_FILENAME = 'index.json'
+# 複数のプロセスが同じアーカイブの索引を書き出す時に使うロックファイル
+INDEX_LOCK_FILENAME = 'index.lock'
+
+class PageArchive:
+    def __init__(self, directory: str = DEFAULT_ARCHIVE_DIR, max_bytes: int = 500 * 1024 * 1024):
+        """
+        取得したページのHTMLを圧縮して保存するアーカイブのコンストラクタ
+        本文は内容のハッシュをファイル名にして gzip で保存し（同じ内容は1つだけ保存する）、
+        URLごとの取得日時とハッシュを index.json に記録する
+        合計サイズが上限を超えた場合は、最後に使われたのが古い本文から削除する
+        ワーカープロセスには保存先と上限だけを渡してプロセスごとに作り直し、索引は書き出す時に統合する
+        Args:
+            directory (str): 保存先ディレクトリ
+            max_bytes (int): 圧縮後の本文の合計サイズの上限
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # URL -> [[取得日時, ハッシュ], ...]（古い順）
+        self.urls: Dict[str, List[List[Any]]] = {}
+        # ハッシュ -> [圧縮後サイズ, 最終使用日時]（最後に使われたのが古い順）
+        self.blobs: 'OrderedDict[str, List[float]]' = OrderedDict()
+        self._blob_urls: Dict[str, Set[str]] = {}
+        self.total_bytes = 0
+        self.saved_pages = 0
+        self.evicted_blobs = 0
+        self._pending: Set[asyncio.Future] = set()
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        index = self._read_index()
+        self.urls = index.get('urls', {})
+        self.blobs = OrderedDict(index.get('blobs', {}))
+        self._rebuild_locked()
+
+    def __reduce__(self):
+        # スレッドのロックや保存中の Future は pickle できないため、保存先と上限だけを渡して
+        # 受け取った側（spawn したワーカープロセス）で作り直す
+        return (PageArchive, (self.directory, self.max_bytes))
+
+    def _read_index(self) -> Dict[str, Any]:
+        index_path = os.path.join(self.directory, INDEX_FILENAME)
+        if not os.path.exists(index_path):
+            return {}
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"アーカイブの索引を読み込めませんでした: {str(e)}")
+            return {}
+
+    def _rebuild_locked(self) -> None:
+        """urls と blobs から合計サイズとハッシュごとのURLを計算し直す"""
+        self.total_bytes = sum(size for size, _ in self.blobs.values())
+        self._blob_urls = {}
+        for url, entries in self.urls.items():
+            for _, sha in entries:
+                self._blob_urls.setdefault(sha, set()).add(url)
+
+    def _merge_index_locked(self, index: Dict[str, Any]) -> None:
+        """
+        他のプロセスが書き出した索引をこのプロセスの索引に統合する
+        どちらかのプロセスが削除した本文（ファイルが無いもの）は除き、最終使用日時は新しい方を使う
+        """
+        blobs: Dict[str, List[float]] = {}
+        for sha, (size, used_at) in list(index.get('blobs', {}).items()) + list(self.blobs.items()):
+            if sha in blobs:
+                blobs[sha] = [size, max(used_at, blobs[sha][1])]
+            elif os.path.exists(self._blob_path(sha)):
+                blobs[sha] = [size, used_at]
+        self.blobs = OrderedDict(sorted(blobs.items(), key=lambda item: item[1][1]))
+        urls: Dict[str, List[List[Any]]] = {}
+        for url in set(index.get('urls', {})) | set(self.urls):
+            entries = {tuple(entry) for entry in index.get('urls', {}).get(url, []) + self.urls.get(url, [])}
+            entries = sorted(entry for entry in entries if entry[1] in self.blobs)
+            if entries:
+                urls[url] = [list(entry) for entry in entries]
+        self.urls = urls
+        self._rebuild_locked()
+
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self.directory, 'objects', sha[:2], f"{sha}.html.gz")
+
+    async def attach(self, context) -> None:
+        """
+        ブラウザコンテキストで取得したページ（HTML文書）を保存する
+        Args:
+            context (BrowserContext): 対象のブラウザコンテキスト
+        """
+        context.on('response', self._on_response)
+        self.logger.info(f"取得したページをアーカイブに保存します: {self.directory}")
+
+    def _on_response(self, response) -> None:
+        if response.request.resource_type != 'document' or response.status != 200:
+            return
+        future = asyncio.ensure_future(self._save_response(response))
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+    async def _save_response(self, response) -> None:
+        try:
+            body = await response.body()
+        except Exception as e:
+            self.logger.debug("ページ本文を取得できませんでした (%s): %s", response.url, e)
+            return
+        self.save(response.url, body.decode('utf-8', errors='replace'))
+
+    def save(self, url: str, html: str, fetched_at: Optional[float] = None) -> None:
+        """
+        HTMLの保存を別スレッドで開始する（完了を待たない。flush で待つ）
+        Args:
+            url (str): ページのURL
+            html (str): ページのHTML
+            fetched_at (Optional[float]): 取得日時（UNIX時間、省略時は現在）
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, self._write, url, html, fetched_at or time.time())
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+    def _write(self, url: str, html: str, fetched_at: float) -> None:
+        data = html.encode('utf-8')
+        sha = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(sha)
+        # 他のプロセスが削除した本文もあるため、索引ではなくファイルの有無で判定する
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=6))
+            os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        url = normalize_url(url)
+        with self._lock:
+            if sha not in self.blobs:
+                self.total_bytes += size
+            self.blobs[sha] = [size, fetched_at]
+            self.blobs.move_to_end(sha)
+            self.urls.setdefault(url, []).append([fetched_at, sha])
+            self._blob_urls.setdefault(sha, set()).add(url)
+            self.saved_pages += 1
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        # 最新の本文は残す
+        while self.total_bytes > self.max_bytes and len(self.blobs) > 1:
+            sha, (size, _) = self.blobs.popitem(last=False)
+            self.total_bytes -= size
+            self.evicted_blobs += 1
+            for url in self._blob_urls.pop(sha, ()):
+                entries = [entry for entry in self.urls.get(url, []) if entry[1] != sha]
+                if entries:
+                    self.urls[url] = entries
+                else:
+                    self.urls.pop(url, None)
+            try:
+                os.remove(self._blob_path(sha))
+            except OSError:
+                pass
+
+    def latest(self, url: str) -> Optional[str]:
+        """
+        URLの最新のHTMLを取得する
+        Args:
+            url (str): ページのURL
+        Returns:
+            Optional[str]: HTML（保存されていない場合はNone）
+        """
+        with self._lock:
+            entries = self.urls.get(normalize_url(url))
+            if not entries:
+                return None
+            sha = entries[-1][1]
+            if sha in self.blobs:
+                self.blobs[sha][1] = time.time()
+                self.blobs.move_to_end(sha)
+        try:
+            with gzip.open(self._blob_path(sha), 'rb') as f:
+                return f.read().decode('utf-8')
+        except OSError as e:
+            self.logger.warning(f"アーカイブの本文を読み込めませんでした ({url}): {str(e)}")
+            return None
+
+    def iter_latest(self, url_contains: str = '') -> Iterator[Tuple[str, str]]:
+        """
+        保存されている各URLの最新のHTMLを順に返す
+        Args:
+            url_contains (str): URLに含まれる文字列で絞り込む
+        Returns:
+            Iterator[Tuple[str, str]]: (URL, HTML) の組
+        """
+        for url in list(self.urls):
+            if url_contains in url:
+                html = self.latest(url)
+                if html is not None:
+                    yield url, html
+
+    async def flush(self) -> None:
+        """
+        保存中のページを待ってから索引を書き出す
+        索引ファイルをロックし、他のプロセスが書き出した内容と統合してから置き換える
+        """
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+        os.makedirs(self.directory, exist_ok=True)
+        index_path = os.path.join(self.directory, INDEX_FILENAME)
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(os.path.join(self.directory, INDEX_LOCK_FILENAME), 'a+', encoding='utf-8') as lock:
+            lock_file(lock)
+            try:
+                with self._lock:
+                    self._merge_index_locked(self._read_index())
+                    self._evict_locked()
+                    index = {'urls': self.urls, 'blobs': self.blobs}
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(index, f, ensure_ascii=False)
+                os.replace(tmp_path, index_path)
+            finally:
+                unlock_file(lock)
+
+    def log_summary(self) -> None:
+        """保存件数と使用量をログに出力する"""
+        self.logger.info(
+            f"ページアーカイブ: 今回 {self.saved_pages}件保存, {len(self.urls)} URL / {len(self.blobs)} 本文, "
+            f"{self.total_bytes / 1024 / 1024:.1f}MB (削除 {self.evicted_blobs}件)"
+        )
+
+def reparse_details(archive: PageArchive, parser) -> List[Dict[str, Any]]:
+    """
+    アーカイブの案件詳細ページを再取得せずに解析し直す
+    Args:
+        archive (PageArchive): ページアーカイブ
+        parser (LancersParser): 詳細情報のパーサー
+    Returns:
+        List[Dict[str, Any]]: パース済みの案件詳細のリスト（閲覧制限のページは含まない）
+    """
+    details = []
+    for url, html in archive.iter_latest('/work/detail/'):
+        detail = extract_work_detail(html, url)
+        if detail:
+            details.append(detail)
+    return parser.parse_work_details(details)
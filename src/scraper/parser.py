@@ -1,7 +1,48 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import re
 import logging
 from datetime import datetime
+from functools import lru_cache
+
+# 呼び出しごとにパターンを解釈し直さないよう、正規表現はモジュール読み込み時にコンパイルしておく
+WORK_ID_PATTERN = re.compile(r'/work/detail/(\d+)')
+DEADLINE_NOISE_PATTERN = re.compile(r'締切|：|\s+')
+DELIVERY_DATE_NOISE_PATTERN = re.compile(r'希望納期|：|\s+')
+PEOPLE_PATTERN = re.compile(r'募集人数\s*(\d+)\s*人')
+PEOPLE_PAREN_PATTERN = re.compile(r'\(募集人数\s*(\d+)\s*人\)')
+DIGITS_PATTERN = re.compile(r'(\d+)')
+DATE_PATTERN = re.compile(r'(\d{4})年(\d{1,2})月(\d{1,2})日')
+TIME_PATTERN = re.compile(r'(\d{1,2}):(\d{1,2})')
+ISO_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# 締切・納期・募集人数の文字列は多くの案件で重複するため、正規化の結果を一定件数まで覚えておく
+NORMALIZE_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def tokenize_date(text: str) -> Optional[Tuple[str, str, str, Optional[Tuple[str, str]]]]:
+    """
+    日本語の日付文字列を1回の走査で (年, 月, 日, (時, 分) または None) に分解する（月日時分は0埋め済み）
+    Args:
+        text (str): 日付文字列（例：2025年4月21日 18:17）
+    Returns:
+        Optional[Tuple[str, str, str, Optional[Tuple[str, str]]]]: 年月日が含まれない場合はNone
+    """
+    date_match = DATE_PATTERN.search(text)
+    if not date_match:
+        return None
+    year, month, day = date_match.groups()
+    time_match = TIME_PATTERN.search(text) if ':' in text else None
+    time = (time_match.group(1).zfill(2), time_match.group(2).zfill(2)) if time_match else None
+    return year, month.zfill(2), day.zfill(2), time
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_people(people: str) -> str:
+    """募集人数の文字列から人数（数字）を取り出す（見つからない場合はそのまま返す）"""
+    for pattern in (PEOPLE_PATTERN, PEOPLE_PAREN_PATTERN, DIGITS_PATTERN):
+        match = pattern.search(people)
+        if match:
+            return match.group(1)
+    return people
 
 class LancersParser:
     def __init__(self):
@@ -22,7 +63,7 @@ class LancersParser:
         try:
             if not url:
                 return ""
-            match = re.search(r'/work/detail/(\d+)', url)
+            match = WORK_ID_PATTERN.search(url)
             return match.group(1) if match else ""
         except Exception as e:
             self.logger.error(f"案件IDの抽出に失敗しました: {str(e)}")
@@ -40,7 +81,7 @@ class LancersParser:
             if not deadline or deadline == "期限なし":
                 return deadline
             # 不要な文字を削除し、日時形式を整形
-            deadline = re.sub(r'締切|：|\s+', '', deadline)
+            deadline = DEADLINE_NOISE_PATTERN.sub('', deadline)
             return deadline
         except Exception as e:
             self.logger.error(f"締切日時の解析に失敗しました: {str(e)}")
@@ -58,7 +99,7 @@ class LancersParser:
             if not delivery_date or delivery_date == "納期未設定":
                 return delivery_date
             # 不要な文字を削除し、日時形式を整形
-            delivery_date = re.sub(r'希望納期|：|\s+', '', delivery_date)
+            delivery_date = DELIVERY_DATE_NOISE_PATTERN.sub('', delivery_date)
             return delivery_date
         except Exception as e:
             self.logger.error(f"希望納期の解析に失敗しました: {str(e)}")
@@ -75,28 +116,40 @@ class LancersParser:
         try:
             if not people or people == "人数未設定":
                 return people
-                
-            # 数字のみを抽出（様々なパターンに対応）
-            # パターン1: 募集人数X人
-            people_match = re.search(r'募集人数\s*(\d+)\s*人', people)
-            if people_match:
-                return people_match.group(1)
-                
-            # パターン2: (募集人数X人)
-            paren_match = re.search(r'\(募集人数\s*(\d+)\s*人\)', people)
-            if paren_match:
-                return paren_match.group(1)
-                
-            # パターン3: 単に数字が含まれている
-            num_match = re.search(r'(\d+)', people)
-            if num_match:
-                return num_match.group(1)
-                
-            return people
+            # 数字のみを抽出（募集人数X人 → (募集人数X人) → 単に数字が含まれている の順に探す）
+            return normalize_people(people)
         except Exception as e:
             self.logger.error(f"募集人数の解析に失敗しました: {str(e)}")
             return people
 
+    def normalize_deadline_raw(self, deadline_raw: str) -> str:
+        """
+        締切日時の生の文字列から日付部分を取り出し、YYYY-MM-DD 形式に変換する（CSVの deadline_raw 列に出力する値）
+        Args:
+            deadline_raw (str): 締切日時の文字列（例：2025年4月21日 18:17）
+        Returns:
+            str: YYYY-MM-DD 形式の日付（正規化済みの値はそのまま、年月日が読み取れない場合は時間部分を除いた元の文字列）
+        """
+        if not deadline_raw:
+            return ""
+        try:
+            # まず時間部分があれば削除
+            date_part = deadline_raw.split(' ', 1)[0]
+            # 正規化済み（YYYY-MM-DD）の値はそのまま返す（保存済みCSVを再度正規化する場合）
+            if ISO_DATE_PATTERN.fullmatch(date_part):
+                return date_part
+            # 年月日を抽出（0埋め済み）
+            tokens = tokenize_date(date_part)
+            if tokens:
+                year, month, day, _ = tokens
+                return f"{year}-{month}-{day}"
+            # マッチしない場合は元の（時間削除後の）日付部分を使用
+            self.logger.warning("Could not parse YYYY年MM月DD日 from '%s'. Using it as is.", date_part)
+            return date_part
+        except Exception as format_error:
+            self.logger.error(f"Error formatting deadline_raw '{deadline_raw}' to YYYY-MM-DD: {format_error}. Using original raw value.")
+            return deadline_raw # エラー時は元の値に戻す
+
     def format_date(self, date_str: str) -> str:
         """
         日本語の日付形式を標準形式（YYYY-MM-DD）に変換
@@ -108,23 +161,14 @@ class LancersParser:
         try:
             if not date_str:
                 return ""
-                
-            # 年月日の抽出
-            date_match = re.search(r'(\d{4})年(\d{1,2})月(\d{1,2})日', date_str)
-            if not date_match:
+
+            tokens = tokenize_date(date_str)
+            if not tokens:
                 return date_str
-                
-            year = date_match.group(1)
-            month = date_match.group(2).zfill(2)  # 1桁の場合は0埋め
-            day = date_match.group(3).zfill(2)    # 1桁の場合は0埋め
-            
-            # 時刻がある場合は取得
-            time_match = re.search(r'(\d{1,2}):(\d{1,2})', date_str)
-            if time_match:
-                hour = time_match.group(1).zfill(2)
-                minute = time_match.group(2).zfill(2)
-                return f"{year}-{month}-{day} {hour}:{minute}"
-            
+            year, month, day, time = tokens
+            # 時刻がある場合は付ける
+            if time:
+                return f"{year}-{month}-{day} {time[0]}:{time[1]}"
             return f"{year}-{month}-{day}"
         except Exception as e:
             self.logger.error(f"日付形式の変換に失敗しました: {str(e)}")
@@ -138,6 +182,20 @@ class LancersParser:
         Returns:
             Dict[str, Any]: パース済みの案件詳細情報
         """
+        return self._parse_work_detail(detail, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+    def parse_work_details(self, details: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        複数の案件詳細情報をまとめてパースする（アーカイブの再解析など大量の行を処理する場合に使う）
+        Args:
+            details (List[Dict[str, Any]]): 案件詳細情報のリスト
+        Returns:
+            List[Dict[str, Any]]: パース済みの案件詳細情報のリスト（scraped_at は全件で共通）
+        """
+        scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return [self._parse_work_detail(detail, scraped_at) for detail in details]
+
+    def _parse_work_detail(self, detail: Dict[str, Any], scraped_at: str) -> Dict[str, Any]:
         try:
             # 締切日時のパース (正しいキー名を使用)
             deadline_raw = detail.get('deadline_raw', '') # 'deadline' -> 'deadline_raw'
@@ -157,31 +215,12 @@ class LancersParser:
             # 募集期間のパース
             period = detail.get('period', '') # period は現在CSV出力から除外されている
 
-            # --- deadline_raw から日付部分を抽出し、YYYY-MM-DD 形式に変換 ---
-            deadline_yyyy_mm_dd = ""
-            if deadline_raw:
-                try:
-                    # まず時間部分があれば削除
-                    date_part = deadline_raw.split(' ', 1)[0]
-                    # 年月日を正規表現で抽出
-                    date_match = re.search(r'(\d{4})年(\d{1,2})月(\d{1,2})日', date_part)
-                    if date_match:
-                        year = date_match.group(1)
-                        month = date_match.group(2).zfill(2) # 0埋め
-                        day = date_match.group(3).zfill(2)   # 0埋め
-                        deadline_yyyy_mm_dd = f"{year}-{month}-{day}"
-                        self.logger.debug(f"Formatted deadline_raw to YYYY-MM-DD: '{deadline_yyyy_mm_dd}'")
-                    else:
-                        # マッチしない場合は元の（時間削除後の）日付部分を使用
-                        deadline_yyyy_mm_dd = date_part
-                        self.logger.warning(f"Could not parse YYYY年MM月DD日 from '{date_part}'. Using it as is.")
-                except Exception as format_error:
-                    self.logger.error(f"Error formatting deadline_raw '{deadline_raw}' to YYYY-MM-DD: {format_error}. Using original raw value.")
-                    deadline_yyyy_mm_dd = deadline_raw # エラー時は元の値に戻す
-            # --- 変換ここまで ---
+            # deadline_raw から日付部分を抽出し、YYYY-MM-DD 形式に変換
+            deadline_yyyy_mm_dd = self.normalize_deadline_raw(deadline_raw)
 
             # デバッグログ: 返す直前の値を確認 (YYYY-MM-DD形式の値を出力)
-            self.logger.info(f"Parser returning: deadline_raw(YYYY-MM-DD)='{deadline_yyyy_mm_dd}', delivery_date_raw='{delivery_date_raw}', people='{people}'")
+            self.logger.debug("Parser returning: deadline_raw(YYYY-MM-DD)='%s', delivery_date_raw='%s', people='%s'",
+                              deadline_yyyy_mm_dd, delivery_date_raw, people)
 
             return_dict = {
                 'title': detail.get('title', ''),
@@ -193,9 +232,9 @@ class LancersParser:
                 'delivery_date': delivery_date_formatted, # CSV出力からは除外されている
                 'delivery_date_raw': delivery_date_raw, # ★CSVに出力されるべき値
                 'period': period,               # CSV出力からは除外されている
-                'scraped_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'scraped_at': scraped_at
             }
-            self.logger.debug(f"Parser return dict: {return_dict}") # より詳細なデバッグログ
+            self.logger.debug("Parser return dict: %s", return_dict) # より詳細なデバッグログ
             return return_dict
 
         except Exception as e:
@@ -211,6 +250,7 @@ class LancersParser:
             List[Dict[str, Any]]: 整形された結果のリスト
         """
         parsed_results = []
+        scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         for result in results:
             try:
                 parsed_result = {
@@ -221,7 +261,7 @@ class LancersParser:
                     'type': result.get('type', '種別不明'),
                     'deadline': self.parse_deadline(result.get('deadline', '')),
                     'status': result.get('status', '状態不明'),
-                    'scraped_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    'scraped_at': scraped_at
                 }
                 parsed_results.append(parsed_result)
             except Exception as e:
@@ -0,0 +1,99 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import urllib.parse
+from typing import Dict, Any, Optional
+from .file_lock import lock_file, unlock_file
+
+DEFAULT_RATE_LIMIT_STATE_PATH = os.path.join('data', 'rate_limit', 'buckets.json')
+
+class TokenBucketRateLimiter:
+    def __init__(self, rate: float, burst: int = 5, state_path: Optional[str] = None):
+        """
+        ホストごとのトークンバケットでリクエスト数を制限するクラスのコンストラクタ
+        state_path を指定すると、バケットの状態をファイルロック付きで共有し、
+        複数のワーカープロセスや連続した実行の間でも同じ予算を使う
+        Args:
+            rate (float): 1秒あたりに補充するリクエスト数
+            burst (int): 連続して送れるリクエスト数（バケットの容量）
+            state_path (Optional[str]): バケットの状態を保存するファイル（省略時はプロセス内のみで共有）
+        """
+        if rate <= 0:
+            raise ValueError(f"rate は正の数を指定してください: {rate}")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.state_path = state_path
+        self._buckets: Dict[str, Dict[str, float]] = {}
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.logger = logging.getLogger(__name__)
+
+    def _take(self, bucket: Dict[str, float], now: float) -> float:
+        """
+        バケットを補充してトークンを1つ予約し、使えるようになるまでの待ち時間を返す
+        （トークンが足りない場合は負の残高として予約し、呼び出し順に待ち時間が伸びる）
+        """
+        tokens = bucket.get('tokens', float(self.burst))
+        elapsed = max(0.0, now - bucket.get('updated', now))
+        tokens = min(float(self.burst), tokens + elapsed * self.rate) - 1
+        bucket['tokens'] = tokens
+        bucket['updated'] = now
+        return max(0.0, -tokens) / self.rate
+
+    def _take_shared(self, host: str) -> float:
+        """ファイルをロックしてバケットの状態を読み書きする"""
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        with open(self.state_path, 'a+', encoding='utf-8') as f:
+            lock_file(f)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or '{}')
+                except ValueError:
+                    state = {}
+                wait = self._take(state.setdefault(host, {}), time.time())
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+            finally:
+                unlock_file(f)
+        return wait
+
+    async def acquire(self, url: str) -> float:
+        """
+        URLのホストのトークンを1つ取得する（必要な時間だけ待つ）
+        Args:
+            url (str): これからアクセスするURL
+        Returns:
+            float: 待った秒数
+        """
+        host = urllib.parse.urlsplit(url).netloc or url
+        if self.state_path:
+            loop = asyncio.get_running_loop()
+            wait = await loop.run_in_executor(None, self._take_shared, host)
+        else:
+            wait = self._take(self._buckets.setdefault(host, {}), time.time())
+        self.acquired += 1
+        if wait > 0:
+            self.total_wait += wait
+            self.logger.debug("レート制限のため %.2f秒 待機します (%s)", wait, host)
+            await asyncio.sleep(wait)
+        return wait
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        これまでの取得件数と待ち時間の統計を取得する
+        Returns:
+            Dict[str, Any]: 取得件数・合計待ち時間
+        """
+        return {'acquired': self.acquired, 'total_wait': self.total_wait}
+
+    def log_summary(self) -> None:
+        """レート制限の統計をログに出力する"""
+        self.logger.info(
+            f"レート制限 ({self.rate}件/秒, バースト {self.burst}): "
+            f"{self.acquired}件, 合計待ち時間 {self.total_wait:.1f}秒"
+        )
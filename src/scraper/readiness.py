@@ -0,0 +1,148 @@
+import time
+import logging
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Tuple, Any
+
+# ページが準備完了かを判定するスクリプト（ReadinessPolicy の内容を引数に取る）
+_READY_JS = """
+(policy) => {
+    // 失敗を示す表示があれば、それ以上待たない
+    for (const selector of policy.fail_any_of) {
+        const element = document.querySelector(selector);
+        if (element && element.getClientRects().length && element.textContent.trim()) return 'failed';
+    }
+    for (const selector of policy.fail_if_empty) {
+        const element = document.querySelector(selector);
+        if (element && !element.value) return 'failed';
+    }
+    if (policy.url_excludes && location.href.includes(policy.url_excludes)) return false;
+    for (const selector of policy.required) {
+        if (!document.querySelector(selector)) return false;
+    }
+    if (!policy.any_of.length) return true;
+    let count = 0;
+    for (const selector of policy.any_of) {
+        count += document.querySelectorAll(selector).length;
+    }
+    return count >= policy.min_count || (policy.allow_complete && document.readyState === 'complete');
+}
+"""
+
+@dataclass
+class ReadinessPolicy:
+    """ページ種別ごとの準備完了条件"""
+    required: Tuple[str, ...] = ()       # すべて存在する必要があるセレクタ
+    any_of: Tuple[str, ...] = ()         # 合計 min_count 個以上存在すればよいセレクタ
+    min_count: int = 1
+    allow_complete: bool = True          # any_of が無くても読み込み完了なら準備完了とみなす
+    url_excludes: Optional[str] = None   # URLにこの文字列が含まれなくなるまで待つ（ログイン後の遷移用）
+    fail_any_of: Tuple[str, ...] = ()    # 文字を含んで表示されたら失敗として待機を終えるセレクタ（エラーメッセージ）
+    fail_if_empty: Tuple[str, ...] = ()  # 存在して値が空なら失敗として待機を終える入力欄（送信後に表示し直されたフォーム）
+    timeout_ms: int = 10000
+
+DEFAULT_POLICIES: Dict[str, ReadinessPolicy] = {
+    # 検索結果: 案件カードが表示されるか、（0件のページでは）読み込みが完了するまで
+    'search': ReadinessPolicy(
+        any_of=('div.p-search-job-media', 'div[data-external-modal]'),
+    ),
+    # 案件詳細: 見出しとスケジュール欄（無いページでは読み込み完了）まで
+    'detail': ReadinessPolicy(
+        required=('h1.c-heading--lv1',),
+        any_of=('p.p-work-detail-schedule',),
+    ),
+    # ログインフォーム: 入力欄と送信ボタンが揃うまで
+    'login_form': ReadinessPolicy(
+        required=('input#UserEmail', 'input#UserPassword', 'button#form_submit'),
+    ),
+    # ログイン後: ログインページから遷移し、ログイン済みの要素が出るまで
+    # （エラーメッセージが出るか、入力したパスワードが消えたフォームが表示し直された場合は失敗としてすぐに終える）
+    'login': ReadinessPolicy(
+        any_of=('.c-header-user-dropdown__user-name', '.p-mypage-sidebar__profile__name',
+                '#header_mypage_button', 'a[href="/mypage"]'),
+        url_excludes='/user/login',
+        fail_any_of=('.c-form-error__message', '.error_message', '.alert-danger', '#js-error'),
+        fail_if_empty=('input#UserPassword',),
+        timeout_ms=15000,
+    ),
+}
+
+@dataclass
+class WaitStats:
+    """ページ種別ごとの待機時間の記録"""
+    durations: List[float] = field(default_factory=list)
+    timeouts: int = 0
+    failures: int = 0
+
+class ReadinessWaiter:
+    def __init__(self, policies: Optional[Dict[str, ReadinessPolicy]] = None):
+        """
+        固定の sleep の代わりに具体的な条件でページの準備完了を待つクラスのコンストラクタ
+        Args:
+            policies (Optional[Dict[str, ReadinessPolicy]]): ページ種別ごとの条件（デフォルトを上書き）
+        """
+        self.policies: Dict[str, ReadinessPolicy] = {**DEFAULT_POLICIES, **(policies or {})}
+        self.stats: Dict[str, WaitStats] = {}
+        self.logger = logging.getLogger(__name__)
+
+    async def wait(self, page, page_type: str) -> bool:
+        """
+        指定したページ種別の条件を満たすまで待機する
+        Args:
+            page (Page): 対象のページ
+            page_type (str): ページ種別（'search', 'detail', 'login_form', 'login' など）
+        Returns:
+            bool: タイムアウトせずに条件を満たした場合はTrue（失敗を示す表示があった場合はすぐにFalse）
+        """
+        policy = self.policies[page_type]
+        stats = self.stats.setdefault(page_type, WaitStats())
+        started = time.perf_counter()
+        ready = True
+        try:
+            # URLの条件も同じスクリプトで確認する（遷移しないまま失敗の表示が出た場合に待ち続けないため）
+            result = await page.wait_for_function(_READY_JS, arg=self._policy_arg(policy),
+                                                  timeout=policy.timeout_ms, polling=100)
+            if result is not None and await result.json_value() == 'failed':
+                ready = False
+                stats.failures += 1
+                self.logger.info(f"失敗を示す表示があったため待機を終了しました ({page_type})")
+        except Exception as e:
+            ready = False
+            stats.timeouts += 1
+            self.logger.warning(f"ページ準備完了の待機がタイムアウトしました ({page_type}): {str(e).splitlines()[0]}")
+        elapsed = time.perf_counter() - started
+        stats.durations.append(elapsed)
+        self.logger.debug("ページ準備完了待機 (%s): %.0fms", page_type, elapsed * 1000)
+        return ready
+
+    def _policy_arg(self, policy: ReadinessPolicy) -> Dict[str, Any]:
+        arg = asdict(policy)
+        arg['required'] = list(policy.required)
+        arg['any_of'] = list(policy.any_of)
+        arg['fail_any_of'] = list(policy.fail_any_of)
+        arg['fail_if_empty'] = list(policy.fail_if_empty)
+        return arg
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        ページ種別ごとの待機時間の統計を取得する
+        Returns:
+            Dict[str, Dict[str, float]]: 回数・平均・最大（秒）・タイムアウト回数・失敗で終えた回数
+        """
+        return {
+            page_type: {
+                'count': len(stats.durations),
+                'avg': sum(stats.durations) / len(stats.durations) if stats.durations else 0.0,
+                'max': max(stats.durations, default=0.0),
+                'timeouts': stats.timeouts,
+                'failures': stats.failures,
+            }
+            for page_type, stats in self.stats.items()
+        }
+
+    def log_summary(self) -> None:
+        """待機時間の統計をログに出力する"""
+        for page_type, stats in self.summary().items():
+            self.logger.info(
+                f"待機統計 ({page_type}): {stats['count']}回, 平均 {stats['avg'] * 1000:.0f}ms, "
+                f"最大 {stats['max'] * 1000:.0f}ms, タイムアウト {stats['timeouts']}回, 失敗 {stats['failures']}回"
+            )
@@ -0,0 +1,150 @@
+import os
+import json
+import asyncio
+import hashlib
+import logging
+from typing import Dict, Any, Optional, Set
+
+# 記録・再生の対象にするリソース種別（HTML本体とページが取得するデータ）
+RECORDED_RESOURCE_TYPES = ('document', 'xhr', 'fetch')
+
+# 記録するレスポンスヘッダー
+_RECORDED_HEADERS = ('content-type', 'location')
+
+INDEX_FILENAME = 'index.json'
+
+def normalize_url(url: str) -> str:
+    """記録・再生のキーにするURL（フラグメントを除く）"""
+    return url.split('#', 1)[0]
+
+def _body_filename(url: str) -> str:
+    return hashlib.sha1(url.encode('utf-8')).hexdigest() + '.body'
+
+class ResponseRecorder:
+    def __init__(self, directory: str):
+        """
+        実サイトへのアクセス中に検索・詳細ページのレスポンスを保存するクラスのコンストラクタ
+        本文はURLごとのファイルに、ステータスとヘッダーは index.json に保存する
+        Args:
+            directory (str): 保存先ディレクトリ
+        """
+        self.directory = directory
+        self.index: Dict[str, Dict[str, Any]] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self.logger = logging.getLogger(__name__)
+        index_path = os.path.join(directory, INDEX_FILENAME)
+        if os.path.exists(index_path):
+            # 既存の記録に追記する
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    async def attach(self, context) -> None:
+        """
+        ブラウザコンテキストのレスポンスイベントを購読する
+        Args:
+            context (BrowserContext): 対象のブラウザコンテキスト
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        context.on('response', self._on_response)
+        self.logger.info(f"レスポンスの記録を開始します: {self.directory}")
+
+    def _on_response(self, response) -> None:
+        if response.request.resource_type not in RECORDED_RESOURCE_TYPES:
+            return
+        task = asyncio.ensure_future(self.record(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def record(self, response) -> None:
+        """
+        1件のレスポンスを保存する（リダイレクトは本文なしで記録する）
+        Args:
+            response (Response): Playwright のレスポンス
+        """
+        url = normalize_url(response.url)
+        try:
+            headers = await response.all_headers()
+            body = b'' if 300 <= response.status < 400 else await response.body()
+        except Exception as e:
+            self.logger.warning(f"レスポンスを記録できませんでした ({url}): {str(e)}")
+            return
+        filename = _body_filename(url)
+        with open(os.path.join(self.directory, filename), 'wb') as f:
+            f.write(body)
+        self.index[url] = {
+            'status': response.status,
+            'headers': {k: v for k, v in headers.items() if k.lower() in _RECORDED_HEADERS},
+            'file': filename,
+        }
+
+    async def flush(self) -> None:
+        """記録中のレスポンスを待ってから index.json を書き出す"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+        os.makedirs(self.directory, exist_ok=True)
+        index_path = os.path.join(self.directory, INDEX_FILENAME)
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, index_path)
+        self.logger.info(f"{len(self.index)} 件のレスポンスを記録しました: {self.directory}")
+
+class ResponseReplayer:
+    def __init__(self, directory: str):
+        """
+        記録済みのレスポンスをルーティングで返し、実サイトにアクセスせずに実行するクラスのコンストラクタ
+        記録にないページは404を返し、それ以外の記録にないリクエストは遮断する
+        Args:
+            directory (str): ResponseRecorder の保存先ディレクトリ
+        """
+        self.directory = directory
+        index_path = os.path.join(directory, INDEX_FILENAME)
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"記録が見つかりません: {index_path}")
+        with open(index_path, 'r', encoding='utf-8') as f:
+            self.index: Dict[str, Dict[str, Any]] = json.load(f)
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+
+    async def attach(self, context) -> None:
+        """
+        ブラウザコンテキストに再生用のルーティングハンドラを登録する
+        Args:
+            context (BrowserContext): 対象のブラウザコンテキスト
+        """
+        await context.route('**/*', self._handle_route)
+        self.logger.info(f"記録済みのレスポンスで再生します: {self.directory} ({len(self.index)}件)")
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        URLの記録を取得する
+        Args:
+            url (str): リクエストURL
+        Returns:
+            Optional[Dict[str, Any]]: status, headers, body（記録がない場合はNone）
+        """
+        entry = self.index.get(normalize_url(url))
+        if entry is None:
+            return None
+        with open(os.path.join(self.directory, entry['file']), 'rb') as f:
+            body = f.read()
+        return {'status': entry['status'], 'headers': entry['headers'], 'body': body}
+
+    async def _handle_route(self, route) -> None:
+        request = route.request
+        entry = self.lookup(request.url)
+        if entry is not None:
+            self.hits += 1
+            await route.fulfill(status=entry['status'], headers=entry['headers'], body=entry['body'])
+            return
+        if request.resource_type == 'document':
+            self.misses += 1
+            self.logger.warning(f"記録にないページです: {request.url}")
+            await route.fulfill(status=404, content_type='text/html', body='')
+        else:
+            await route.abort()
+
+    def log_summary(self) -> None:
+        """再生のヒット件数をログに出力する"""
+        self.logger.info(f"リプレイ統計: 記録から応答 {self.hits}件, 記録にないページ {self.misses}件")
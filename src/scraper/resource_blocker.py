@@ -0,0 +1,121 @@
+import re
+import logging
+from typing import Dict, Any, Iterable, Optional
+
+# スクレイパーが参照しないためデフォルトでブロックするリソース種別
+DEFAULT_BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font', 'stylesheet')
+
+# 広告・解析・トラッキング系のURLパターン
+DEFAULT_BLOCKED_URL_PATTERNS = (
+    r'google-analytics\.com',
+    r'googletagmanager\.com',
+    r'googlesyndication\.com',
+    r'doubleclick\.net',
+    r'connect\.facebook\.net',
+    r'facebook\.com/tr',
+    r'analytics\.twitter\.com',
+    r'bat\.bing\.com',
+    r'clarity\.ms',
+    r'hotjar\.com',
+    r'criteo\.(com|net)',
+    r'yimg\.jp/images/listing/tool/cv',
+)
+
+# ブロックしたリクエストの削減バイト数の見積もりに使う、リソース種別ごとの平均サイズ
+# （ブロックしたリソースは取得しないため実際のサイズは分からない。統計はこの値による概算）
+ESTIMATED_RESOURCE_BYTES = {
+    'image': 30_000,
+    'media': 200_000,
+    'font': 40_000,
+    'stylesheet': 25_000,
+    'script': 50_000,
+    'xhr': 5_000,
+    'fetch': 5_000,
+    'ping': 500,
+    'other': 2_000,
+}
+
+class ResourceBlocker:
+    def __init__(
+        self,
+        resource_types: Optional[Iterable[str]] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        url_patterns: Optional[Iterable[str]] = DEFAULT_BLOCKED_URL_PATTERNS
+    ):
+        """
+        不要なリソースの読み込みを遮断するルーティング層のコンストラクタ
+        Args:
+            resource_types (Optional[Iterable[str]]): ブロックするリソース種別（Playwrightの resource_type）
+            url_patterns (Optional[Iterable[str]]): ブロックするURLの正規表現パターン
+        """
+        self.resource_types = frozenset(resource_types or ())
+        self.url_pattern = re.compile('|'.join(f'(?:{p})' for p in url_patterns)) if url_patterns else None
+        self.blocked_requests = 0
+        self.allowed_requests = 0
+        self.estimated_bytes_saved = 0
+        self.blocked_by_type: Dict[str, int] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """
+        リクエストをブロックするかどうかを判定する
+        Args:
+            resource_type (str): リソース種別
+            url (str): リクエストURL
+        Returns:
+            bool: ブロックする場合はTrue
+        """
+        if resource_type == 'document':
+            return False
+        if resource_type in self.resource_types:
+            return True
+        return bool(self.url_pattern and self.url_pattern.search(url))
+
+    def record(self, resource_type: str, blocked: bool) -> None:
+        """判定結果を統計に反映する"""
+        if not blocked:
+            self.allowed_requests += 1
+            return
+        self.blocked_requests += 1
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+        self.estimated_bytes_saved += ESTIMATED_RESOURCE_BYTES.get(resource_type, ESTIMATED_RESOURCE_BYTES['other'])
+
+    async def attach(self, context) -> None:
+        """
+        ブラウザコンテキストにルーティングハンドラを登録する
+        Args:
+            context (BrowserContext): 対象のブラウザコンテキスト
+        """
+        await context.route('**/*', self._handle_route)
+        self.logger.info(f"リソースブロックを有効にしました (種別: {sorted(self.resource_types)})")
+
+    async def _handle_route(self, route) -> None:
+        request = route.request
+        blocked = self.should_block(request.resource_type, request.url)
+        self.record(request.resource_type, blocked)
+        if blocked:
+            await route.abort()
+        else:
+            # 他のルーティングハンドラ（リプレイ等）にも処理を委ねる
+            await route.fallback()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        実行中の削減量の統計を取得する
+        Returns:
+            Dict[str, Any]: ブロック件数・許可件数・推定削減バイト数・種別ごとの件数
+        """
+        return {
+            'blocked_requests': self.blocked_requests,
+            'allowed_requests': self.allowed_requests,
+            'estimated_bytes_saved': self.estimated_bytes_saved,
+            'blocked_by_type': dict(self.blocked_by_type),
+        }
+
+    def log_summary(self) -> None:
+        """削減量の統計をログに出力する"""
+        stats = self.summary()
+        self.logger.info(
+            f"リソースブロック統計: ブロック {stats['blocked_requests']}件 / 許可 {stats['allowed_requests']}件, "
+            f"推定削減量 約{stats['estimated_bytes_saved'] / 1024 / 1024:.1f}MB (種別ごとの平均サイズによる概算で、実測値ではありません), "
+            f"内訳 {stats['blocked_by_type']}"
+        )
@@ -0,0 +1,64 @@
+import os
+import json
+import stat
+import logging
+from typing import Dict, Any, Optional
+
+DEFAULT_SESSION_PATH = os.path.join('data', 'session', 'storage_state.json')
+
+class SessionStore:
+    def __init__(self, path: str = DEFAULT_SESSION_PATH):
+        """
+        ログイン済みセッション（Playwright の storage_state）を保存・読み込みするクラスのコンストラクタ
+        ファイルは所有者のみ読み書きできる権限で保存する
+        Args:
+            path (str): storage_state を保存するJSONファイルのパス
+        """
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        保存済みのセッションを読み込む
+        Returns:
+            Optional[Dict[str, Any]]: storage_state（存在しない・壊れている場合はNone）
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            if os.name == 'posix' and os.stat(self.path).st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+                self.logger.warning(f"セッションファイルの権限が緩いため 600 に修正します: {self.path}")
+                os.chmod(self.path, 0o600)
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.logger.info(f"保存済みのセッションを読み込みました: {self.path}")
+            return state
+        except Exception as e:
+            self.logger.warning(f"セッションファイルの読み込みに失敗しました: {str(e)}")
+            return None
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """
+        セッションを保存する（一時ファイルに書き込んでから置き換える）
+        Args:
+            state (Dict[str, Any]): context.storage_state() の結果
+        """
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.logger.info(f"ログインセッションを保存しました: {self.path}")
+        except Exception as e:
+            self.logger.error(f"ログインセッションの保存に失敗しました: {str(e)}")
+
+    def clear(self) -> None:
+        """保存済みのセッションを削除する"""
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+                self.logger.info(f"保存済みのセッションを削除しました: {self.path}")
+        except Exception as e:
+            self.logger.error(f"セッションファイルの削除に失敗しました: {str(e)}")
@@ -0,0 +1,293 @@
+import os
+import asyncio
+import itertools
+import logging
+import logging.handlers
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.util import Finalize
+from typing import List, Dict, Any, Optional, Tuple, Callable, Set
+from .browser import LancersBrowser
+from .detail_pool import DetailWorkerPool
+from .http_fetcher import LancersHttpFetcher
+
+# ワーカープロセス内の状態（プロセスごとに1つのブラウザとイベントループを保持する）
+_worker_state: Dict[str, Any] = {}
+
+def _logger_levels() -> Dict[str, int]:
+    """ルートロガー（''）と、個別にレベルを設定したロガーのレベル（ワーカープロセスに同じ設定を渡す）"""
+    levels = {'': logging.getLogger().level}
+    for name, logger in logging.Logger.manager.loggerDict.items():
+        if isinstance(logger, logging.Logger) and logger.level != logging.NOTSET:
+            levels[name] = logger.level
+    return levels
+
+class _ForwardHandler(logging.Handler):
+    """ワーカープロセスから届いたログを、このプロセスの同じ名前のロガーから出力し直す"""
+    def emit(self, record: logging.LogRecord) -> None:
+        logger = logging.getLogger() if record.name == 'root' else logging.getLogger(record.name)
+        logger.handle(record)
+
+def _forward_logs(log_queue, log_levels: Dict[str, int]) -> None:
+    """ワーカープロセスのログを親プロセスに送る（標準出力とログファイルへの書き込みは親プロセスだけが行う）"""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    for name, level in log_levels.items():
+        logging.getLogger(name).setLevel(level)
+
+def _init_worker(browser_options: Dict[str, Any], headless: bool, concurrency: int, http_fetch: bool,
+                 email: Optional[str], password: Optional[str], result_queue=None,
+                 log_queue=None, log_levels: Optional[Dict[str, int]] = None) -> None:
+    """ワーカープロセスでブラウザを起動し、保存済みセッション（無効なら再ログイン）を使う"""
+    _worker_state['result_queue'] = result_queue
+    if log_queue is not None:
+        _forward_logs(log_queue, log_levels or {})
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    browser = LancersBrowser(headless=headless, **browser_options)
+
+    async def setup():
+        await browser.start()
+        if email and password:
+            await browser.ensure_logged_in(email, password)
+        fetcher = await LancersHttpFetcher.from_browser(browser) if http_fetch else None
+        pool = DetailWorkerPool(browser, concurrency=concurrency, fetcher=fetcher)
+        await pool.open()
+        return fetcher, pool
+
+    fetcher, pool = loop.run_until_complete(setup())
+    _worker_state.update(loop=loop, browser=browser, fetcher=fetcher, pool=pool, result_queue=result_queue)
+    # プロセス終了時にブラウザを閉じる
+    Finalize(None, _close_worker, exitpriority=10)
+
+def _close_worker() -> None:
+    loop = _worker_state.get('loop')
+    if loop is None:
+        return
+
+    async def teardown():
+        await _worker_state['pool'].close()
+        if _worker_state['fetcher']:
+            _worker_state['fetcher'].log_summary()
+            _worker_state['fetcher'].close()
+        await _worker_state['browser'].close()
+
+    loop.run_until_complete(teardown())
+    loop.close()
+    _worker_state.clear()
+
+def _worker_stats() -> Dict[str, Any]:
+    """このプロセスのリソースブロック・レート制限・HTTP取得の累計（親プロセスでプロセスごとに合計する）"""
+    browser, fetcher = _worker_state['browser'], _worker_state['fetcher']
+    stats: Dict[str, Any] = {'pid': os.getpid()}
+    if browser.resource_blocker:
+        blocker_stats = browser.resource_blocker.summary()
+        stats.update(blocked_requests=blocker_stats['blocked_requests'],
+                     allowed_requests=blocker_stats['allowed_requests'],
+                     estimated_bytes_saved=blocker_stats['estimated_bytes_saved'])
+    if browser.rate_limiter:
+        limiter_stats = browser.rate_limiter.summary()
+        stats.update(rate_limit_acquired=limiter_stats['acquired'], rate_limit_wait=limiter_stats['total_wait'])
+    if fetcher:
+        stats.update(http_fetches=fetcher.http_fetches, browser_fallbacks=fetcher.browser_fallbacks)
+    return stats
+
+def _fetch_shard(token: int, shard: List[Tuple[int, Optional[str]]]) -> Tuple[List[Optional[Dict[str, Any]]], Dict[str, Any]]:
+    """
+    ワーカープロセスで担当分のURLを取得し、結果とこのプロセスの統計を返す
+    1件取得するごとに (呼び出しの番号, 元の位置, 詳細情報) を結果キューで親プロセスに送る
+    """
+    result_queue = _worker_state['result_queue']
+
+    def on_result(offset: int, detail: Optional[Dict[str, Any]]) -> None:
+        if result_queue is not None:
+            result_queue.put((token, shard[offset][0], detail))
+
+    urls = [url for _, url in shard]
+    results = _worker_state['loop'].run_until_complete(_worker_state['pool'].fetch_all(urls, on_result))
+    return results, _worker_stats()
+
+def partition(urls: List[Optional[str]], shards: int) -> List[List[Tuple[int, Optional[str]]]]:
+    """
+    URLを元の位置と組にして、各シャードに順番に振り分ける
+    Args:
+        urls (List[Optional[str]]): URLのリスト
+        shards (int): シャード数
+    Returns:
+        List[List[Tuple[int, Optional[str]]]]: シャードごとの (元の位置, URL) のリスト（空のシャードは含まない）
+    """
+    indexed = list(enumerate(urls))
+    return [indexed[k::shards] for k in range(shards) if indexed[k::shards]]
+
+class ShardedDetailPool:
+    def __init__(self, workers: int, concurrency: int = 1, browser_options: Optional[Dict[str, Any]] = None,
+                 headless: bool = True, http_fetch: bool = False,
+                 email: Optional[str] = None, password: Optional[str] = None):
+        """
+        案件詳細ページを複数のOSプロセス（それぞれ独立した Chromium）で取得するプールのコンストラクタ
+        DetailWorkerPool と同じ fetch_all を持ち、結果は入力と同じ順序で返す
+        各URLの結果は取得した時点で親プロセスに送り、プロセスが異常終了した場合はプールを作り直して未取得分を1回だけ取得し直す
+        各プロセスのログは親プロセスに転送して出力し、統計は close 時に合計して出力する
+        （並列数の自動調整はプロセスごとに独立してしまうため対応しない）
+        Args:
+            workers (int): 起動するワーカープロセス数
+            concurrency (int): 各プロセス内で同時に使用するタブ数
+            browser_options (Optional[Dict[str, Any]]): 各プロセスの LancersBrowser に渡すオプション（pickle可能であること）
+            headless (bool): ヘッドレスモードで実行するかどうか
+            http_fetch (bool): 各プロセスでHTTP取得を使うかどうか
+            email (Optional[str]): 保存済みセッションが無効な場合のログイン用メールアドレス
+            password (Optional[str]): 保存済みセッションが無効な場合のログイン用パスワード
+        """
+        self.workers = max(1, workers)
+        self.initargs = (browser_options or {}, headless, concurrency, http_fetch, email, password)
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.log_queue = None
+        self.log_listener: Optional[logging.handlers.QueueListener] = None
+        self.result_queue = None
+        self._result_thread: Optional[threading.Thread] = None
+        # fetch_all の呼び出しの番号 -> 1件分の結果を受け取る関数
+        self._result_handlers: Dict[int, Callable[[int, Optional[Dict[str, Any]]], None]] = {}
+        self._tokens = itertools.count()
+        self._restart_lock: Optional[asyncio.Lock] = None
+        self.restarts = 0
+        # プロセスID -> そのプロセスの最新の統計（累計）
+        self.worker_stats: Dict[int, Dict[str, Any]] = {}
+        self.logger = logging.getLogger(__name__)
+
+    async def open(self) -> None:
+        """ワーカープロセスを起動する（各プロセスのブラウザは最初の取得時に起動する）"""
+        context = multiprocessing.get_context('spawn')
+        self.log_queue = context.Queue()
+        self.log_listener = logging.handlers.QueueListener(self.log_queue, _ForwardHandler())
+        self.log_listener.start()
+        self.result_queue = context.Queue()
+        self._result_thread = threading.Thread(target=self._drain_results, args=(asyncio.get_running_loop(),),
+                                               name='shard-results', daemon=True)
+        self._result_thread.start()
+        self._restart_lock = asyncio.Lock()
+        self._start_executor()
+        self.logger.info(f"詳細取得ワーカープロセスを {self.workers} 個用意しました")
+
+    def _start_executor(self) -> None:
+        # fork では Playwright の接続やイベントループが複製されるため spawn で起動する
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'), initializer=_init_worker,
+            initargs=(*self.initargs, self.result_queue, self.log_queue, _logger_levels())
+        )
+
+    async def _restart(self, broken: Optional[ProcessPoolExecutor]) -> None:
+        """異常終了したプロセスを含むプールを作り直す（同時に失敗した他のシャードからは作り直さない）"""
+        async with self._restart_lock:
+            if self.executor is not broken:
+                return
+            self.restarts += 1
+            self.logger.warning("ワーカープロセスが異常終了したため、プロセスを起動し直します")
+            broken.shutdown(wait=False)
+            self._start_executor()
+
+    def _drain_results(self, loop: asyncio.AbstractEventLoop) -> None:
+        """ワーカープロセスから1件ずつ届く結果を、イベントループのスレッドで呼び出し元に渡す（別スレッドで実行）"""
+        while True:
+            item = self.result_queue.get()
+            if item is None:
+                return
+            loop.call_soon_threadsafe(self._deliver, *item)
+
+    def _deliver(self, token: int, index: int, detail: Optional[Dict[str, Any]]) -> None:
+        handler = self._result_handlers.get(token)
+        if handler:
+            handler(index, detail)
+
+    async def close(self) -> None:
+        """ワーカープロセスを終了する（各プロセスのブラウザも閉じる）"""
+        loop = asyncio.get_running_loop()
+        if self.executor:
+            await loop.run_in_executor(None, self.executor.shutdown)
+            self.executor = None
+            self.log_summary()
+        if self._result_thread:
+            self.result_queue.put(None)
+            await loop.run_in_executor(None, self._result_thread.join)
+            self._result_thread = None
+        if self.log_listener:
+            # 終了したプロセスが最後に送ったログ（各プロセスの統計）まで出力してから止める
+            self.log_listener.stop()
+            self.log_listener = None
+
+    def log_summary(self) -> None:
+        """全ワーカープロセスの統計を合計してログに出力する"""
+        if not self.worker_stats:
+            return
+        totals: Dict[str, float] = {}
+        for stats in self.worker_stats.values():
+            for key, value in stats.items():
+                if key != 'pid':
+                    totals[key] = totals.get(key, 0) + value
+        message = f"ワーカープロセス {len(self.worker_stats)}個の合計:"
+        if 'blocked_requests' in totals:
+            message += (f" リソースブロック {totals['blocked_requests']}件 / 許可 {totals['allowed_requests']}件"
+                        f" (推定削減量 約{totals['estimated_bytes_saved'] / 1024 / 1024:.1f}MB、概算),")
+        if 'rate_limit_acquired' in totals:
+            message += f" レート制限 {totals['rate_limit_acquired']}件 / 合計待ち時間 {totals['rate_limit_wait']:.1f}秒,"
+        if 'http_fetches' in totals:
+            message += f" HTTP取得 {totals['http_fetches']}件 / ブラウザへのフォールバック {totals['browser_fallbacks']}件"
+        self.logger.info(message.rstrip(','))
+
+    async def fetch_all(self, urls: List[Optional[str]],
+                        on_result: Optional[Callable[[int, Optional[Dict[str, Any]]], None]] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        URLのリストをプロセス数に分割して並列に取得し、元の順序に並べ直す
+        Args:
+            urls (List[Optional[str]]): 取得するURLのリスト（空の要素は取得しない）
+            on_result (Optional[Callable[[int, Optional[Dict[str, Any]]], None]]): 1件取得するごとに位置と詳細情報で呼ぶ関数
+                （取得し直しても取得できなかったURLでは呼ばない）
+        Returns:
+            List[Optional[Dict[str, Any]]]: 入力と同じ順序の詳細情報（取得失敗時はNone）
+        """
+        if self.executor is None:
+            await self.open()
+        loop = asyncio.get_running_loop()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+        delivered: Set[int] = set()
+        token = next(self._tokens)
+
+        def deliver(index: int, detail: Optional[Dict[str, Any]]) -> None:
+            # 結果キューとシャードの戻り値の両方で届くため、最初の1回だけ渡す
+            if index in delivered:
+                return
+            delivered.add(index)
+            results[index] = detail
+            if on_result and urls[index]:
+                on_result(index, detail)
+
+        async def run_shard(shard: List[Tuple[int, Optional[str]]], retry: bool = True) -> None:
+            executor = self.executor
+            try:
+                outcome, stats = await loop.run_in_executor(executor, _fetch_shard, token, shard)
+            except BrokenProcessPool as e:
+                remaining = [(index, url) for index, url in shard if index not in delivered]
+                self.logger.error(f"ワーカープロセスが異常終了しました (未取得 {len(remaining)}件): {str(e)}")
+                if retry and remaining:
+                    await self._restart(executor)
+                    await run_shard(remaining, retry=False)
+                return
+            except Exception as e:
+                self.logger.error(f"ワーカープロセスでの取得に失敗しました ({len(shard)}件): {str(e)}")
+                return
+            self.worker_stats[stats['pid']] = stats
+            for (index, _), detail in zip(shard, outcome):
+                deliver(index, detail)
+
+        self._result_handlers[token] = deliver
+        try:
+            await asyncio.gather(*(run_shard(shard) for shard in partition(urls, self.workers)))
+        finally:
+            self._result_handlers.pop(token, None)
+        return results
+
+    async def __aenter__(self): await self.open(); return self
+    async def __aexit__(self, exc_type, exc_val, exc_tb): await self.close()
@@ -0,0 +1,84 @@
+import os
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Any, Iterable, List
+
+DEFAULT_CRAWL_STATE_PATH = os.path.join('data', 'crawl_state', 'state.json')
+
+class CrawlState:
+    def __init__(self, path: str = DEFAULT_CRAWL_STATE_PATH, max_seen: int = 5000):
+        """
+        検索ごとに取得済みの案件IDを記録し、差分取得に使うクラスのコンストラクタ
+        Args:
+            path (str): 状態を保存するJSONファイルのパス
+            max_seen (int): 検索ごとに保持する案件IDの最大数（超えた分はIDの小さい順に忘れる）
+        """
+        self.path = path
+        self.max_seen = max_seen
+        self.logger = logging.getLogger(__name__)
+        self.searches: Dict[str, Dict[str, Any]] = {}
+        self._seen: Dict[str, set] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.searches = json.load(f)
+            except Exception as e:
+                self.logger.warning(f"差分取得の状態を読み込めませんでした（全件取得します）: {str(e)}")
+        for key, search in self.searches.items():
+            self._seen[key] = set(search.get('seen', []))
+
+    def is_known(self, key: str, work_id: str) -> bool:
+        """
+        前回までに取得した案件かどうか
+        Args:
+            key (str): 検索のキー（検索URL）
+            work_id (str): 案件ID
+        Returns:
+            bool: 取得済みの場合はTrue
+        """
+        return bool(work_id) and work_id in self._seen.get(key, ())
+
+    def high_water_mark(self, key: str) -> int:
+        """検索で取得した案件IDの最大値（未取得の場合は0）"""
+        return self.searches.get(key, {}).get('high_water', 0)
+
+    def mark_seen(self, key: str, work_ids: Iterable[str]) -> None:
+        """
+        取得した案件IDを記録する（出力の保存後に呼ぶ）
+        Args:
+            key (str): 検索のキー（検索URL）
+            work_ids (Iterable[str]): 案件IDのリスト
+        """
+        seen = self._seen.setdefault(key, set())
+        seen.update(work_id for work_id in work_ids if work_id and work_id.isdigit())
+        if len(seen) > self.max_seen:
+            self._seen[key] = seen = set(sorted(seen, key=int)[-self.max_seen:])
+        self.searches[key] = {
+            'high_water': max([int(w) for w in seen] + [self.high_water_mark(key)]),
+            'seen': sorted(seen, key=int),
+            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+    def save(self) -> None:
+        """状態を保存する（一時ファイルに書き込んでから置き換える）"""
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.searches, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.logger.error(f"差分取得の状態の保存に失敗しました: {str(e)}")
+
+    def filter_new(self, key: str, items: List[Dict[str, Any]], work_id_of) -> List[Dict[str, Any]]:
+        """
+        取得済みの案件を除いたリストを返す
+        Args:
+            key (str): 検索のキー（検索URL）
+            items (List[Dict[str, Any]]): 案件情報のリスト
+            work_id_of (Callable[[Dict[str, Any]], str]): 案件情報から案件IDを取り出す関数
+        Returns:
+            List[Dict[str, Any]]: 新着の案件情報のリスト
+        """
+        return [item for item in items if not self.is_known(key, work_id_of(item))]
@@ -1,10 +1,56 @@
 import csv
 import os
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from datetime import datetime
 import re # 正規表現モジュールをインポート
 
+class CsvStreamWriter:
+    def __init__(self, filepath: str, fieldnames: List[str], clean=None):
+        """
+        CSVに行を少しずつ書き込むクラスのコンストラクタ（ヘッダーは作成時に書き込む）
+        Args:
+            filepath (str): 出力先のパス
+            fieldnames (List[str]): 出力する列
+            clean (Optional[Callable]): 書き込む前に行を整形する関数
+        """
+        self.filepath = filepath
+        self.fieldnames = fieldnames
+        self.clean = clean
+        self.rows_written = 0
+        self._file = open(filepath, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore')
+        self._writer.writeheader()
+        self._file.flush()
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        行を書き込み、すぐにファイルへ反映する
+        Args:
+            rows (List[Dict[str, Any]]): 書き込む行
+        """
+        if self.clean:
+            rows = self.clean(rows)
+        self._writer.writerows(rows)
+        self._file.flush()
+        self.rows_written += len(rows)
+
+    def sync(self) -> None:
+        """書き込んだ行をディスクに同期する（チャンクの区切りなど、確実に残したい時点で呼ぶ）"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """ファイルを閉じる"""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
 class CSVHandler:
     def __init__(self, output_dir: str = "data/output"):
         """
@@ -91,6 +137,22 @@ class CSVHandler:
             self.logger.error(f"CSVファイルの保存に失敗しました: {str(e)}")
             raise
 
+    def open_stream(self, filename: str, fieldnames: List[str]) -> CsvStreamWriter:
+        """
+        行を少しずつ書き込むためにCSVファイルを開く
+        Args:
+            filename (str): 出力ファイル名（出力ディレクトリ外の相対パスは出力ディレクトリ内に作成する）
+            fieldnames (List[str]): 出力する列
+        Returns:
+            CsvStreamWriter: 書き込み用のオブジェクト（使い終わったら close する）
+        """
+        if os.path.isabs(filename) or os.path.normpath(filename).startswith(os.path.normpath(self.output_dir)):
+            filepath = filename
+        else:
+            filepath = os.path.join(self.output_dir, filename)
+        self.logger.info(f"CSVファイルへの書き込みを開始します: {filepath}")
+        return CsvStreamWriter(filepath, fieldnames, clean=self.clean_data)
+
     def append_to_csv(self, data: List[Dict[str, Any]], filepath: str) -> None:
         try:
             if not data:
@@ -129,6 +191,45 @@ class CSVHandler:
             self.logger.error(f"CSVファイルの読み込みに失敗しました: {str(e)}")
             return []
 
+    def read_header(self, filepath: str) -> List[str]:
+        """
+        CSVファイルのヘッダー（列名）だけを読み込む
+        Args:
+            filepath (str): CSVファイルのパス
+        Returns:
+            List[str]: 列名のリスト（ファイルが無い・空の場合は空のリスト）
+        """
+        try:
+            with open(filepath, 'r', encoding='utf-8', newline='') as f:
+                return csv.DictReader(f).fieldnames or []
+        except Exception as e:
+            self.logger.error(f"CSVファイルのヘッダーの読み込みに失敗しました: {str(e)}")
+            return []
+
+    def count_rows(self, filepath: str) -> int:
+        """CSVファイルのデータ行数を数える（行を保持せずに読み進める）"""
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            return sum(1 for _ in csv.DictReader(f))
+
+    def iter_csv_chunks(self, filepath: str, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        CSVファイルを chunk_size 行ずつ読み込む（ファイル全体をメモリに載せない）
+        Args:
+            filepath (str): CSVファイルのパス
+            chunk_size (int): 1回に返す行数
+        Returns:
+            Iterator[List[Dict[str, Any]]]: 行のリスト
+        """
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            chunk: List[Dict[str, Any]] = []
+            for row in csv.DictReader(f):
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
     def extract_urls(self, filepath: str, url_column: str = 'url') -> List[str]:
         try:
             data = self.read_csv(filepath)
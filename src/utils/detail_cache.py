@@ -0,0 +1,89 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+from typing import Dict, Any, Optional, Iterable, Tuple
+
+DEFAULT_CACHE_PATH = os.path.join('data', 'cache', 'detail_cache.sqlite3')
+
+class DetailCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = 24 * 3600, max_entries: int = 100_000):
+        """
+        案件IDをキーに、パース済みの案件詳細を保存する永続キャッシュのコンストラクタ
+        Args:
+            path (str): SQLiteファイルのパス
+            ttl (float): 有効期間（秒）。取得からこれ以上経過したものは使わない
+            max_entries (int): 保存する最大件数（超えた分は取得日時の古い順に削除する）
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            "work_id TEXT PRIMARY KEY, fetched_at REAL NOT NULL, detail TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS details_fetched_at ON details (fetched_at)")
+        self.conn.commit()
+
+    def get(self, work_id: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        有効期間内のキャッシュを取得する
+        Args:
+            work_id (str): 案件ID
+            now (Optional[float]): 現在時刻（UNIX時間、省略時は現在）
+        Returns:
+            Optional[Dict[str, Any]]: パース済みの案件詳細（無い・期限切れの場合はNone）
+        """
+        if not work_id:
+            return None
+        now = time.time() if now is None else now
+        row = self.conn.execute(
+            "SELECT detail FROM details WHERE work_id = ? AND fetched_at >= ?", (work_id, now - self.ttl)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]], now: Optional[float] = None) -> None:
+        """
+        パース済みの案件詳細をまとめて保存し、上限を超えた分を削除する
+        Args:
+            items (Iterable[Tuple[str, Dict[str, Any]]]): (案件ID, パース済みの案件詳細) の組
+            now (Optional[float]): 取得日時（UNIX時間、省略時は現在）
+        """
+        now = time.time() if now is None else now
+        rows = [(work_id, now, json.dumps(detail, ensure_ascii=False)) for work_id, detail in items if work_id]
+        if not rows:
+            return
+        try:
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO details (work_id, fetched_at, detail) VALUES (?, ?, ?)", rows)
+                self.conn.execute(
+                    "DELETE FROM details WHERE work_id IN ("
+                    "SELECT work_id FROM details ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"詳細キャッシュへの保存に失敗しました: {str(e)}")
+
+    def put(self, work_id: str, detail: Dict[str, Any], now: Optional[float] = None) -> None:
+        """パース済みの案件詳細を1件保存する"""
+        self.put_many([(work_id, detail)], now=now)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM details").fetchone()[0]
+
+    def log_summary(self) -> None:
+        """キャッシュのヒット件数をログに出力する"""
+        self.logger.info(f"詳細キャッシュ: ヒット {self.hits}件 / ミス {self.misses}件 (保存件数 {len(self)}件)")
+
+    def close(self) -> None:
+        """データベースを閉じる"""
+        self.conn.close()
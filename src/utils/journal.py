@@ -0,0 +1,99 @@
+import os
+import json
+import time
+import logging
+from typing import Dict, Any, Tuple
+
+DEFAULT_JOURNAL_DIR = os.path.join('data', 'journal')
+
+class ScrapeJournal:
+    def __init__(self, path: str, batch_size: int = 20, sync_interval: float = 2.0):
+        """
+        取得が終わったURLを1行ずつ追記するジャーナルのコンストラクタ
+        書き込みは毎回ファイルに反映し、ディスクへの同期 (fsync) は batch_size 件ごとか sync_interval 秒ごとにまとめて行う
+        Args:
+            path (str): ジャーナルファイル (JSON Lines) のパス
+            batch_size (int): 同期するまでに溜める件数
+            sync_interval (float): 前回の同期からこの秒数が経過したら同期する
+        """
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.sync_interval = sync_interval
+        self.appended = 0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._file = None
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def path_for(csv_filepath: str, directory: str = DEFAULT_JOURNAL_DIR) -> str:
+        """入力CSVに対応するジャーナルファイルのパス"""
+        base = os.path.splitext(os.path.basename(csv_filepath))[0]
+        return os.path.join(directory, f"{base}.jsonl")
+
+    def load(self) -> Dict[Tuple[int, str], Dict[str, Any]]:
+        """
+        記録済みの結果を読み込む（途中で書き込みが途切れた最後の行は無視する）
+        Returns:
+            Dict[Tuple[int, str], Dict[str, Any]]: (行番号, URL) -> 記録
+        """
+        records: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self.logger.warning(f"ジャーナルの壊れた行を無視します: {self.path}")
+                    continue
+                records[(record['index'], record['url'])] = record
+        return records
+
+    def open(self, resume: bool = False) -> None:
+        """
+        ジャーナルを書き込み用に開く
+        Args:
+            resume (bool): True の場合は既存の記録に追記し、False の場合は空にしてから書き込む
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def append(self, index: int, url: str, row: Dict[str, Any], ok: bool) -> None:
+        """
+        取得が終わったURLの結果を1件記録する
+        Args:
+            index (int): 入力CSVでの行番号（0始まり）
+            url (str): 案件URL
+            row (Dict[str, Any]): 詳細を結合した行
+            ok (bool): 詳細を取得できたかどうか
+        """
+        record = {'index': index, 'url': url, 'ok': ok, 'row': row}
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.appended += 1
+        self._pending += 1
+        if self._pending >= self.batch_size or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """書き込んだ記録をディスクに同期する"""
+        if self._file and not self._file.closed and self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """同期してからファイルを閉じる"""
+        if self._file and not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def remove(self) -> None:
+        """ジャーナルを削除する（全件の保存が完了した後に呼ぶ）"""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
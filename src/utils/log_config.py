@@ -0,0 +1,120 @@
+import os
+import sys
+import gzip
+import queue
+import atexit
+import shutil
+import logging
+import logging.handlers
+from typing import Dict, Optional
+
+DEFAULT_LOG_FILE = 'scraping.log'
+DEFAULT_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_LOG_BACKUP_COUNT = 5
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# 設定済みのリスナー（setup_logging を何度呼んでも1つだけ動かす）
+_listener: Optional[logging.handlers.QueueListener] = None
+
+class GzipRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    def __init__(self, filename: str, max_bytes: int = DEFAULT_LOG_MAX_BYTES,
+                 backup_count: int = DEFAULT_LOG_BACKUP_COUNT):
+        """
+        ログファイルが一定サイズを超えたら切り替え、古いファイルを gzip 圧縮して残すハンドラのコンストラクタ
+        Args:
+            filename (str): ログファイルのパス
+            max_bytes (int): 切り替えるサイズ（バイト）
+            backup_count (int): 残す圧縮済みファイルの数（scraping.log.1.gz ～）
+        """
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = self._compress
+
+    @staticmethod
+    def _compress(source: str, dest: str) -> None:
+        """切り替えたログファイルを圧縮して元のファイルを削除する"""
+        with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+def parse_module_levels(spec: Optional[str]) -> Dict[str, int]:
+    """
+    モジュールごとのログレベル指定を解析する
+    Args:
+        spec (Optional[str]): 「ロガー名=レベル」のカンマ区切り（例：scraper.browser=DEBUG,scraper.parser=WARNING）
+    Returns:
+        Dict[str, int]: ロガー名 -> ログレベル
+    """
+    levels: Dict[str, int] = {}
+    for item in (spec or '').split(','):
+        if not item.strip():
+            continue
+        name, sep, level = item.partition('=')
+        if not sep or not name.strip():
+            raise ValueError(f"ログレベルの指定が不正です: {item}")
+        levels[name.strip()] = _level_of(level)
+    return levels
+
+def _level_of(level: str) -> int:
+    """レベル名（大文字小文字を区別しない）を数値に変換する"""
+    value = logging.getLevelName(level.strip().upper())
+    if not isinstance(value, int):
+        raise ValueError(f"不明なログレベルです: {level}")
+    return value
+
+def setup_logging(level: str = 'INFO', log_file: Optional[str] = DEFAULT_LOG_FILE,
+                  max_bytes: int = DEFAULT_LOG_MAX_BYTES, backup_count: int = DEFAULT_LOG_BACKUP_COUNT,
+                  module_levels: Optional[Dict[str, int]] = None) -> logging.handlers.QueueListener:
+    """
+    ログ出力を設定する（プロセスの開始時に1回だけ呼ぶ。2回目以降は設定済みのリスナーを返す）
+    ログを出したスレッドではキューに入れるだけにし、整形と標準出力・ファイルへの書き込みは別スレッドで行う
+    Args:
+        level (str): ルートロガーのログレベル
+        log_file (Optional[str]): ログファイルのパス（None の場合は標準出力のみ）
+        max_bytes (int): ログファイルを切り替えるサイズ（バイト）
+        backup_count (int): 残す圧縮済みログファイルの数
+        module_levels (Optional[Dict[str, int]]): ロガー名ごとのログレベル（parse_module_levels の結果）
+    Returns:
+        logging.handlers.QueueListener: 書き込みを行うリスナー
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(GzipRotatingFileHandler(log_file, max_bytes, backup_count))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(_level_of(level))
+    for name, module_level in (module_levels or {}).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    # 終了時（sys.exit を含む）にキューに残ったログを書き出す
+    atexit.unregister(shutdown_logging)
+    atexit.register(shutdown_logging)
+    return _listener
+
+def shutdown_logging() -> None:
+    """キューに残ったログを書き出してリスナーを止め、ハンドラを閉じる"""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    for handler in listener.handlers:
+        handler.close()
@@ -0,0 +1,294 @@
+import argparse
+import html
+import math
+import random
+import threading
+import time
+import logging
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+
+# 合成データのタイトルに使う語句
+_TITLE_WORDS = ('ショート動画', 'リール', 'TikTok', 'YouTube', 'SNS運用', 'データ入力', 'Python',
+                'スクレイピング', 'ライティング', 'LP制作', '動画編集', 'バナー作成')
+_TITLE_SUFFIXES = ('の編集をお願いします', '案件（継続あり）', 'スタッフ募集', 'の作成', '代行')
+
+_SESSION_COOKIE = 'mock_session'
+
+class MockLancersServer:
+    def __init__(self, listings: int = 100, per_page: int = 20, max_pages: Optional[int] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 0, host: str = '127.0.0.1', port: int = 0):
+        """
+        スクレイパーが使うURLとマークアップを再現するローカルのモックサーバーのコンストラクタ
+        案件は件数に関わらず案件IDから決定的に生成するため、10万件でもメモリを消費しない
+        （キーワードでの絞り込みは行わず、全件を検索結果として返す）
+        Args:
+            listings (int): 合成する案件数
+            per_page (int): 1ページあたりの案件数
+            max_pages (Optional[int]): ページ送りの深さの上限（省略時は全件分）
+            latency_ms (float): 各レスポンスに加える遅延（ミリ秒）
+            jitter_ms (float): 遅延に加えるランダムな揺らぎの最大値（ミリ秒）
+            error_rate (float): 503を返す割合（0.0〜1.0）
+            seed (int): 合成データと障害発生の乱数シード
+            host (str): 待ち受けるホスト
+            port (int): 待ち受けるポート（0の場合は空いているポートを使う）
+        """
+        self.listings = listings
+        self.per_page = per_page
+        self.max_pages = max_pages
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.seed = seed
+        self.host = host
+        self.port = port
+        self.stats: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def url(self) -> str:
+        """サーバーのURL（LancersBrowser の base_url に指定する）"""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def total_pages(self) -> int:
+        """検索結果の総ページ数"""
+        pages = max(1, math.ceil(self.listings / self.per_page))
+        return min(pages, self.max_pages) if self.max_pages else pages
+
+    def start(self) -> None:
+        """別スレッドでサーバーを起動する"""
+        server = self
+
+        class Handler(_MockRequestHandler):
+            mock = server
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        self.logger.info(f"モックサーバーを起動しました: {self.url} (案件数: {self.listings}, 総ページ数: {self.total_pages})")
+
+    def stop(self) -> None:
+        """サーバーを停止する"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self): self.start(); return self
+    def __exit__(self, exc_type, exc_val, exc_tb): self.stop()
+
+    def count(self, key: str) -> None:
+        """リクエスト数の統計を更新する"""
+        with self._stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def should_fail(self) -> bool:
+        """今回のリクエストを失敗させるかどうか"""
+        if self.error_rate <= 0:
+            return False
+        with self._stats_lock:
+            return self._random.random() < self.error_rate
+
+    def delay(self) -> None:
+        """設定された遅延を加える"""
+        if self.latency_ms <= 0 and self.jitter_ms <= 0:
+            return
+        with self._stats_lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms > 0 else 0.0
+        time.sleep((self.latency_ms + jitter) / 1000)
+
+    def listing(self, work_id: int, project: bool = False) -> Dict[str, Any]:
+        """
+        案件IDから合成の案件データを生成する（同じIDには常に同じ内容を返す）
+        Args:
+            work_id (int): 案件ID
+            project (bool): プロジェクト案件として生成するかどうか
+        Returns:
+            Dict[str, Any]: 案件データ
+        """
+        rng = random.Random(self.seed * 1_000_003 + work_id)
+        month, day = rng.randint(1, 12), rng.randint(1, 28)
+        return {
+            'work_id': work_id,
+            'title': f"{rng.choice(_TITLE_WORDS)}{rng.choice(_TITLE_SUFFIXES)} #{work_id}",
+            'price': f"{rng.randint(1, 300) * 1000:,}円",
+            'type': 'プロジェクト' if project else rng.choice(('タスク', 'プロジェクト', 'コンペ')),
+            'remaining': f"あと{rng.randint(1, 14)}日",
+            'deadline': f"2025年{month}月{day}日 {rng.randint(0, 23)}:{rng.choice(('00', '30'))}",
+            'delivery': f"2025年{month}月{min(day + rng.randint(1, 10), 28)}日",
+            'people': rng.randint(1, 10),
+        }
+
+    def render_search(self, path: str, query: Dict[str, str]) -> Optional[str]:
+        """検索結果ページのHTML（ページ送りの範囲外の場合はNone）"""
+        page_num = int(query.get('page', '1') or 1)
+        if page_num < 1 or page_num > self.total_pages:
+            return None
+        project = 'project' in query.get('type[]', '')
+        first_id = (page_num - 1) * self.per_page + 1
+        last_id = min(first_id + self.per_page - 1, self.listings)
+        cards = []
+        for work_id in range(first_id, last_id + 1):
+            item = self.listing(work_id, project)
+            cards.append(
+                '<div class="p-search-job-media">'
+                f'<a class="p-search-job-media__title" href="/work/detail/{work_id}">{html.escape(item["title"])}</a>'
+                f'<span class="c-badge__text">{item["type"]}</span>'
+                f'<span class="p-search-job-media__price">{item["price"]}</span>'
+                f'<span class="p-search-job-media__time-remaining">{item["remaining"]}</span>'
+                '<span class="p-search-job-media__time-text">募集中</span>'
+                '</div>'
+            )
+        return _page('仕事一覧', ''.join(cards) + self._render_pager(path, query, page_num))
+
+    def _render_pager(self, path: str, query: Dict[str, str], page_num: int) -> str:
+        def href(num: int) -> str:
+            params = {**query, 'page': str(num)}
+            return html.escape(f"{path}?{urllib.parse.urlencode(params)}")
+
+        # 実サイトと同様に現在ページの前後と最終ページへのリンクだけを表示する
+        numbers = sorted({1, self.total_pages, *range(max(1, page_num - 2), min(self.total_pages, page_num + 2) + 1)})
+        items = [f'<span class="c-pager__item"><a href="{href(num)}">{num}</a></span>' for num in numbers]
+        disabled = ' is-disabled' if page_num >= self.total_pages else ''
+        next_href = href(min(page_num + 1, self.total_pages))
+        items.append(f'<span class="c-pager__item c-pager__item--next{disabled}"><a href="{next_href}">次へ</a></span>')
+        return f'<div class="c-pager">{"".join(items)}</div>'
+
+    def render_detail(self, work_id: int) -> Optional[str]:
+        """案件詳細ページのHTML（存在しない案件の場合はNone）"""
+        if work_id < 1 or work_id > self.listings:
+            return None
+        item = self.listing(work_id)
+        body = (
+            f'<h1 class="c-heading c-heading--lv1">{html.escape(item["title"])}</h1>'
+            '<p class="p-work-detail-schedule">'
+            '<span class="p-work-detail-schedule__item">'
+            '<span class="p-work-detail-schedule__item__title">募集締切</span>'
+            f'<span class="p-work-detail-schedule__text">{item["deadline"]}</span></span>'
+            '<span class="p-work-detail-schedule__item">'
+            '<span class="p-work-detail-schedule__item__title">希望納期</span>'
+            f'<span class="p-work-detail-schedule__text">{item["delivery"]}</span></span>'
+            '</p>'
+            f'<p>{item["price"]} (募集人数 {item["people"]}人)</p>'
+        )
+        return _page(item['title'], body)
+
+def _page(title: str, body: str, logged_in: bool = False) -> str:
+    header = '<a href="/mypage" id="header_mypage_button"><span class="c-header-user-dropdown__user-name">mock</span></a>' if logged_in else ''
+    return (f'<!DOCTYPE html><html lang="ja"><head><meta charset="utf-8"><title>{html.escape(title)} | Lancers</title></head>'
+            f'<body>{header}{body}</body></html>')
+
+_LOGIN_FORM = (
+    '<form method="post" action="/user/login">'
+    '<input type="email" id="UserEmail" name="email">'
+    '<input type="password" id="UserPassword" name="password">'
+    '<button type="submit" id="form_submit">ログイン</button>'
+    '</form>'
+)
+
+class _MockRequestHandler(BaseHTTPRequestHandler):
+    mock: MockLancersServer
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # 負荷試験中のアクセスログは出力しない
+        pass
+
+    def _send(self, status: int, body: str = '', headers: Optional[Dict[str, str]] = None) -> None:
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _logged_in(self) -> bool:
+        return f"{_SESSION_COOKIE}=1" in (self.headers.get('Cookie') or '')
+
+    def do_GET(self):
+        mock = self.mock
+        parsed = urllib.parse.urlsplit(self.path)
+        path = parsed.path.rstrip('/') or '/'
+        query = dict(urllib.parse.parse_qsl(parsed.query, keep_blank_values=True))
+        mock.delay()
+
+        if path in ('/work/search', '/work/search/task/data'):
+            mock.count('search')
+            if mock.should_fail():
+                mock.count('errors')
+                return self._send(503, _page('Service Unavailable', '<p>混み合っています</p>'))
+            page_html = mock.render_search(path, query)
+            return self._send(200, page_html) if page_html else self._send(404, _page('Not Found', ''))
+
+        if path.startswith('/work/detail/'):
+            mock.count('detail')
+            if mock.should_fail():
+                mock.count('errors')
+                return self._send(503, _page('Service Unavailable', '<p>混み合っています</p>'))
+            work_id = path.rsplit('/', 1)[-1]
+            page_html = mock.render_detail(int(work_id)) if work_id.isdigit() else None
+            return self._send(200, page_html) if page_html else self._send(404, _page('Not Found', ''))
+
+        if path == '/user/login':
+            mock.count('login')
+            return self._send(200, _page('ログイン', _LOGIN_FORM))
+
+        if path == '/mypage':
+            mock.count('mypage')
+            if not self._logged_in():
+                return self._send(302, headers={'Location': '/user/login'})
+            return self._send(200, _page('マイページ', '<div class="p-mypage-sidebar__profile__name">mock</div>', logged_in=True))
+
+        self._send(404, _page('Not Found', ''))
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if urllib.parse.urlsplit(self.path).path == '/user/login':
+            self.mock.count('login')
+            return self._send(302, headers={'Location': '/mypage', 'Set-Cookie': f"{_SESSION_COOKIE}=1; Path=/"})
+        self._send(404, _page('Not Found', ''))
+
+def main():
+    """コマンドラインからモックサーバーを起動する"""
+    parser = argparse.ArgumentParser(description='負荷試験用のLancersモックサーバー')
+    parser.add_argument('--listings', type=int, default=1000, help='合成する案件数 (デフォルト: 1000)')
+    parser.add_argument('--per-page', type=int, default=20, help='1ページあたりの案件数 (デフォルト: 20)')
+    parser.add_argument('--max-pages', type=int, default=None, help='ページ送りの深さの上限')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='各レスポンスの遅延（ミリ秒）')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='遅延の揺らぎの最大値（ミリ秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='503を返す割合 (0.0〜1.0)')
+    parser.add_argument('--seed', type=int, default=0, help='乱数シード')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='待ち受けるホスト')
+    parser.add_argument('--port', type=int, default=8765, help='待ち受けるポート (デフォルト: 8765)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = MockLancersServer(
+        listings=args.listings, per_page=args.per_page, max_pages=args.max_pages,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        seed=args.seed, host=args.host, port=args.port
+    )
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.logger.info(f"モックサーバーを停止します。リクエスト統計: {server.stats}")
+        server.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import csv
+import random
+import logging
+from src.scraper.parser import LancersParser
+from src.scraper.batch_parser import ColumnarParser, normalize_csv
+from src.utils.csv_handler import CSVHandler
+
+DEADLINES = ['2025年4月21日 18:17', '2025年04月01日', '締切：2025年12月3日', '2025-04-21', '期限なし', '明日まで', '', None]
+DELIVERY_DATES = ['希望納期：2025年5月16日', '2025年5月6日 9:05', '納期未設定', '', None]
+PEOPLES = ['募集人数 3 人', '(募集人数10人)', '5名', '人数未設定', '', None]
+PRICES = ['10,000円', '5,000円 ~ 10,000円', '1,000円 〜 2,000円 / 件', '報酬未設定', '', None]
+
+def random_rows(count):
+    rng = random.Random(0)
+    return [{
+        'title': f"案件{i}",
+        'url': f"https://www.lancers.jp/work/detail/{i}",
+        'deadline_raw': rng.choice(DEADLINES),
+        'delivery_date_raw': rng.choice(DELIVERY_DATES),
+        'people': rng.choice(PEOPLES),
+        'price': rng.choice(PRICES),
+    } for i in range(count)]
+
+def test_parity_with_scalar_parser():
+    """列単位の正規化が1行ずつのパース結果と一致するテスト"""
+    parser = LancersParser()
+    rows = random_rows(500)
+
+    normalized = ColumnarParser(parser).normalize_rows(rows)
+
+    for row, result in zip(rows, normalized):
+        detail = parser.parse_work_detail({key: value or '' for key, value in row.items()})
+        assert result['deadline_raw'] == detail['deadline_raw']
+        assert result['delivery_date'] == detail['delivery_date']
+        assert result['people'] == detail['people']
+        assert result['price'] == row['price']
+        assert result['delivery_date_raw'] == row['delivery_date_raw'] and result['title'] == row['title']
+
+def test_each_distinct_value_normalized_once():
+    """同じ値は列ごとに1回だけ正規化するテスト"""
+    calls = []
+    columnar = ColumnarParser()
+    values = ['募集人数 3 人'] * 100 + ['5名'] * 50
+
+    result = columnar.normalize_column(values, lambda value: calls.append(value) or value.upper())
+
+    assert sorted(calls) == sorted(set(values))
+    assert len(result) == 150
+    assert columnar.normalize_column([], str) == []
+
+def test_normalized_deadline_is_kept_without_warning(caplog):
+    """正規化済みの締切日はそのまま返し、警告を出さないテスト"""
+    columnar = ColumnarParser()
+    with caplog.at_level(logging.WARNING):
+        assert columnar.normalize_column(['2025-04-21', '2025-04-21 18:17'], columnar.parser.normalize_deadline_raw) == [
+            '2025-04-21', '2025-04-21']
+    assert caplog.records == []
+
+def test_fieldnames():
+    """追加列を元の列の直後に入れ、報酬の列は変更しないテスト"""
+    assert 'price' not in ColumnarParser().rules
+    fieldnames = ['title', 'delivery_date_raw', 'people']
+    assert ColumnarParser().output_fieldnames(fieldnames) == ['title', 'delivery_date_raw', 'delivery_date', 'people']
+
+def test_normalize_csv_in_chunks(tmp_path):
+    """CSVをチャンクごとに読み、正規化した列を書き戻したCSVを出力するテスト"""
+    path = tmp_path / "old.csv"
+    fieldnames = ['title', 'url', 'deadline_raw', 'delivery_date_raw', 'people', 'price']
+    rows = random_rows(25)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    output = tmp_path / "new.csv"
+    assert normalize_csv(CSVHandler(str(tmp_path)), str(path), str(output), chunk_rows=10) == 25
+
+    with open(output, encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        written = list(reader)
+    assert reader.fieldnames == ['title', 'url', 'deadline_raw', 'delivery_date_raw', 'delivery_date', 'people', 'price']
+    expected = ColumnarParser().normalize_rows([{key: value or '' for key, value in row.items()} for row in rows])
+    assert [row['deadline_raw'] for row in written] == [row['deadline_raw'] for row in expected]
+    assert [row['price'] for row in written] == [row['price'] or '' for row in rows]
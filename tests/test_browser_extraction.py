@@ -0,0 +1,222 @@
+import pytest
+import re
+import asyncio
+from src.scraper.browser import LancersBrowser, _TOTAL_PAGES_JS
+
+class FakeElement:
+    """テスト用の要素ハンドル"""
+    def __init__(self, text: str = "", href: str = None, children: dict = None):
+        self.text = text
+        self.href = href
+        self.children = children or {}
+
+    async def query_selector(self, selector):
+        return self.children.get(selector)
+
+    async def text_content(self):
+        return self.text
+
+    async def get_attribute(self, name):
+        return self.href if name == 'href' else None
+
+class FakePage:
+    """テスト用のページ（evaluate の結果と要素一覧を差し替え可能）"""
+    def __init__(self, evaluate_result=None, evaluate_error=None, cards=None):
+        self.evaluate_result = evaluate_result
+        self.evaluate_error = evaluate_error
+        self.cards = cards or []
+        self.evaluate_calls = 0
+
+    async def evaluate(self, script, arg=None):
+        self.evaluate_calls += 1
+        if self.evaluate_error:
+            raise self.evaluate_error
+        return self.evaluate_result
+
+    async def query_selector_all(self, selector):
+        return self.cards if selector == 'div.p-search-job-media' else []
+
+@pytest.fixture
+def browser():
+    """テスト用のブラウザインスタンス"""
+    return LancersBrowser(headless=True)
+
+@pytest.mark.asyncio
+async def test_extract_work_infos_single_evaluate(browser):
+    """1回の evaluate で全カードを抽出するテスト"""
+    browser.page = FakePage(evaluate_result=[
+        {'title': '案件A', 'url': '/work/detail/1', 'price': '1,000円', 'type': 'タスク',
+         'deadline': 'あと3日', 'status': '募集中'},
+        {'title': '案件B', 'url': 'https://www.lancers.jp/work/detail/2', 'price': '報酬未設定',
+         'type': '種別不明', 'deadline': '期限なし', 'status': '状態不明'},
+    ])
+
+    results = await browser._extract_work_infos()
+
+    assert browser.page.evaluate_calls == 1
+    assert [r['url'] for r in results] == [
+        'https://www.lancers.jp/work/detail/1',
+        'https://www.lancers.jp/work/detail/2',
+    ]
+    assert results[0]['title'] == '案件A'
+    assert results[1]['price'] == '報酬未設定'
+
+@pytest.mark.asyncio
+async def test_extract_work_infos_fallback(browser):
+    """evaluate 失敗時に要素ごとの抽出へフォールバックするテスト"""
+    card = FakeElement(children={
+        '.p-search-job-media__title': FakeElement(" 案件C "),
+        'a.p-search-job-media__title': FakeElement(href='/work/detail/3'),
+        '.p-search-job-media__price': FakeElement("5,000円"),
+    })
+    browser.page = FakePage(evaluate_error=RuntimeError("evaluate failed"), cards=[card])
+
+    results = await browser._extract_work_infos()
+
+    assert len(results) == 1
+    assert results[0]['title'] == '案件C'
+    assert results[0]['url'] == 'https://www.lancers.jp/work/detail/3'
+    assert results[0]['type'] == '種別不明'
+    assert results[0]['deadline'] == '期限なし'
+
+class FakeSearchTab:
+    """ページ番号ごとに異なるカードを返すテスト用タブ"""
+    def __init__(self, total_pages: int, cards_per_page: int = 2, empty_pages=()):
+        self.total_pages = total_pages
+        self.cards_per_page = cards_per_page
+        self.empty_pages = set(empty_pages)
+        self.current_page = 1
+        self.closed = False
+
+    async def goto(self, url, wait_until=None):
+        match = re.search(r'[?&]page=(\d+)', url)
+        self.current_page = int(match.group(1)) if match else 1
+
+    async def wait_for_function(self, expression, arg=None, timeout=None, polling=None):
+        # 後ろのページほど早く読み込みが終わるようにして、順序の復元を確認する
+        await asyncio.sleep(0.001 * (10 - self.current_page))
+
+    async def evaluate(self, script, arg=None):
+        if script == _TOTAL_PAGES_JS:
+            return self.total_pages
+        if self.current_page in self.empty_pages:
+            return []
+        return [{'title': f"p{self.current_page}-{i}", 'url': f"/work/detail/{self.current_page}{i}"}
+                for i in range(self.cards_per_page)]
+
+    async def close(self):
+        self.closed = True
+
+class FakeSearchContext:
+    def __init__(self, **tab_options):
+        self.tab_options = tab_options
+        self.tabs = []
+
+    async def new_page(self):
+        tab = FakeSearchTab(**self.tab_options)
+        self.tabs.append(tab)
+        return tab
+
+@pytest.mark.asyncio
+async def test_search_pages_concurrently_keeps_page_order(browser):
+    """2ページ目以降を並列に取得し、ページ順に並べるテスト"""
+    browser.max_pages = 4
+    browser.page = FakeSearchTab(total_pages=10)
+    browser.context = FakeSearchContext(total_pages=10)
+
+    pages = await browser.search_pages_concurrently("https://www.lancers.jp/work/search?keyword=x", concurrency=2)
+
+    assert [page[0]['title'] for page in pages] == ['p1-0', 'p2-0', 'p3-0', 'p4-0']
+    assert len(browser.context.tabs) == 2
+    assert all(tab.closed for tab in browser.context.tabs)
+
+@pytest.mark.asyncio
+async def test_search_pages_concurrently_limits_by_max_items(browser):
+    """最大取得件数から必要なページ数だけ取得するテスト"""
+    browser.page = FakeSearchTab(total_pages=5)
+    browser.context = FakeSearchContext(total_pages=5, empty_pages={3})
+
+    pages = await browser.search_pages_concurrently("https://www.lancers.jp/work/search", max_items=5)
+
+    # 5件には3ページ必要だが、3ページ目が空なので2ページ目までを返す
+    assert len(pages) == 2
+    assert len(browser.context.tabs) == 2
+
+@pytest.mark.asyncio
+async def test_open_tab_shares_context(browser):
+    """新しいタブが同じコンテキストと待機統計を共有するテスト"""
+    browser.page = FakeSearchTab(total_pages=1)
+    browser.context = FakeSearchContext(total_pages=1)
+
+    tab = await browser.open_tab()
+
+    assert tab.page is browser.context.tabs[0]
+    assert tab.page is not browser.page
+    assert tab.context is browser.context
+    assert tab.readiness is browser.readiness
+
+class FakeDetailPage:
+    """詳細ページ用のテスト用ページ"""
+    def __init__(self, evaluate_result=None, evaluate_error=None, title="案件詳細 | Lancers", elements=None):
+        self.evaluate_result = evaluate_result
+        self.evaluate_error = evaluate_error
+        self._title = title
+        self.elements = elements or {}
+        self.evaluate_calls = 0
+
+    async def goto(self, url, wait_until=None):
+        self.url = url
+
+    async def wait_for_function(self, expression, arg=None, timeout=None, polling=None):
+        return True
+
+    async def evaluate(self, script, arg=None):
+        self.evaluate_calls += 1
+        if self.evaluate_error:
+            raise self.evaluate_error
+        return self.evaluate_result
+
+    async def title(self):
+        return self._title
+
+    async def query_selector(self, selector):
+        return self.elements.get(selector)
+
+    async def query_selector_all(self, selector):
+        return []
+
+@pytest.mark.asyncio
+async def test_get_work_detail_single_evaluate(browser):
+    """1回の evaluate で詳細を抽出し、見つからない項目を空文字にするテスト"""
+    page = FakeDetailPage(evaluate_result={
+        'restricted': False, 'title': '動画編集の依頼', 'deadline_raw': '2025年5月10日 12:00',
+        'delivery_date_raw': None, 'people': '3',
+    })
+
+    detail = await browser.get_work_detail_by_url("https://www.lancers.jp/work/detail/123", page=page)
+
+    assert page.evaluate_calls == 1
+    assert detail == {
+        'title': '動画編集の依頼', 'url': "https://www.lancers.jp/work/detail/123", 'work_id': '123',
+        'deadline_raw': '2025年5月10日 12:00', 'people': '3', 'delivery_date_raw': '',
+    }
+
+@pytest.mark.asyncio
+async def test_get_work_detail_restricted(browser):
+    """閲覧制限のページではNoneを返すテスト"""
+    page = FakeDetailPage(evaluate_result={'restricted': True, 'title': None, 'deadline_raw': None,
+                                           'delivery_date_raw': None, 'people': None})
+
+    assert await browser.get_work_detail_by_url("https://www.lancers.jp/work/detail/1", page=page) is None
+
+@pytest.mark.asyncio
+async def test_get_work_detail_fallback(browser):
+    """evaluate 失敗時に要素ごとの取得へフォールバックするテスト"""
+    page = FakeDetailPage(evaluate_error=RuntimeError("evaluate failed"),
+                          elements={'h1': FakeElement(" 案件D ")})
+
+    detail = await browser.get_work_detail_by_url("https://www.lancers.jp/work/detail/4", page=page)
+
+    assert detail['title'] == '案件D'
+    assert detail['work_id'] == '4'
+    assert detail['people'] == ''
@@ -0,0 +1,52 @@
+import pytest
+import asyncio
+from src.scraper.concurrency_controller import (
+    AimdConcurrencyController, OUTCOME_OK, OUTCOME_ERROR, OUTCOME_RESTRICTED
+)
+
+def test_additive_increase_after_healthy_window():
+    """並列数と同じ件数が正常に終わるごとに1ずつ増え、上限で止まるテスト"""
+    controller = AimdConcurrencyController(initial=2, max_limit=3)
+    for _ in range(2):
+        controller.record(0, 0.5, OUTCOME_OK)
+    assert controller.limit == 3
+    for _ in range(3):
+        controller.record(0, 0.5, OUTCOME_OK)
+    assert controller.limit == 3
+    assert len(controller.decisions) == 1
+
+def test_multiplicative_decrease_once_per_epoch():
+    """エラーで半減し、減らす前に開始した取得のエラーでは重ねて減らさないテスト"""
+    controller = AimdConcurrencyController(initial=8, max_limit=8)
+    controller.record(0, 1.0, OUTCOME_ERROR)
+    controller.record(0, 1.0, OUTCOME_ERROR)
+    assert controller.limit == 4
+    controller.record(1, 1.0, OUTCOME_ERROR)
+    assert controller.limit == 2
+    assert [d['to'] for d in controller.decisions] == [4, 2]
+
+def test_decrease_on_restricted_rate_and_latency():
+    """閲覧制限の割合と平均応答時間のしきい値超過で減らすテスト"""
+    restricted = AimdConcurrencyController(initial=4, max_limit=8)
+    for outcome in (OUTCOME_RESTRICTED, OUTCOME_RESTRICTED, OUTCOME_RESTRICTED, OUTCOME_OK):
+        restricted.record(0, 0.1, outcome)
+    assert restricted.limit == 2
+
+    slow = AimdConcurrencyController(initial=2, max_limit=8, latency_threshold=3.0)
+    slow.record(0, 5.0, OUTCOME_OK)
+    slow.record(0, 4.0, OUTCOME_OK)
+    assert slow.limit == 1
+    assert '平均応答時間' in slow.decisions[0]['reason']
+
+@pytest.mark.asyncio
+async def test_acquire_respects_current_limit():
+    """現在の並列数を超える取得は枠が空くまで待つテスト"""
+    controller = AimdConcurrencyController(initial=1, max_limit=1)
+    epoch = await controller.acquire()
+    waiter = asyncio.ensure_future(controller.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    await controller.release(epoch, 0.1, OUTCOME_OK)
+    await asyncio.wait_for(waiter, 1)
+    assert controller.in_flight == 1
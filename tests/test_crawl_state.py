@@ -0,0 +1,52 @@
+import json
+from src.utils.crawl_state import CrawlState
+
+SEARCH = "https://www.lancers.jp/work/search?keyword=a&sort=started"
+
+def work(work_id):
+    return {'title': f"案件{work_id}", 'url': f"https://www.lancers.jp/work/detail/{work_id}"}
+
+def work_id_of(item):
+    return item['url'].rsplit('/', 1)[-1]
+
+def test_filter_new_excludes_seen_ids(tmp_path):
+    """記録した案件IDを除き、検索ごとに別々に管理するテスト"""
+    state = CrawlState(str(tmp_path / "state.json"))
+    state.mark_seen(SEARCH, ['100', '101'])
+
+    items = [work('102'), work('101'), work('100')]
+    assert state.filter_new(SEARCH, items, work_id_of) == [work('102')]
+    assert state.filter_new("other", items, work_id_of) == items
+    assert state.high_water_mark(SEARCH) == 101
+    assert state.high_water_mark("other") == 0
+
+def test_persists_across_instances(tmp_path):
+    """保存した状態を次回の実行で読み込めるテスト"""
+    path = str(tmp_path / "state" / "state.json")
+    first = CrawlState(path)
+    first.mark_seen(SEARCH, ['5', '', 'abc'])
+    first.save()
+
+    second = CrawlState(path)
+    assert second.is_known(SEARCH, '5')
+    assert not second.is_known(SEARCH, '')
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)[SEARCH]['seen'] == ['5']
+
+def test_keeps_newest_ids_and_high_water_mark(tmp_path):
+    """保持件数を超えた分はIDの小さい順に忘れ、最大IDは保つテスト"""
+    state = CrawlState(str(tmp_path / "state.json"), max_seen=3)
+    state.mark_seen(SEARCH, ['1', '2', '3', '10', '4'])
+
+    assert not state.is_known(SEARCH, '1')
+    assert not state.is_known(SEARCH, '2')
+    assert state.is_known(SEARCH, '10')
+    assert state.high_water_mark(SEARCH) == 10
+
+def test_broken_state_file_starts_fresh(tmp_path):
+    """壊れた状態ファイルは無視して全件取得に戻るテスト"""
+    path = tmp_path / "state.json"
+    path.write_text("{broken", encoding='utf-8')
+
+    state = CrawlState(str(path))
+    assert state.filter_new(SEARCH, [work('1')], work_id_of) == [work('1')]
@@ -0,0 +1,53 @@
+import csv
+from src.utils.csv_handler import CSVHandler
+
+def read_rows(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+def test_stream_rows_visible_before_close(tmp_path):
+    """書き込んだ行が閉じる前からファイルに反映されるテスト"""
+    handler = CSVHandler(str(tmp_path))
+    writer = handler.open_stream("stream.csv", ['title', 'url'])
+
+    assert read_rows(writer.filepath) == []
+    writer.write_rows([{'title': ' 動画\n編集 ', 'url': 'u1', 'extra': 'x'}])
+    assert read_rows(writer.filepath) == [{'title': '動画 編集', 'url': 'u1'}]
+
+    writer.write_rows([{'title': 'B', 'url': 'u2'}])
+    writer.close()
+    assert [row['url'] for row in read_rows(writer.filepath)] == ['u1', 'u2']
+    assert writer.rows_written == 2
+
+def test_stream_path_inside_output_dir(tmp_path):
+    """ファイル名だけを渡した場合は出力ディレクトリ内に作成するテスト"""
+    handler = CSVHandler(str(tmp_path / "out"))
+    with handler.open_stream("a.csv", ['title']) as writer:
+        writer.write_rows([])
+
+    assert writer.filepath == str(tmp_path / "out" / "a.csv")
+    assert read_rows(writer.filepath) == []
+
+def test_iter_csv_chunks_and_header(tmp_path):
+    """入力CSVをチャンクごとに読み、ヘッダーと行数を取得するテスト"""
+    path = tmp_path / "in.csv"
+    path.write_text("title,url\n" + "".join(f"t{i},u{i}\n" for i in range(5)), encoding='utf-8')
+    handler = CSVHandler(str(tmp_path))
+
+    chunks = list(handler.iter_csv_chunks(str(path), 2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[2] == [{'title': 't4', 'url': 'u4'}]
+    assert handler.read_header(str(path)) == ['title', 'url']
+    assert handler.count_rows(str(path)) == 5
+    assert handler.read_header(str(tmp_path / "missing.csv")) == []
+
+def test_stream_sync_after_each_chunk(tmp_path):
+    """チャンクごとに同期しても同じヘッダーのまま追記されるテスト"""
+    handler = CSVHandler(str(tmp_path))
+    with handler.open_stream("details.csv", ['title', 'people']) as writer:
+        for chunk in ([{'title': 'A', 'people': '1'}], [{'title': 'B', 'people': '2'}]):
+            writer.write_rows(chunk)
+            writer.sync()
+
+    with open(writer.filepath, encoding='utf-8') as f:
+        assert f.read().splitlines() == ['title,people', 'A,1', 'B,2']
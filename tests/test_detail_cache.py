@@ -0,0 +1,40 @@
+import pytest
+from src.utils.detail_cache import DetailCache
+
+@pytest.fixture
+def cache(tmp_path):
+    """有効期間1時間・最大3件のキャッシュ"""
+    detail_cache = DetailCache(str(tmp_path / "cache" / "details.sqlite3"), ttl=3600, max_entries=3)
+    yield detail_cache
+    detail_cache.close()
+
+def test_get_within_ttl(cache):
+    """有効期間内は保存した内容を返し、期限切れはNoneになるテスト"""
+    detail = {'title': '動画編集', 'deadline_raw': '2025-05-10', 'people': '3人'}
+    cache.put('123', detail, now=1000.0)
+
+    assert cache.get('123', now=1000.0 + 3599) == detail
+    assert cache.get('123', now=1000.0 + 3601) is None
+    assert cache.get('999', now=1000.0) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_evicts_oldest_entries(cache):
+    """最大件数を超えた分を取得日時の古い順に削除するテスト"""
+    for i in range(5):
+        cache.put(str(i), {'title': f"案件{i}"}, now=1000.0 + i)
+
+    assert len(cache) == 3
+    assert cache.get('0', now=1005.0) is None
+    assert cache.get('4', now=1005.0) == {'title': '案件4'}
+
+def test_persists_across_instances(tmp_path):
+    """別のインスタンス（次回の実行）からも読めるテスト"""
+    path = str(tmp_path / "details.sqlite3")
+    first = DetailCache(path)
+    first.put_many([('1', {'title': 'A'}), ('', {'title': 'IDなし'})])
+    first.close()
+
+    second = DetailCache(path)
+    assert second.get('1') == {'title': 'A'}
+    assert len(second) == 1
+    second.close()
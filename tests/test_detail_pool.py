@@ -0,0 +1,99 @@
+import pytest
+import asyncio
+from src.scraper.detail_pool import DetailWorkerPool
+from src.scraper.concurrency_controller import AimdConcurrencyController
+
+class FakePage:
+    def __init__(self, name: str):
+        self.name = name
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+class FakeContext:
+    def __init__(self):
+        self.created = []
+
+    async def new_page(self):
+        page = FakePage(f"page-{len(self.created) + 1}")
+        self.created.append(page)
+        return page
+
+class FakeBrowser:
+    """詳細取得の呼び出しを記録するテスト用ブラウザ"""
+    def __init__(self, fail_urls=()):
+        self.page = FakePage("main")
+        self.context = FakeContext()
+        self.fail_urls = set(fail_urls)
+        self.active = 0
+        self.max_active = 0
+
+    async def get_work_detail_by_url(self, url, page=None):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            # 後ろのURLほど早く終わるようにして、順序の復元を確認する
+            await asyncio.sleep(0.01 * (10 - int(url.rsplit('/', 1)[-1])))
+            if url in self.fail_urls:
+                raise RuntimeError("navigation failed")
+            return {'url': url, 'page': page.name}
+        finally:
+            self.active -= 1
+
+@pytest.mark.asyncio
+async def test_fetch_all_preserves_input_order():
+    """並列取得の結果が入力順に並ぶことのテスト"""
+    browser = FakeBrowser()
+    urls = [f"https://www.lancers.jp/work/detail/{i}" for i in range(6)]
+
+    async with DetailWorkerPool(browser, concurrency=3) as pool:
+        results = await pool.fetch_all(urls)
+
+    assert [r['url'] for r in results] == urls
+    assert browser.max_active == 3
+    assert len(browser.context.created) == 2
+    assert all(page.closed for page in browser.context.created)
+    assert browser.page.closed is False
+
+@pytest.mark.asyncio
+async def test_fetch_all_skips_empty_and_failed_urls():
+    """URLなし・取得失敗の行が None になるテスト"""
+    browser = FakeBrowser(fail_urls={"https://www.lancers.jp/work/detail/2"})
+    urls = ["https://www.lancers.jp/work/detail/1", None, "https://www.lancers.jp/work/detail/2"]
+
+    async with DetailWorkerPool(browser, concurrency=2) as pool:
+        results = await pool.fetch_all(urls)
+
+    assert results[0]['url'] == urls[0]
+    assert results[1] is None
+    assert results[2] is None
+
+@pytest.mark.asyncio
+async def test_fetch_all_reports_each_result_on_completion():
+    """1件取得するごとに on_result が完了順に呼ばれるテスト"""
+    browser = FakeBrowser(fail_urls={"https://www.lancers.jp/work/detail/9"})
+    urls = ["https://www.lancers.jp/work/detail/1", None, "https://www.lancers.jp/work/detail/9"]
+    reported = []
+
+    async with DetailWorkerPool(browser, concurrency=2) as pool:
+        await pool.fetch_all(urls, on_result=lambda index, detail: reported.append((index, detail is not None)))
+
+    # detail/9 の方が早く終わる
+    assert reported == [(2, False), (0, True)]
+
+@pytest.mark.asyncio
+async def test_fetch_all_with_adaptive_controller():
+    """並列数の制御を使う場合、現在の並列数を超えて同時に取得しないテスト"""
+    browser = FakeBrowser(fail_urls={"https://www.lancers.jp/work/detail/0"})
+    controller = AimdConcurrencyController(initial=1, max_limit=4)
+    urls = [f"https://www.lancers.jp/work/detail/{i}" for i in range(6)]
+
+    async with DetailWorkerPool(browser, controller=controller) as pool:
+        assert len(pool.pages) == 4
+        results = await pool.fetch_all(urls)
+
+    assert results[0] is None
+    assert [r['url'] for r in results[1:]] == urls[1:]
+    assert controller.outcome_counts == {'error': 1, 'ok': 5}
+    assert browser.max_active <= max(d['to'] for d in controller.decisions)
@@ -0,0 +1,124 @@
+import pytest
+import asyncio
+from src.scraper.detail_pool import DetailWorkerPool
+from src.scraper.discovery_pipeline import SearchDetailPipeline
+
+class FakePage:
+    def __init__(self, name: str):
+        self.name = name
+
+    async def close(self):
+        pass
+
+class FakeContext:
+    async def new_page(self):
+        return FakePage("worker")
+
+class FakeBrowser:
+    """詳細取得の開始時刻を記録するテスト用ブラウザ"""
+    def __init__(self, fail_ids=()):
+        self.page = FakePage("main")
+        self.context = FakeContext()
+        self.fail_ids = set(fail_ids)
+        self.events = []
+
+    async def get_work_detail_by_url(self, url, page=None):
+        work_id = url.rsplit('/', 1)[-1]
+        self.events.append(('detail', work_id))
+        await asyncio.sleep(0.01)
+        if work_id in self.fail_ids:
+            return None
+        return {'url': url, 'title': f"詳細{work_id}", 'deadline_raw': '2025年5月10日', 'people': '3人'}
+
+class FakeParser:
+    def parse_work_detail(self, detail):
+        return {'title': detail['title'], 'url': detail['url'], 'work_id': '', 'deadline_raw': '2025-05-10',
+                'people': detail['people']}
+
+class FakeCache:
+    def __init__(self, cached):
+        self.cached = dict(cached)
+        self.saved = {}
+
+    def get(self, work_id):
+        return self.cached.get(work_id)
+
+    def put(self, work_id, detail):
+        self.saved[work_id] = detail
+
+def row(work_id):
+    return {'title': f"検索{work_id}", 'url': f"https://www.lancers.jp/work/detail/{work_id}", 'work_id': work_id}
+
+async def search_pages(browser, pages):
+    for page in pages:
+        browser.events.append(('page', None))
+        await asyncio.sleep(0)
+        yield page
+
+@pytest.mark.asyncio
+async def test_details_start_before_search_finishes():
+    """検索の途中から詳細取得が始まり、重複とURLの無い行を除いて全件出力されるテスト"""
+    browser = FakeBrowser()
+    pool = DetailWorkerPool(browser, concurrency=2)
+    pipeline = SearchDetailPipeline(pool, FakeParser(), queue_size=1)
+    rows = []
+
+    pages = [[row('1'), row('2')], [row('2'), row('3'), {'title': "IDもURLも無い行"}, {'work_id': '5'}], [row('4')]]
+    await pipeline.run(search_pages(browser, pages), rows.append)
+
+    assert sorted(r['work_id'] for r in rows) == ['1', '2', '3', '4']
+    assert all(r['title'].startswith("詳細") and r['deadline_raw'] == '2025-05-10' for r in rows)
+    # 最後のページを読む前に詳細取得が始まっている
+    last_page = max(i for i, event in enumerate(browser.events) if event[0] == 'page')
+    assert browser.events.index(('detail', '1')) < last_page
+    assert (pipeline.discovered, pipeline.duplicates, pipeline.skipped, pipeline.fetched) == (4, 1, 2, 4)
+
+@pytest.mark.asyncio
+async def test_uses_cache_and_keeps_failed_rows():
+    """キャッシュ済みの案件は取得せず、取得に失敗した案件は検索結果のまま出力するテスト"""
+    browser = FakeBrowser(fail_ids={'3'})
+    cache = FakeCache({'1': {'deadline_raw': '2025-01-01', 'people': '1人'}})
+    pipeline = SearchDetailPipeline(DetailWorkerPool(browser, concurrency=1), FakeParser(), detail_cache=cache)
+    rows = {}
+
+    await pipeline.run(search_pages(browser, [[row('1'), row('2'), row('3')]]), lambda r: rows.update({r['work_id']: r}))
+
+    assert ('detail', '1') not in browser.events
+    assert rows['1']['deadline_raw'] == '2025-01-01' and rows['1']['title'] == "検索1"
+    assert rows['3'] == row('3')
+    assert set(cache.saved) == {'2'}
+    assert (pipeline.cache_hits, pipeline.fetched, pipeline.failed) == (1, 1, 1)
+
+@pytest.mark.asyncio
+async def test_search_error_after_queued_details():
+    """検索が途中で失敗しても、キューに入った案件を取得してからエラーを伝えるテスト"""
+    browser = FakeBrowser()
+    pipeline = SearchDetailPipeline(DetailWorkerPool(browser, concurrency=2), FakeParser())
+    rows = []
+
+    async def failing_pages():
+        yield [row('1'), row('2')]
+        raise RuntimeError("search failed")
+
+    with pytest.raises(RuntimeError):
+        await pipeline.run(failing_pages(), rows.append)
+    assert sorted(r['work_id'] for r in rows) == ['1', '2']
+
+@pytest.mark.asyncio
+async def test_detail_error_stops_search():
+    """詳細取得側でエラーが起きた場合、キューが一杯でも検索のタスクを残さずにエラーを伝えるテスト"""
+    browser = FakeBrowser()
+    pipeline = SearchDetailPipeline(DetailWorkerPool(browser, concurrency=2), FakeParser(), queue_size=1)
+
+    async def endless_pages():
+        work_id = 0
+        while True:
+            work_id += 1
+            yield [row(str(work_id))]
+
+    def failing_row(_):
+        raise RuntimeError("save failed")
+
+    with pytest.raises(RuntimeError):
+        await asyncio.wait_for(pipeline.run(endless_pages(), failing_row), timeout=5)
+    assert asyncio.all_tasks() == {asyncio.current_task()}
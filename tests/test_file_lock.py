@@ -0,0 +1,34 @@
+import io
+from src.scraper import file_lock
+
+class FakeMsvcrt:
+    """指定回数だけロック済み（OSError）として振る舞うテスト用の msvcrt"""
+    LK_NBLCK = 2
+    LK_UNLCK = 0
+
+    def __init__(self, busy: int):
+        self.busy = busy
+        self.calls = []
+
+    def locking(self, fd, mode, nbytes):
+        self.calls.append(mode)
+        if mode == self.LK_NBLCK and self.busy:
+            self.busy -= 1
+            raise OSError("locked")
+
+class FakeFile(io.BytesIO):
+    def fileno(self):
+        return 3
+
+def test_windows_lock_waits_until_released(monkeypatch):
+    """Windows では他のプロセスがロックを解除するまで OSError を出さずに再試行するテスト"""
+    fake = FakeMsvcrt(busy=300)
+    monkeypatch.setattr(file_lock, 'fcntl', None)
+    monkeypatch.setattr(file_lock, 'msvcrt', fake, raising=False)
+    monkeypatch.setattr(file_lock.time, 'sleep', lambda seconds: None)
+
+    f = FakeFile()
+    file_lock.lock_file(f)
+    file_lock.unlock_file(f)
+
+    assert fake.calls == [FakeMsvcrt.LK_NBLCK] * 301 + [FakeMsvcrt.LK_UNLCK]
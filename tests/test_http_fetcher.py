@@ -0,0 +1,185 @@
+import pytest
+from src.scraper.html_extractor import extract_work_cards, extract_work_detail, is_login_wall
+from src.scraper.http_fetcher import LancersHttpFetcher
+
+SEARCH_HTML = """
+<html><body>
+<div class="p-search-job-media">
+  <a class="p-search-job-media__title c-media__title" href="/work/detail/111">
+    <span>Python</span> スクレイピング
+  </a>
+  <span class="p-search-job-media__price">5,000円</span>
+  <span class="c-badge"><span class="c-badge__text">プロジェクト</span></span>
+  <span class="p-search-job-media__time-remaining">あと3日</span>
+  <span class="p-search-job-media__time-text">募集中</span>
+  <img src="/img/a.png">
+</div>
+<div class="p-search-job-media">
+  <a class="p-search-job-media__title" href="https://www.lancers.jp/work/detail/222">データ入力</a>
+</div>
+</body></html>
+"""
+
+DETAIL_HTML = """
+<html><head><title>データ入力 | ランサーズ</title></head><body>
+<h1 class="c-heading c-heading--lv1">データ入力の案件</h1>
+<p class="p-work-detail-schedule">
+  <span class="p-work-detail-schedule__item">
+    <span class="p-work-detail-schedule__item__title">募集締切</span>
+    <span class="p-work-detail-schedule__text">2025年4月21日 18:17</span>
+  </span>
+  <span class="p-work-detail-schedule__item">
+    <span class="p-work-detail-schedule__item__title">希望納期</span>
+    <span class="p-work-detail-schedule__text">2025年5月16日</span>
+  </span>
+</p>
+<p>(募集人数 3 人)</p>
+</body></html>
+"""
+
+def test_extract_work_cards_order_and_broken_markup():
+    """div.p-search-job-media のカードを先に並べ、閉じ忘れのタグやスクリプトがあっても抽出できるテスト"""
+    html = (
+        '<div data-external-modal="1"><a class="p-search-job-media__title" href="/work/detail/3">C</a></div>'
+        '<div class="p-search-job-media"><script>var x = "<b>";</script>'
+        '<a class="p-search-job-media__title" href="/work/detail/1"><b>A</a>'
+        '<span class="p-search-job-media__price">1,000円</div>'
+        '<div class="p-search-job-media"><a class="p-search-job-media__title" href="/work/detail/2">B</a>'
+    )
+    cards = extract_work_cards(html)
+    assert [(card['title'], card['url']) for card in cards] == [
+        ("A", "/work/detail/1"), ("B", "/work/detail/2"), ("C", "/work/detail/3")]
+    assert cards[0]['price'] == "1,000円"
+    assert cards[1]['price'] == "報酬未設定"
+
+def test_extract_work_cards_matches_browser_defaults():
+    """案件カードの抽出結果がブラウザ側と同じ既定値になるテスト"""
+    cards = extract_work_cards(SEARCH_HTML)
+    assert len(cards) == 2
+    assert cards[0]['title'] == "Python スクレイピング"
+    assert cards[0]['url'] == '/work/detail/111'
+    assert cards[0]['price'] == '5,000円'
+    assert cards[0]['type'] == 'プロジェクト'
+    assert cards[0]['status'] == '募集中'
+    assert cards[1]['price'] == '報酬未設定'
+    assert cards[1]['deadline'] == '期限なし'
+
+def test_extract_work_detail():
+    """案件詳細ページの抽出テスト"""
+    detail = extract_work_detail(DETAIL_HTML, "https://www.lancers.jp/work/detail/222")
+    assert detail['title'] == "データ入力の案件"
+    assert detail['work_id'] == "222"
+    assert detail['deadline_raw'] == "2025年4月21日 18:17"
+    assert detail['delivery_date_raw'] == "2025年5月16日"
+    assert detail['people'] == "3"
+
+def test_extract_work_detail_restricted():
+    """閲覧制限ページでは None を返すテスト"""
+    html = "<html><head><title>閲覧制限 | ランサーズ</title></head><body><h1>x</h1></body></html>"
+    assert extract_work_detail(html, "https://www.lancers.jp/work/detail/1") is None
+
+def test_login_wall_detection():
+    """ログイン画面の検出テスト"""
+    assert is_login_wall('<input id="UserEmail"><input id="UserPassword">')
+    assert not is_login_wall(DETAIL_HTML)
+
+class FakeBrowser:
+    def __init__(self):
+        self.detail_calls = []
+
+    def to_full_url(self, url):
+        return url if url.startswith("http") else f"https://www.lancers.jp{url}"
+
+    async def get_work_detail_by_url(self, url, page=None):
+        self.detail_calls.append((url, page))
+        return {'title': 'ブラウザで取得', 'url': url}
+
+@pytest.mark.asyncio
+async def test_fetcher_uses_http_result():
+    """HTTPで取得できた場合はブラウザを使わないテスト"""
+    browser = FakeBrowser()
+    fetcher = LancersHttpFetcher(browser)
+
+    async def fake_fetch(url):
+        return SEARCH_HTML if 'search' in url else DETAIL_HTML
+    fetcher.fetch_html = fake_fetch
+
+    cards = await fetcher.search_page("https://www.lancers.jp/work/search?keyword=x", 2)
+    detail = await fetcher.get_work_detail_by_url("https://www.lancers.jp/work/detail/222")
+
+    assert cards[0]['url'] == "https://www.lancers.jp/work/detail/111"
+    assert detail['deadline_raw'] == "2025年4月21日 18:17"
+    assert browser.detail_calls == []
+    assert fetcher.browser_fallbacks == 0
+
+@pytest.mark.asyncio
+async def test_fetcher_falls_back_to_browser():
+    """見出しが無い（JS描画）ページではブラウザで取得し直すテスト"""
+    browser = FakeBrowser()
+    fetcher = LancersHttpFetcher(browser)
+
+    async def fake_fetch(url):
+        return "<html><body><div id='app'></div></body></html>"
+    fetcher.fetch_html = fake_fetch
+
+    detail = await fetcher.get_work_detail_by_url("https://www.lancers.jp/work/detail/9", page="tab-1")
+
+    assert detail['title'] == 'ブラウザで取得'
+    assert browser.detail_calls == [("https://www.lancers.jp/work/detail/9", "tab-1")]
+    assert fetcher.browser_fallbacks == 1
+
+class FakeResponse:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = FakeHeaders(headers or {})
+
+class FakeHeaders(dict):
+    def getlist(self, name):
+        value = self.get(name)
+        return [value] if value else []
+
+class FakePoolManager:
+    """送信した Cookie ヘッダーを記録し、決まったレスポンスを順に返すテスト用接続プール"""
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, headers=None, timeout=None, redirect=True):
+        self.requests.append((url, (headers or {}).get('Cookie')))
+        return self.responses.pop(0)
+
+def test_cookies_filtered_by_domain_path_secure_and_expiry():
+    """ドメイン・パス・secure・有効期限が一致するクッキーだけを送るテスト"""
+    fetcher = LancersHttpFetcher(FakeBrowser(), cookies=[
+        {'name': 'session', 'value': 'abc', 'domain': '.lancers.jp', 'path': '/', 'expires': -1},
+        {'name': 'other', 'value': 'x', 'domain': 'example.com', 'path': '/', 'expires': -1},
+        {'name': 'mypage_only', 'value': 'm', 'domain': '.lancers.jp', 'path': '/mypage', 'expires': -1},
+        {'name': 'https_only', 'value': 's', 'domain': '.lancers.jp', 'path': '/', 'expires': -1, 'secure': True},
+        {'name': 'expired', 'value': 'e', 'domain': '.lancers.jp', 'path': '/', 'expires': 1},
+    ])
+    fetcher.http = FakePoolManager([FakeResponse(200), FakeResponse(200)])
+
+    fetcher._get("https://www.lancers.jp/work/detail/1")
+    fetcher._get("http://www.lancers.jp/mypage")
+
+    assert fetcher.http.requests == [
+        ("https://www.lancers.jp/work/detail/1", "session=abc; https_only=s"),
+        ("http://www.lancers.jp/mypage", "mypage_only=m; session=abc"),
+    ]
+
+def test_set_cookie_from_redirect_is_applied():
+    """リダイレクトのレスポンスの Set-Cookie を保存し、次のリクエストから送るテスト"""
+    fetcher = LancersHttpFetcher(FakeBrowser())
+    fetcher.http = FakePoolManager([
+        FakeResponse(302, {'Location': '/mypage', 'Set-Cookie': 'refreshed=1; Path=/'}),
+        FakeResponse(200),
+    ])
+
+    response, final_url = fetcher._get("https://www.lancers.jp/work/detail/1")
+
+    assert response.status == 200
+    assert final_url == "https://www.lancers.jp/mypage"
+    assert fetcher.http.requests == [
+        ("https://www.lancers.jp/work/detail/1", None),
+        ("https://www.lancers.jp/mypage", "refreshed=1"),
+    ]
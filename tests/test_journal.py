@@ -0,0 +1,59 @@
+import os
+from src.utils.journal import ScrapeJournal
+
+URL = "https://www.lancers.jp/work/detail/1"
+
+def test_resume_reads_records_and_ignores_torn_line(tmp_path):
+    """記録した結果を再開時に読み込み、途中で途切れた行は無視するテスト"""
+    path = str(tmp_path / "journal" / "in.jsonl")
+    journal = ScrapeJournal(path)
+    journal.open()
+    journal.append(0, URL, {'title': '動画編集', 'people': '3'}, True)
+    journal.append(2, "https://www.lancers.jp/work/detail/3", {'title': 'B'}, False)
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"index": 3, "url": "https://www.lan')
+
+    records = ScrapeJournal(path).load()
+    assert set(records) == {(0, URL), (2, "https://www.lancers.jp/work/detail/3")}
+    assert records[(0, URL)]['row'] == {'title': '動画編集', 'people': '3'}
+    assert records[(2, "https://www.lancers.jp/work/detail/3")]['ok'] is False
+
+def test_open_without_resume_starts_fresh(tmp_path):
+    """再開しない場合は前回の記録を空にし、再開する場合は追記するテスト"""
+    path = str(tmp_path / "in.jsonl")
+    first = ScrapeJournal(path)
+    first.open()
+    first.append(0, URL, {}, True)
+    first.close()
+
+    resumed = ScrapeJournal(path)
+    resumed.open(resume=True)
+    resumed.append(1, URL, {}, True)
+    resumed.close()
+    assert len(ScrapeJournal(path).load()) == 2
+
+    fresh = ScrapeJournal(path)
+    fresh.open()
+    fresh.close()
+    assert ScrapeJournal(path).load() == {}
+
+def test_syncs_in_batches(tmp_path, monkeypatch):
+    """ディスクへの同期を件数ごとにまとめて行うテスト"""
+    synced = []
+    monkeypatch.setattr(os, 'fsync', lambda fd: synced.append(fd))
+    journal = ScrapeJournal(str(tmp_path / "in.jsonl"), batch_size=3, sync_interval=3600)
+    journal.open()
+    for i in range(7):
+        journal.append(i, URL, {}, True)
+    assert len(synced) == 2
+    journal.close()
+    assert len(synced) == 3
+
+def test_path_for_and_remove(tmp_path):
+    """入力CSVごとのパスと、完了後の削除のテスト"""
+    assert ScrapeJournal.path_for("data/output/jobs.csv", str(tmp_path)) == str(tmp_path / "jobs.jsonl")
+    journal = ScrapeJournal(str(tmp_path / "jobs.jsonl"))
+    journal.open()
+    journal.remove()
+    assert not os.path.exists(journal.path)
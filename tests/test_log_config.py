@@ -0,0 +1,62 @@
+import gzip
+import logging
+import logging.handlers
+import threading
+import pytest
+from src.utils.log_config import setup_logging, shutdown_logging, parse_module_levels, GzipRotatingFileHandler
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+def test_writes_on_background_thread(tmp_path, restore_root_logger):
+    """ログを出したスレッドではキューに入れるだけで、ファイルへの書き込みは別スレッドで行うテスト"""
+    log_file = tmp_path / "logs" / "scraping.log"
+    listener = setup_logging('INFO', str(log_file), module_levels={'test.noisy': logging.WARNING})
+    writer_threads = []
+    file_handler = listener.handlers[1]
+    original_emit = file_handler.emit
+    file_handler.emit = lambda record: (writer_threads.append(threading.current_thread()), original_emit(record))
+
+    assert setup_logging('DEBUG', str(tmp_path / "other.log")) is listener
+    assert isinstance(logging.getLogger().handlers[0], logging.handlers.QueueHandler)
+    logging.getLogger('test.app').info("件数 %d", 3)
+    logging.getLogger('test.app').debug("出力されない")
+    logging.getLogger('test.noisy').info("出力されない")
+    shutdown_logging()
+
+    text = log_file.read_text(encoding='utf-8')
+    assert "test.app - INFO - 件数 3" in text
+    assert "出力されない" not in text
+    assert writer_threads and threading.main_thread() not in writer_threads
+    assert not (tmp_path / "other.log").exists()
+
+def test_rotation_compresses_old_files(tmp_path):
+    """サイズを超えたら切り替え、古いファイルを gzip 圧縮して残すテスト"""
+    log_file = tmp_path / "scraping.log"
+    handler = GzipRotatingFileHandler(str(log_file), max_bytes=200, backup_count=2)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    for i in range(30):
+        handler.emit(logging.makeLogRecord({'msg': f"行 {i:02d} " + "x" * 40}))
+    handler.close()
+
+    backups = sorted(path.name for path in tmp_path.iterdir() if path.name.endswith('.gz'))
+    assert backups == ["scraping.log.1.gz", "scraping.log.2.gz"]
+    with gzip.open(tmp_path / "scraping.log.1.gz", 'rt', encoding='utf-8') as f:
+        assert f.read().startswith("行 ")
+    assert log_file.stat().st_size <= 200
+
+def test_parse_module_levels():
+    """モジュールごとのログレベル指定の解析テスト"""
+    assert parse_module_levels("scraper.browser=debug, scraper.parser=WARNING") == {
+        'scraper.browser': logging.DEBUG, 'scraper.parser': logging.WARNING}
+    assert parse_module_levels(None) == {}
+    with pytest.raises(ValueError):
+        parse_module_levels("scraper.browser")
+    with pytest.raises(ValueError):
+        parse_module_levels("scraper.browser=LOUD")
@@ -0,0 +1,100 @@
+import pytest
+import urllib.error
+import urllib.request
+from src.utils.mock_lancers_server import MockLancersServer
+from src.scraper.browser import LancersBrowser
+from src.scraper.html_extractor import extract_work_cards, extract_work_detail
+from src.scraper.http_fetcher import LancersHttpFetcher
+from src.scraper.session_store import SessionStore
+
+def _get(url: str) -> str:
+    with urllib.request.urlopen(url) as response:
+        return response.read().decode('utf-8')
+
+@pytest.fixture
+def server():
+    """45件・1ページ20件のモックサーバー"""
+    with MockLancersServer(listings=45, per_page=20) as mock:
+        yield mock
+
+def test_search_pages_match_selectors(server):
+    """検索結果ページが案件カードのセレクタで抽出でき、最終ページは端数になるテスト"""
+    browser = LancersBrowser(base_url=server.url)
+    url = browser.build_search_url("ショート")
+    assert url.startswith(server.url + "/work/search?")
+
+    first = extract_work_cards(_get(url))
+    last = extract_work_cards(_get(url + "&page=3"))
+
+    assert len(first) == 20
+    assert first[0]['url'] == '/work/detail/1'
+    assert first[0]['price'].endswith('円')
+    assert len(last) == 5
+    assert 'c-pager__item--next is-disabled' in _get(url + "&page=3")
+
+def test_detail_page_matches_extractor(server):
+    """詳細ページから締切・納期・募集人数が抽出できるテスト"""
+    url = f"{server.url}/work/detail/7"
+    detail = extract_work_detail(_get(url), url)
+
+    assert detail['title'] == server.listing(7)['title']
+    assert detail['work_id'] == '7'
+    assert '年' in detail['deadline_raw'] and '年' in detail['delivery_date_raw']
+    assert detail['people'] == str(server.listing(7)['people'])
+
+def test_error_rate_and_pagination_depth():
+    """エラー率とページ送りの深さの上限が反映されるテスト"""
+    with MockLancersServer(listings=1000, per_page=10, max_pages=3, error_rate=1.0) as mock:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            _get(f"{mock.url}/work/search")
+        assert error.value.code == 503
+        assert mock.total_pages == 3
+        assert mock.stats['errors'] == 1
+
+def test_mypage_requires_login(server):
+    """未ログインではマイページからログインページへリダイレクトされるテスト"""
+    html = _get(f"{server.url}/mypage")
+    assert 'id="UserEmail"' in html
+
+@pytest.mark.asyncio
+async def test_http_fetcher_against_mock(server):
+    """base_url を指定したブラウザで、HTTP取得の結果がモックサーバーのURLになるテスト"""
+    browser = LancersBrowser(base_url=server.url)
+    fetcher = LancersHttpFetcher(browser)
+
+    results = await fetcher.search_page(browser.build_search_url(data_search_project=True), 2)
+    fetcher.close()
+
+    assert len(results) == 20
+    assert results[0]['url'] == f"{server.url}/work/detail/21"
+    assert results[0]['type'] == 'プロジェクト'
+    assert fetcher.browser_fallbacks == 0
+
+@pytest.mark.asyncio
+async def test_http_fetcher_uses_base_url_for_production_urls(server):
+    """本番サイトの案件URLも base_url のモックサーバーからHTTPで取得するテスト"""
+    browser = LancersBrowser(base_url=server.url)
+    fetcher = LancersHttpFetcher(browser)
+
+    detail = await fetcher.get_work_detail_by_url("https://www.lancers.jp/work/detail/3")
+    fetcher.close()
+
+    assert detail['title']
+    assert detail['url'] == "https://www.lancers.jp/work/detail/3"
+    assert fetcher.http_fetches == 1
+    assert fetcher.browser_fallbacks == 0
+
+@pytest.mark.asyncio
+async def test_stored_session_checked_without_browser(server, tmp_path):
+    """保存済みセッションのクッキーで、ブラウザを起動せずにログイン状態を確認できるテスト"""
+    store = SessionStore(str(tmp_path / "state.json"))
+    browser = LancersBrowser(base_url=server.url, session_store=store)
+    assert LancersHttpFetcher.from_session_store(browser) is None
+
+    cookie = {'name': 'mock_session', 'value': '1', 'domain': '127.0.0.1', 'path': '/', 'expires': -1}
+    for value, expected in (('1', True), ('0', False)):
+        store.save({'cookies': [dict(cookie, value=value)], 'origins': []})
+        fetcher = LancersHttpFetcher.from_session_store(browser)
+        assert await fetcher.is_logged_in() is expected
+        fetcher.close()
+    assert browser.browser is None
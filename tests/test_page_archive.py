@@ -0,0 +1,117 @@
+import os
+import asyncio
+import pickle
+import multiprocessing
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from src.scraper import page_archive
+from src.scraper.page_archive import PageArchive, reparse_details
+from src.scraper.parser import LancersParser
+
+DETAIL_HTML = """<html><head><title>案件 | Lancers</title></head><body>
+<h1 class="c-heading--lv1">ショート動画の編集</h1>
+<p class="p-work-detail-schedule"><span class="p-work-detail-schedule__item">
+<span class="p-work-detail-schedule__item__title">募集締切</span>
+<span class="p-work-detail-schedule__text">2025年5月10日 12:00</span></span></p>
+<p>(募集人数 2人)</p></body></html>"""
+
+def save_in_process(archive, url, html):
+    """ワーカープロセスで、受け取ったアーカイブに保存して索引を書き出す"""
+    async def run():
+        archive.save(url, html, fetched_at=300.0)
+        await archive.flush()
+    asyncio.run(run())
+    return archive.saved_pages
+
+@pytest.mark.asyncio
+async def test_save_and_reload(tmp_path):
+    """保存したHTMLを索引から読み出せ、同じ内容は1つの本文にまとめるテスト"""
+    archive = PageArchive(str(tmp_path))
+    archive.save("https://www.lancers.jp/work/detail/1#top", "<html>v1</html>", fetched_at=100.0)
+    archive.save("https://www.lancers.jp/work/detail/2", "<html>v1</html>", fetched_at=101.0)
+    await archive.flush()
+    archive.save("https://www.lancers.jp/work/detail/1", "<html>v2</html>", fetched_at=200.0)
+    await archive.flush()
+
+    reloaded = PageArchive(str(tmp_path))
+    assert reloaded.latest("https://www.lancers.jp/work/detail/1") == "<html>v2</html>"
+    assert reloaded.latest("https://www.lancers.jp/work/detail/2") == "<html>v1</html>"
+    assert [entry[0] for entry in reloaded.urls["https://www.lancers.jp/work/detail/1"]] == [100.0, 200.0]
+    assert len(reloaded.blobs) == 2
+    assert reloaded.latest("https://www.lancers.jp/work/detail/3") is None
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used(tmp_path):
+    """合計サイズの上限を超えると、最後に使われたのが古い本文から削除するテスト"""
+    archive = PageArchive(str(tmp_path), max_bytes=1)
+    archive.save("https://www.lancers.jp/work/detail/1", "<html>1</html>")
+    await archive.flush()
+    archive.save("https://www.lancers.jp/work/detail/2", "<html>2</html>")
+    await archive.flush()
+
+    assert archive.latest("https://www.lancers.jp/work/detail/1") is None
+    assert archive.latest("https://www.lancers.jp/work/detail/2") == "<html>2</html>"
+    assert archive.evicted_blobs == 1
+    objects = [name for _, _, names in os.walk(tmp_path / 'objects') for name in names]
+    assert len(objects) == 1
+
+@pytest.mark.asyncio
+async def test_reparse_details(tmp_path):
+    """アーカイブの詳細ページだけを解析し直すテスト"""
+    archive = PageArchive(str(tmp_path))
+    archive.save("https://www.lancers.jp/work/detail/55", DETAIL_HTML)
+    archive.save("https://www.lancers.jp/work/search?keyword=x", "<html></html>")
+    await archive.flush()
+
+    details = reparse_details(archive, LancersParser())
+
+    assert len(details) == 1
+    assert details[0]['title'] == 'ショート動画の編集'
+    assert details[0]['deadline_raw'] == '2025-05-10'
+    assert details[0]['work_id'] == '55'
+
+@pytest.mark.asyncio
+async def test_reparse_updates_last_used(tmp_path, monkeypatch):
+    """解析し直したページの最終使用日時が、書き出した索引に反映されるテスト"""
+    archive = PageArchive(str(tmp_path))
+    archive.save("https://www.lancers.jp/work/detail/55", DETAIL_HTML)
+    await archive.flush()
+    written_at = max(used_at for _, used_at in archive.blobs.values())
+
+    monkeypatch.setattr(page_archive.time, 'time', lambda: written_at + 3600)
+    reloaded = PageArchive(str(tmp_path))
+    reparse_details(reloaded, LancersParser())
+    await reloaded.flush()
+
+    assert [used_at for _, used_at in PageArchive(str(tmp_path)).blobs.values()] == [written_at + 3600]
+
+@pytest.mark.asyncio
+async def test_pickled_archive_is_rebuilt(tmp_path):
+    """pickle すると保存先と上限だけを渡し、受け取った側で作り直すテスト"""
+    archive = PageArchive(str(tmp_path), max_bytes=1234)
+    archive.save("https://www.lancers.jp/work/detail/1", "<html>1</html>")
+    await archive.flush()
+
+    copy = pickle.loads(pickle.dumps(archive))
+
+    assert (copy.directory, copy.max_bytes) == (str(tmp_path), 1234)
+    assert copy.saved_pages == 0
+    assert copy.latest("https://www.lancers.jp/work/detail/1") == "<html>1</html>"
+
+@pytest.mark.asyncio
+async def test_index_merged_across_processes(tmp_path):
+    """別のプロセスが同じアーカイブに保存しても、索引を書き出す時に統合して両方を残すテスト"""
+    archive = PageArchive(str(tmp_path))
+    archive.save("https://www.lancers.jp/work/detail/1", "<html>parent</html>", fetched_at=100.0)
+    await archive.flush()
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        saved = executor.submit(save_in_process, archive, "https://www.lancers.jp/work/detail/2", "<html>child</html>").result()
+    archive.save("https://www.lancers.jp/work/detail/1", "<html>parent v2</html>", fetched_at=400.0)
+    await archive.flush()
+
+    assert saved == 1
+    reloaded = PageArchive(str(tmp_path))
+    assert reloaded.latest("https://www.lancers.jp/work/detail/1") == "<html>parent v2</html>"
+    assert reloaded.latest("https://www.lancers.jp/work/detail/2") == "<html>child</html>"
+    assert len(reloaded.blobs) == 3
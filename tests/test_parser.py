@@ -1,6 +1,6 @@
 import pytest
 from datetime import datetime
-from src.scraper.parser import LancersParser
+from src.scraper.parser import LancersParser, tokenize_date, normalize_people
 
 @pytest.fixture
 def parser():
@@ -140,4 +140,38 @@ def test_parse_results_error_handling(parser):
 def test_parse_results_empty_input(parser):
     """空の入力に対する処理テスト"""
     assert parser.parse_results([]) == []
-    assert parser.parse_results(None) == [] 
\ No newline at end of file
+    assert parser.parse_results(None) == []
+
+
+def test_tokenize_date():
+    """日付文字列を1回で年月日・時刻に分解するテスト"""
+    assert tokenize_date("2025年4月1日 9:05") == ('2025', '04', '01', ('09', '05'))
+    assert tokenize_date("締切2025年12月31日") == ('2025', '12', '31', None)
+    assert tokenize_date("2025/04/21") is None
+
+
+def test_parse_work_details_batch(parser):
+    """まとめてパースした結果が1件ずつパースした結果と一致するテスト"""
+    details = [
+        {'title': 'A', 'url': 'u1', 'deadline_raw': '2025年4月21日 18:17', 'people': '(募集人数1人)',
+         'delivery_date_raw': '2025年5月16日'},
+        {'title': 'B', 'url': 'u2', 'deadline_raw': '期限なし', 'people': '複数名', 'delivery_date_raw': ''},
+    ]
+
+    batch = parser.parse_work_details(details)
+    single = [parser.parse_work_detail(detail) for detail in details]
+    for parsed in batch + single:
+        parsed.pop('scraped_at')
+    assert batch == single
+    assert batch[0]['deadline_raw'] == '2025-04-21'
+    assert batch[0]['deadline'] == '2025-04-21 18:17'
+    assert batch[0]['people'] == '1'
+    assert batch[1]['deadline_raw'] == '期限なし'
+
+
+def test_normalization_is_memoized(parser):
+    """同じ文字列の正規化はキャッシュから返るテスト"""
+    normalize_people.cache_clear()
+    for _ in range(3):
+        assert parser.parse_people("募集人数 4 人") == "4"
+    assert normalize_people.cache_info().hits == 2
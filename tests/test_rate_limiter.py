@@ -0,0 +1,38 @@
+import pytest
+from multiprocessing import get_context
+from src.scraper.rate_limiter import TokenBucketRateLimiter
+
+def test_burst_then_rate():
+    """バースト分は待たずに取得でき、それ以降は補充速度に従って待ち時間が伸びるテスト"""
+    limiter = TokenBucketRateLimiter(rate=2.0, burst=3)
+    bucket = {}
+    waits = [limiter._take(bucket, 100.0) for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.5)
+    assert waits[4] == pytest.approx(1.0)
+    # 十分な時間が経てばバースト容量まで補充される（容量は超えない）
+    assert limiter._take(bucket, 200.0) == 0.0
+    assert bucket['tokens'] == pytest.approx(2.0)
+
+@pytest.mark.asyncio
+async def test_hosts_have_separate_buckets():
+    """ホストごとに別のバケットを使うテスト"""
+    limiter = TokenBucketRateLimiter(rate=1.0, burst=1)
+    assert await limiter.acquire("https://www.lancers.jp/work/search") == 0.0
+    assert await limiter.acquire("http://127.0.0.1:8765/work/search") == 0.0
+    assert limiter.summary()['acquired'] == 2
+
+def _take_in_process(state_path):
+    limiter = TokenBucketRateLimiter(rate=0.001, burst=2, state_path=state_path)
+    return limiter._take_shared("www.lancers.jp")
+
+def test_shared_state_across_processes(tmp_path):
+    """状態ファイルを共有する別プロセス・別インスタンスが同じ予算を使うテスト"""
+    state_path = str(tmp_path / "buckets.json")
+    with get_context('spawn').Pool(2) as pool:
+        waits = pool.map(_take_in_process, [state_path, state_path])
+    third = TokenBucketRateLimiter(rate=0.001, burst=2, state_path=state_path)._take_shared("www.lancers.jp")
+
+    assert waits == [0.0, 0.0]
+    assert third > 900
@@ -0,0 +1,79 @@
+import pytest
+from src.scraper.readiness import ReadinessWaiter, ReadinessPolicy
+
+class FakeHandle:
+    """wait_for_function の戻り値を模したテスト用ハンドル"""
+    def __init__(self, value):
+        self.value = value
+
+    async def json_value(self):
+        return self.value
+
+class FakePage:
+    """待機呼び出しを記録するテスト用ページ"""
+    def __init__(self, fail: bool = False, result=True):
+        self.fail = fail
+        self.result = result
+        self.function_args = []
+
+    async def wait_for_function(self, expression, arg=None, timeout=None, polling=None):
+        self.function_args.append((arg, timeout))
+        if self.fail:
+            raise TimeoutError("Timeout 10000ms exceeded.")
+        return FakeHandle(self.result)
+
+@pytest.mark.asyncio
+async def test_wait_uses_policy_for_page_type():
+    """ページ種別ごとの条件で待機するテスト"""
+    waiter = ReadinessWaiter()
+    page = FakePage()
+
+    assert await waiter.wait(page, 'detail') is True
+
+    arg, timeout = page.function_args[0]
+    assert arg['required'] == ['h1.c-heading--lv1']
+    assert arg['any_of'] == ['p.p-work-detail-schedule']
+    assert timeout == 10000
+    assert arg['url_excludes'] is None
+    assert arg['fail_any_of'] == []
+
+@pytest.mark.asyncio
+async def test_login_policy_waits_for_url_change():
+    """ログイン後はURLの変化を待ち、失敗を示す表示も確認するテスト"""
+    waiter = ReadinessWaiter()
+    page = FakePage()
+
+    assert await waiter.wait(page, 'login') is True
+
+    arg, timeout = page.function_args[0]
+    assert arg['url_excludes'] == '/user/login'
+    assert '.c-form-error__message' in arg['fail_any_of']
+    assert arg['fail_if_empty'] == ['input#UserPassword']
+    assert timeout == 15000
+
+@pytest.mark.asyncio
+async def test_failed_login_ends_wait_early():
+    """失敗を示す表示があった場合はタイムアウトを待たずに False を返すテスト"""
+    waiter = ReadinessWaiter()
+    page = FakePage(result='failed')
+
+    assert await waiter.wait(page, 'login') is False
+
+    summary = waiter.summary()
+    assert summary['login']['failures'] == 1
+    assert summary['login']['timeouts'] == 0
+
+@pytest.mark.asyncio
+async def test_custom_policy_and_timeout_stats():
+    """ポリシーの上書きとタイムアウトの記録のテスト"""
+    waiter = ReadinessWaiter({'search': ReadinessPolicy(any_of=('li.card',), min_count=20, timeout_ms=500)})
+    page = FakePage(fail=True)
+
+    assert await waiter.wait(page, 'search') is False
+
+    arg, timeout = page.function_args[0]
+    assert arg['min_count'] == 20
+    assert timeout == 500
+    summary = waiter.summary()
+    assert summary['search']['count'] == 1
+    assert summary['search']['timeouts'] == 1
@@ -0,0 +1,95 @@
+import pytest
+from src.scraper.replay import ResponseRecorder, ResponseReplayer
+
+class FakeRequest:
+    def __init__(self, url: str, resource_type: str = 'document'):
+        self.url = url
+        self.resource_type = resource_type
+
+class FakeResponse:
+    """テスト用のレスポンス"""
+    def __init__(self, url: str, status: int = 200, body: bytes = b'', headers: dict = None,
+                 resource_type: str = 'document'):
+        self.url = url
+        self.status = status
+        self._body = body
+        self._headers = headers or {'content-type': 'text/html; charset=utf-8'}
+        self.request = FakeRequest(url, resource_type)
+
+    async def all_headers(self):
+        return self._headers
+
+    async def body(self):
+        return self._body
+
+class FakeRoute:
+    """fulfill / abort の呼び出しを記録するテスト用のルート"""
+    def __init__(self, url: str, resource_type: str = 'document'):
+        self.request = FakeRequest(url, resource_type)
+        self.fulfilled = None
+        self.aborted = False
+
+    async def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+    async def abort(self):
+        self.aborted = True
+
+class FakeContext:
+    def __init__(self):
+        self.handlers = {}
+        self.routes = []
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def route(self, pattern, handler):
+        self.routes.append(handler)
+
+@pytest.mark.asyncio
+async def test_record_and_replay_roundtrip(tmp_path):
+    """記録したレスポンスをリプレイで同じ内容で返すテスト"""
+    context = FakeContext()
+    recorder = ResponseRecorder(str(tmp_path))
+    await recorder.attach(context)
+    html = '<html><h1>案件</h1></html>'.encode('utf-8')
+    context.handlers['response'](FakeResponse('https://www.lancers.jp/work/detail/1#top', body=html))
+    context.handlers['response'](FakeResponse('https://www.lancers.jp/logo.png', body=b'png', resource_type='image'))
+    context.handlers['response'](FakeResponse('https://www.lancers.jp/mypage', status=302,
+                                              headers={'location': '/user/login', 'set-cookie': 'x'}))
+    await recorder.flush()
+
+    replayer = ResponseReplayer(str(tmp_path))
+    assert sorted(replayer.index) == ['https://www.lancers.jp/mypage', 'https://www.lancers.jp/work/detail/1']
+
+    route = FakeRoute('https://www.lancers.jp/work/detail/1')
+    await replayer._handle_route(route)
+    assert route.fulfilled['status'] == 200
+    assert route.fulfilled['body'] == html
+
+    redirect = FakeRoute('https://www.lancers.jp/mypage')
+    await replayer._handle_route(redirect)
+    assert redirect.fulfilled['status'] == 302
+    assert redirect.fulfilled['headers'] == {'location': '/user/login'}
+    assert replayer.hits == 2
+
+@pytest.mark.asyncio
+async def test_replay_unknown_requests(tmp_path):
+    """記録にないページは404、それ以外は遮断するテスト"""
+    recorder = ResponseRecorder(str(tmp_path))
+    await recorder.flush()
+    replayer = ResponseReplayer(str(tmp_path))
+
+    page = FakeRoute('https://www.lancers.jp/work/detail/999')
+    await replayer._handle_route(page)
+    assert page.fulfilled['status'] == 404
+
+    script = FakeRoute('https://www.googletagmanager.com/gtm.js', resource_type='script')
+    await replayer._handle_route(script)
+    assert script.aborted
+    assert replayer.misses == 1
+
+def test_replay_requires_index(tmp_path):
+    """記録がないディレクトリを指定した場合はエラーになるテスト"""
+    with pytest.raises(FileNotFoundError):
+        ResponseReplayer(str(tmp_path / 'missing'))
@@ -0,0 +1,51 @@
+import pytest
+from src.scraper.resource_blocker import ResourceBlocker, ESTIMATED_RESOURCE_BYTES
+
+class FakeRequest:
+    def __init__(self, resource_type: str, url: str):
+        self.resource_type = resource_type
+        self.url = url
+
+class FakeRoute:
+    def __init__(self, resource_type: str, url: str):
+        self.request = FakeRequest(resource_type, url)
+        self.action = None
+
+    async def abort(self):
+        self.action = 'abort'
+
+    async def fallback(self):
+        self.action = 'fallback'
+
+def test_should_block_by_type_and_pattern():
+    """リソース種別とURLパターンによる判定のテスト"""
+    blocker = ResourceBlocker()
+    assert blocker.should_block('image', 'https://www.lancers.jp/img/logo.png')
+    assert blocker.should_block('script', 'https://www.googletagmanager.com/gtm.js')
+    assert not blocker.should_block('script', 'https://www.lancers.jp/js/app.js')
+    assert not blocker.should_block('document', 'https://www.lancers.jp/work/search')
+
+def test_custom_block_lists():
+    """ブロックリストを差し替えた場合のテスト"""
+    blocker = ResourceBlocker(resource_types=['font'], url_patterns=[r'example\.com/track'])
+    assert blocker.should_block('font', 'https://www.lancers.jp/font.woff2')
+    assert not blocker.should_block('image', 'https://www.lancers.jp/img/logo.png')
+    assert blocker.should_block('xhr', 'https://example.com/track?id=1')
+
+@pytest.mark.asyncio
+async def test_route_handler_counts_savings():
+    """ルーティング時の遮断・委譲と統計のテスト"""
+    blocker = ResourceBlocker()
+    image_route = FakeRoute('image', 'https://www.lancers.jp/img/a.png')
+    doc_route = FakeRoute('document', 'https://www.lancers.jp/work/detail/1')
+
+    await blocker._handle_route(image_route)
+    await blocker._handle_route(doc_route)
+
+    assert image_route.action == 'abort'
+    assert doc_route.action == 'fallback'
+    stats = blocker.summary()
+    assert stats['blocked_requests'] == 1
+    assert stats['allowed_requests'] == 1
+    assert stats['estimated_bytes_saved'] == ESTIMATED_RESOURCE_BYTES['image']
+    assert stats['blocked_by_type'] == {'image': 1}
@@ -0,0 +1,79 @@
+import os
+import stat
+import pytest
+from src.scraper.session_store import SessionStore
+from src.scraper.browser import LancersBrowser
+
+@pytest.fixture
+def store(tmp_path):
+    """テスト用のセッション保存先"""
+    return SessionStore(str(tmp_path / "session" / "storage_state.json"))
+
+def test_save_and_load(store):
+    """セッションの保存と読み込みのテスト"""
+    state = {'cookies': [{'name': 'sid', 'value': 'abc', 'domain': '.lancers.jp'}], 'origins': []}
+    store.save(state)
+    assert store.load() == state
+    if os.name == 'posix':
+        assert stat.S_IMODE(os.stat(store.path).st_mode) == 0o600
+
+def test_load_missing_or_broken(store):
+    """存在しない・壊れたファイルでは None を返すテスト"""
+    assert store.load() is None
+    os.makedirs(os.path.dirname(store.path))
+    with open(store.path, 'w', encoding='utf-8') as f:
+        f.write("{broken")
+    assert store.load() is None
+
+class FakeResponse:
+    def __init__(self, status, location="", body=""):
+        self.status = status
+        self.headers = {'location': location} if location else {}
+        self.body = body
+
+    async def text(self):
+        return self.body
+
+class FakeRequest:
+    def __init__(self, response):
+        self.response = response
+
+    async def get(self, url, max_redirects=None):
+        return self.response
+
+class FakeContext:
+    def __init__(self, response):
+        self.request = FakeRequest(response)
+
+    async def storage_state(self):
+        return {'cookies': [{'name': 'sid', 'value': 'new'}], 'origins': []}
+
+@pytest.mark.asyncio
+async def test_ensure_logged_in_reuses_valid_session(store):
+    """有効なセッションではログインを省略するテスト"""
+    browser = LancersBrowser(session_store=store)
+    browser.context = FakeContext(FakeResponse(200, body="<h1>マイページ</h1>"))
+    browser.session_loaded = True
+
+    async def fail_login(email, password):
+        raise AssertionError("login should not be called")
+    browser.login = fail_login
+
+    assert await browser.ensure_logged_in("user@example.com", "secret") is True
+
+@pytest.mark.asyncio
+async def test_ensure_logged_in_relogins_when_expired(store):
+    """期限切れのセッションではログインし直して保存するテスト"""
+    browser = LancersBrowser(session_store=store)
+    browser.context = FakeContext(FakeResponse(302, location="https://www.lancers.jp/user/login"))
+    browser.session_loaded = True
+    calls = []
+
+    async def fake_login(email, password):
+        calls.append(email)
+        return True
+    browser.login = fake_login
+
+    assert await browser.ensure_logged_in("user@example.com", "secret") is True
+    assert calls == ["user@example.com"]
+    assert store.load()['cookies'][0]['value'] == 'new'
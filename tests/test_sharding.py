@@ -0,0 +1,114 @@
+import pickle
+import logging
+import threading
+import logging.handlers
+import multiprocessing
+import pytest
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from src.scraper import sharding
+from src.scraper.sharding import ShardedDetailPool, partition
+from src.scraper.page_archive import PageArchive
+
+def log_in_worker(message):
+    """ワーカープロセスでログを出力する"""
+    logging.getLogger('src.scraper.detail_pool').info(message)
+    logging.getLogger('src.scraper.detail_pool').debug("出力されない")
+
+def test_partition_round_robin():
+    """URLを元の位置付きで各シャードに順番に振り分けるテスト"""
+    shards = partition(['a', 'b', None, 'd', 'e'], 3)
+
+    assert shards == [[(0, 'a'), (3, 'd')], [(1, 'b'), (4, 'e')], [(2, None)]]
+    assert partition(['a'], 4) == [[(0, 'a')]]
+
+@pytest.mark.asyncio
+async def test_fetch_all_restores_input_order(monkeypatch):
+    """各シャードの結果を入力と同じ順序に並べ直し、失敗したシャードはNoneにするテスト"""
+    def fake_fetch_shard(token, shard):
+        urls = [url for _, url in shard]
+        if 'bad' in urls:
+            raise RuntimeError("worker crashed")
+        stats = {'pid': 1 if 'u0' in urls else 2, 'http_fetches': len(urls), 'browser_fallbacks': 0}
+        return [{'url': url} if url else None for url in urls], stats
+
+    monkeypatch.setattr(sharding, '_fetch_shard', fake_fetch_shard)
+    pool = ShardedDetailPool(workers=2)
+    # テストではプロセスの代わりにスレッドで実行する
+    pool.executor = ThreadPoolExecutor(max_workers=2)
+    urls = ['u0', 'u1', 'u2', None, 'u4']
+
+    results = await pool.fetch_all(urls)
+    stats_after_first_call = sum(stats['http_fetches'] for stats in pool.worker_stats.values())
+    failed = await pool.fetch_all(['ok', 'bad', 'ok2'])
+    await pool.close()
+
+    assert [r['url'] if r else None for r in results] == ['u0', 'u1', 'u2', None, 'u4']
+    assert failed[0] == {'url': 'ok'} and failed[2] == {'url': 'ok2'}
+    assert failed[1] is None
+    # 統計はプロセスごとの最新の累計を合計する
+    assert stats_after_first_call == 5
+    assert set(pool.worker_stats) == {1, 2}
+
+def test_initargs_with_page_archive_can_be_sent_to_workers(tmp_path):
+    """--archive-pages 指定時も、ワーカープロセスに渡す引数を pickle でき、プロセスごとにアーカイブを作り直すテスト"""
+    archive = PageArchive(str(tmp_path / "archive"), max_bytes=1024)
+    pool = ShardedDetailPool(workers=2, browser_options={'page_archive': archive, 'base_url': "http://127.0.0.1:1"})
+
+    browser_options = pickle.loads(pickle.dumps(pool.initargs))[0]
+
+    assert isinstance(browser_options['page_archive'], PageArchive)
+    assert browser_options['page_archive'] is not archive
+    assert browser_options['page_archive'].directory == archive.directory
+    assert browser_options['page_archive'].max_bytes == 1024
+
+def test_worker_logs_are_forwarded_to_parent(caplog):
+    """ワーカープロセスのログが親プロセスの同じ名前のロガーから、親と同じレベル設定で出力されるテスト"""
+    context = multiprocessing.get_context('spawn')
+    log_queue = context.Queue()
+    listener = logging.handlers.QueueListener(log_queue, sharding._ForwardHandler())
+    listener.start()
+    with caplog.at_level(logging.INFO):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=sharding._forward_logs,
+                                 initargs=(log_queue, sharding._logger_levels())) as executor:
+            executor.submit(log_in_worker, "ワーカーからのログ").result()
+        listener.stop()
+
+    messages = [(record.name, record.getMessage()) for record in caplog.records]
+    assert ('src.scraper.detail_pool', "ワーカーからのログ") in messages
+    assert all(message != "出力されない" for _, message in messages)
+
+@pytest.mark.asyncio
+async def test_results_delivered_per_url_and_broken_pool_restarted(monkeypatch):
+    """結果は1件ずつ呼び出し元に渡り、プロセスが異常終了した場合はプールを作り直して未取得分だけ取得し直すテスト"""
+    pool = ShardedDetailPool(workers=1)
+    # テストではプロセスの代わりにスレッドで実行する
+    monkeypatch.setattr(pool, '_start_executor', lambda: setattr(pool, 'executor', ThreadPoolExecutor(max_workers=1)))
+    first_delivered = threading.Event()
+    calls = []
+
+    def fake_fetch_shard(token, shard):
+        calls.append([url for _, url in shard])
+        if len(calls) == 1:
+            # 1件目を送ってからプロセスが異常終了する
+            index, url = shard[0]
+            pool.result_queue.put((token, index, {'url': url}))
+            assert first_delivered.wait(timeout=5)
+            raise BrokenProcessPool("A child process terminated abruptly")
+        return [{'url': url} for _, url in shard], {'pid': 2}
+
+    monkeypatch.setattr(sharding, '_fetch_shard', fake_fetch_shard)
+    delivered = []
+
+    def on_result(index, detail):
+        delivered.append((index, detail['url']))
+        first_delivered.set()
+
+    await pool.open()
+    results = await pool.fetch_all(['u0', 'u1', 'u2'], on_result)
+    await pool.close()
+
+    assert [r['url'] for r in results] == ['u0', 'u1', 'u2']
+    assert calls == [['u0', 'u1', 'u2'], ['u1', 'u2']]
+    assert delivered == [(0, 'u0'), (1, 'u1'), (2, 'u2')]
+    assert pool.restarts == 1
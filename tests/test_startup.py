@@ -0,0 +1,52 @@
+import os
+import sys
+import subprocess
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+# main の読み込みにかけてよい時間（ミリ秒、バイトコードのキャッシュがある状態）
+# 実行環境によって大きく変わるため、環境変数 STARTUP_BUDGET_MS を指定した場合だけ確認する
+STARTUP_BUDGET_MS = os.environ.get('STARTUP_BUDGET_MS')
+# ブラウザ操作やアップロードを行う時だけ読み込むモジュール
+HEAVY_MODULES = ('playwright', 'googleapiclient', 'google.oauth2', 'urllib3')
+
+def run_python(tmp_path, *args):
+    env = dict(os.environ, PYTHONPATH=SRC_DIR, PYTHONPYCACHEPREFIX=str(tmp_path / "pycache"))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return subprocess.run([sys.executable, *args], cwd=str(tmp_path), env=env,
+                          capture_output=True, text=True, check=True)
+
+def import_times(tmp_path):
+    """python -X importtime の出力から モジュール名 -> 累積時間（マイクロ秒） を作る"""
+    times = {}
+    for line in run_python(tmp_path, '-X', 'importtime', '-c', 'import main').stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            times[parts[2].strip()] = int(parts[1])
+    return times
+
+def test_heavy_dependencies_not_imported_at_startup(tmp_path):
+    """main の読み込み時に Playwright や Google API クライアントを読み込まないテスト"""
+    loaded = [name for name in import_times(tmp_path) if name.startswith(HEAVY_MODULES)]
+    assert loaded == []
+
+@pytest.mark.skipif(not STARTUP_BUDGET_MS, reason="STARTUP_BUDGET_MS が指定されていません")
+def test_startup_within_budget(tmp_path):
+    """main の読み込み時間が予算内に収まるテスト（1回目でバイトコードを作成し、最も速い回で判定する）"""
+    import_times(tmp_path)
+    fastest = min(import_times(tmp_path)['main'] for _ in range(3))
+    assert fastest < float(STARTUP_BUDGET_MS) * 1000
+
+def test_csv_commands_do_not_load_browser(tmp_path):
+    """CSVだけを扱うコマンドは実行後も Playwright を読み込まないテスト"""
+    (tmp_path / "jobs.csv").write_text("title,url\nA,https://www.lancers.jp/work/detail/1\n", encoding='utf-8')
+    script = (
+        "import sys, asyncio, main\n"
+        "sys.argv = ['main.py', '--extract-urls', 'jobs.csv', '--log-file', 'test.log']\n"
+        "asyncio.run(main.main())\n"
+        f"print('loaded:', sorted(name for name in sys.modules if name.startswith({HEAVY_MODULES!r})))\n"
+    )
+    output = run_python(tmp_path, '-c', script).stdout.splitlines()
+    assert "https://www.lancers.jp/work/detail/1" in output
+    # ログは別スレッドで書き込まれるため、行の順序には依存しない
+    assert "loaded: []" in output